@@ -0,0 +1,232 @@
+import argparse
+import json
+import platform
+import random
+import sys
+import time
+import tracemalloc
+
+from src.card import IMAGE_KEYS, NUM_CARDS, to_tuple
+from src.dealer import Dealer
+from src.deck import Deck
+from src.engine import BlackjackEngine
+from src.player import Player
+from src.shoe import Shoe
+
+# Times the hot paths of the rules engine and the card image cache, headless, and optionally compares
+# the results with a stored baseline. Run from the folder containing README.md:
+#   python3 -m benchmarks.bench_engine --output bench.json
+#   python3 -m benchmarks.bench_engine --baseline bench.json --threshold 0.25
+#
+# Every result is a named metric {'value', 'unit'}. Timings are the best time per call in
+# nanoseconds, throughput is in rounds per second and memory is peak traced allocation in KiB.
+HAND_LENGTHS = (2, 3, 4, 5, 6, 8)
+PLAYER_COUNTS = (1, 3, 5, 7)
+DECK_COUNTS = (1, 2, 6, 8)
+HIGHER_IS_BETTER = {'rounds/s'}
+TIMED_UNITS = {'ns', 'rounds/s'}
+THRESHOLD = 0.2  # Allowed slowdown, as a fraction of the baseline, before a metric counts as a regression
+SEED = 1
+
+
+def time_calls(call, number, repeat, setup=None):
+    # Nanoseconds per call of `call`: the fastest of `repeat` runs of `number` calls, which is the
+    # least disturbed by other work on the machine. When `setup` is given it runs before every call,
+    # outside the timed region.
+    samples = []
+    for _ in range(repeat):
+        if setup is None:
+            start = time.perf_counter_ns()
+            for _ in range(number):
+                call()
+            elapsed = time.perf_counter_ns() - start
+        else:
+            elapsed = 0
+            for _ in range(number):
+                setup()
+                start = time.perf_counter_ns()
+                call()
+                elapsed += time.perf_counter_ns() - start
+        samples.append(elapsed / number)
+    return min(samples)
+
+
+def calibrate(repeat):
+    # Time of a fixed pure-Python workload, used with --normalize to compare results taken on
+    # machines (or under loads) of different speed.
+    return time_calls(lambda: sum(i * i for i in range(1000)), 200, repeat)
+
+
+def make_engine(num_players, num_decks):
+    # A seeded engine dealing from a single Deck, or from a Shoe for more than one deck.
+    rng = random.Random(SEED)
+    deck = Deck(rng=rng) if num_decks == 1 else Shoe(num_decks=num_decks, rng=rng)
+    return BlackjackEngine(num_players=num_players, deck=deck, rng=rng)
+
+
+def play_round(engine):
+    # One full round with every player hitting below 17, as in the simulation's default policy.
+    engine.new_round()
+    engine.deal_hand()
+    for player in engine.players:
+        while player.score < Dealer.STAND_SCORE and player.hit() is not None:
+            pass
+    return engine.dealer_turn()
+
+
+def bench_deck(results, number, repeat):
+    rng = random.Random(SEED)
+    results['Deck()'] = {'value': time_calls(lambda: Deck(rng=rng), number, repeat), 'unit': 'ns'}
+    for num_decks in DECK_COUNTS[1:]:
+        results[f'Shoe(decks={num_decks})'] = {
+            'value': time_calls(lambda: Shoe(num_decks=num_decks, rng=rng), max(number // num_decks, 1), repeat),
+            'unit': 'ns'}
+    try:
+        from src.rng import GeneratorRandom, ShuffleBuffer
+    except ImportError:
+        return  # NumPy is not installed
+    for name, numpy_rng in (('GeneratorRandom', GeneratorRandom(SEED)), ('ShuffleBuffer', ShuffleBuffer(seed=SEED))):
+        results[f'Deck(rng={name})'] = {'value': time_calls(lambda: Deck(rng=numpy_rng), number, repeat), 'unit': 'ns'}
+
+
+def bench_calculate_score(results, number, repeat):
+    engine = make_engine(1, 1)
+    player = Player(deck=engine.deck, player_number=1)
+    codes = list(range(0, NUM_CARDS, 4))  # One card of each rank
+    for length in HAND_LENGTHS:
+        player.hand = [to_tuple(code) for code in codes[:length]]
+        results[f'calculate_score[cards={length}]'] = {
+            'value': time_calls(lambda: engine.calculate_score(player), number, repeat), 'unit': 'ns'}
+
+
+def bench_rounds(results, number, repeat):
+    # deal_hand, dealer_turn and determine_winners for every player and deck count.
+    for num_players in PLAYER_COUNTS:
+        for num_decks in DECK_COUNTS:
+            name = f'[players={num_players},decks={num_decks}]'
+            engine = make_engine(num_players, num_decks)
+            results['deal_hand' + name] = {
+                'value': time_calls(engine.deal_hand, number, repeat, setup=engine.new_round), 'unit': 'ns'}
+
+            def deal():
+                engine.new_round()
+                engine.deal_hand()
+            results['dealer_turn' + name] = {
+                'value': time_calls(engine.dealer_turn, number, repeat, setup=deal), 'unit': 'ns'}
+
+            deal()
+            dealer_score = engine.play_dealer()
+            results['determine_winners' + name] = {
+                'value': time_calls(lambda: engine.determine_winners(engine.players, dealer_score), number, repeat),
+                'unit': 'ns'}
+
+
+def bench_throughput(results, rounds):
+    # Full rounds per second, and the peak memory traced while playing them.
+    for num_players in PLAYER_COUNTS:
+        for num_decks in DECK_COUNTS:
+            name = f'[players={num_players},decks={num_decks}]'
+            engine = make_engine(num_players, num_decks)
+            start = time.perf_counter()
+            for _ in range(rounds):
+                play_round(engine)
+            results['rounds' + name] = {'value': rounds / (time.perf_counter() - start), 'unit': 'rounds/s'}
+
+            tracemalloc.start()
+            engine = make_engine(num_players, num_decks)
+            for _ in range(min(rounds, 1000)):
+                play_round(engine)
+            results['peak_memory' + name] = {'value': tracemalloc.get_traced_memory()[1] / 1024, 'unit': 'KiB'}
+            tracemalloc.stop()
+
+
+def bench_card_images(results, number, repeat):
+    # The image side of Blackjack.get_card_image: decoding and resizing a card (from the asset pack if
+    # one has been built, and from the image files), and a cached lookup. Making the Tk PhotoImage needs
+    # a display, so it is not timed here.
+    try:
+        from src.image_cache import CardImageCache, card_images
+    except ImportError:
+        return  # Pillow is not installed
+    keys = list(dict.fromkeys(IMAGE_KEYS))
+    caches = {'files': CardImageCache()}
+    if card_images.pack is not None:
+        caches['pack'] = CardImageCache(pack=card_images.pack)
+    for source, cache in caches.items():
+        cycle = iter(keys * (number * repeat // len(keys) + 1))
+        results[f'card_image[cold,{source}]'] = {
+            'value': time_calls(lambda: cache.image(next(cycle)), max(number // 10, 1), repeat, setup=cache.clear),
+            'unit': 'ns'}
+    cache = caches['files']
+    for key in keys:
+        cache.image(key)
+    cycle = iter(keys * (number * repeat // len(keys) + 1))
+    results['card_image[cached]'] = {'value': time_calls(lambda: cache.image(next(cycle)), number, repeat),
+                                     'unit': 'ns'}
+
+
+def run(number=2000, repeat=7, rounds=20000, images=True):
+    results = {}
+    bench_deck(results, number, repeat)
+    bench_calculate_score(results, number, repeat)
+    bench_rounds(results, number, repeat)
+    bench_throughput(results, rounds)
+    if images:
+        bench_card_images(results, number, repeat)
+    return {
+        'python': platform.python_version(),
+        'implementation': platform.python_implementation(),
+        'machine': platform.machine(),
+        'calibration_ns': calibrate(repeat),
+        'results': results,
+    }
+
+
+def compare(results, baseline, threshold=THRESHOLD, normalize=False):
+    # Metrics that got worse than the baseline by more than `threshold` (a fraction): a list of
+    # (name, baseline value, current value, change). Metrics missing from either side are skipped.
+    # With `normalize`, current timings are first scaled by how much faster or slower the calibration
+    # workload ran than in the baseline.
+    speed = baseline['calibration_ns'] / results['calibration_ns'] if normalize else 1.0
+    regressions = []
+    for name, current in results['results'].items():
+        previous = baseline['results'].get(name)
+        if previous is None or previous['unit'] != current['unit'] or not previous['value']:
+            continue
+        value = current['value']
+        if current['unit'] in TIMED_UNITS:
+            value = value / speed if current['unit'] in HIGHER_IS_BETTER else value * speed
+        change = value / previous['value'] - 1
+        worse = -change if current['unit'] in HIGHER_IS_BETTER else change
+        if worse > threshold:
+            regressions.append((name, previous['value'], value, change))
+    return regressions
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Benchmark the rules engine and card images.")
+    parser.add_argument('--number', type=int, default=2000, help="calls per timing sample")
+    parser.add_argument('--repeat', type=int, default=7, help="timing samples per benchmark")
+    parser.add_argument('--rounds', type=int, default=20000, help="rounds played per throughput benchmark")
+    parser.add_argument('--no-images', action='store_true', help="skip the card image benchmarks")
+    parser.add_argument('--output', default=None, help="write the results to this JSON file")
+    parser.add_argument('--baseline', default=None, help="compare with results saved by --output")
+    parser.add_argument('--threshold', type=float, default=THRESHOLD,
+                        help="fail if a metric is this fraction worse than the baseline (default 0.2)")
+    parser.add_argument('--normalize', action='store_true',
+                        help="scale results by the calibration workload before comparing with the baseline")
+    args = parser.parse_args()
+
+    results = run(args.number, args.repeat, args.rounds, images=not args.no_images)
+    if args.output:
+        with open(args.output, 'w') as output:
+            json.dump(results, output, indent=2)
+    else:
+        print(json.dumps(results, indent=2))
+    if args.baseline:
+        with open(args.baseline) as baseline_file:
+            regressions = compare(results, json.load(baseline_file), args.threshold, args.normalize)
+        for name, previous, current, change in regressions:
+            print(f"{name}: {previous:.1f} -> {current:.1f} ({change:+.0%})", file=sys.stderr)
+        if regressions:
+            sys.exit(f"{len(regressions)} benchmarks regressed by more than {args.threshold:.0%}")
@@ -0,0 +1,54 @@
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+# Measures how long a fresh interpreter takes to import a module, using `python -X importtime`.
+# Run from the folder containing README.md: python3 -m benchmarks.bench_startup
+MODULES = ['src.engine', 'blackjack', 'src.simulation']
+GUI_MODULES = ['tkinter', 'PIL']
+
+
+def import_time(module):
+    # Total import time of `module` in microseconds, and whether any GUI module was loaded with it.
+    code = f"import sys, {module}; print(any(m in sys.modules for m in {GUI_MODULES!r}))"
+    result = subprocess.run([sys.executable, '-X', 'importtime', '-c', code], capture_output=True, text=True,
+                            check=True, cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    total = 0
+    for line in result.stderr.splitlines():
+        # Lines look like "import time:  self [us] | cumulative | imported package"; the cumulative time of
+        # the module's own line includes everything it imported.
+        if line.startswith('import time:') and '[us]' not in line:
+            self_us, cumulative, name = line[len('import time:'):].split('|')
+            if name.strip() == module:
+                total = int(cumulative)
+    return total, result.stdout.strip() == 'True'
+
+
+def run(repeat):
+    results = {}
+    for module in MODULES:
+        samples = []
+        gui = False
+        for _ in range(repeat):
+            microseconds, gui = import_time(module)
+            samples.append(microseconds)
+        results[module] = {'median_us': statistics.median(samples), 'min_us': min(samples), 'imports_gui': gui}
+    return results
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Measure import time of the game modules.")
+    parser.add_argument('--repeat', type=int, default=10, help="number of fresh interpreters per module")
+    parser.add_argument('--max-us', type=int, default=None,
+                        help="fail if the median import time of src.engine exceeds this many microseconds")
+    args = parser.parse_args()
+
+    results = run(args.repeat)
+    print(json.dumps(results, indent=2))
+    if any(result['imports_gui'] for result in results.values()):
+        sys.exit("GUI libraries were imported by a core module")
+    if args.max_us is not None and results['src.engine']['median_us'] > args.max_us:
+        sys.exit(f"src.engine import took {results['src.engine']['median_us']}us, limit is {args.max_us}us")
@@ -1,52 +1,14 @@
-from src.deck import Deck
-from src.player import Player
-from src.dealer import Dealer
-from tkinter import *
-from PIL import ImageTk, Image
-import random
-
-
-
-
-
-class Blackjack:
-    # Initialises the Blackjack game.
-    def __init__(self, num_players=1):
-        self.deck = Deck() # Create a deck of cards.
-        # Create players and assign them to the game. Each player gets a number
-        self.players = [Player(deck=self.deck, player_number=player_number + 1) for player_number in range(num_players)]  # List of hands for each player
-        self.dealer = Dealer(deck=self.deck)  # The dealer uses the same deck.
-        self.current_player_index = 0  # Tracks whose turn it is
-
-    def deal_hand(self):
-        # Deal two cards to each player
-        for player in self.players:
-            player.init_draw_cards()
-        # Deal two cards to the dealer
-        self.dealer.init_draw_cards()
-
-    def calculate_score(self, player):
-        # Assign numeric values to cards. Aces are initially valued at 1
-        values = {'2': 2, '3': 3, '4': 4, '5': 5, '6': 6, '7': 7, '8': 8, '9': 9, '10': 10, 'J': 10, 'Q': 10, 'K': 10,
-                  'A': 1}
-        # Calculate the total score for the player's hand.
-        score = sum(values[str(card[0])] for card in player.hand)
-
-        # Count the number of Aces in the player's hand.
-        num_aces = sum(1 for card in player.hand if card[0] == 'A')
-        # Adjust Ace values to 11 where possible without causing a bust.
-        while num_aces > 0 and score + 10 <= 21:
-            score += 10
-            num_aces -= 1
-        # Update the player's score attribute.
-        player.score = score
-        return player.score
-
-    def hit(self): # Handle the logic for when a player chooses to "hit".
-        current_player = self.players[self.current_player_index] # Logic to draw a card for the player is shown here
-        current_player.hit()
-        # Recalculate and return the updated score for the player.
-        return self.calculate_score(current_player)
+from src.card import IMAGE_KEYS, to_code
+from src.engine import BlackjackEngine
+from src.metrics import metrics
+
+
+# The Tk front end for the rules engine. tkinter and PIL are only imported by the GUI methods, so the
+# game rules can be imported and tested without a display.
+class Blackjack(BlackjackEngine):
+    prefetcher = None  # Loads the card images in the background while the welcome screen is shown
+
+    @metrics.timed('gui.hit_action')
     def hit_action(self):
         # Perform the hit action for the current player.
         score = self.hit()
@@ -62,75 +24,51 @@ class Blackjack:
         self.next_player()
 
     def next_player(self):
-        self.current_player_index += 1 # Advance to the next player.
-        if self.current_player_index >= len(self.players):  # All players have taken their turn
-            self.current_player_index = 0  # Reset for the next round (if needed)
-            self.dealer_turn()  # Proceed to the dealer's turn
-        else:
+        # Advance to the next player; once everyone has played the dealer takes their turn.
+        more_players = super().next_player()
+        if more_players:
             self.update_player_display()  # Update display for the next player
-
-    def dealer_turn(self):
-        dealer_score = self.calculate_score(self.dealer) # Calculate the dealer's initial score.
-        # Dealer must hit until their score reaches at least 17 or higher
-        while dealer_score < 17:
-            self.dealer.hit()
-            dealer_score = self.calculate_score(self.dealer)
-
-        # Add a small chance for the dealer to draw again at 17-19 to introduce risk
-        if 17 <= dealer_score <= 19 and random.random() < 0.5:
-            self.dealer.hit()
-            dealer_score = self.calculate_score(self.dealer)
-        # Determine the winners of the game after the dealer's turn ends.
-        self.determine_winners(self.players, dealer_score)
-
-
+            self.schedule_bot()
+        return more_players
+
+    def human_action(self, action):
+        # The Hit and Stand buttons only act for human players; clicks during a bot's turn are ignored.
+        if self.bot_to_play() is None:
+            action()
+
+    def schedule_bot(self):
+        # If a bot is to play, let it act after its think time. Tk's after() keeps the window
+        # responsive in the meantime.
+        bot = self.bot_to_play()
+        if bot is not None:
+            self.game_screen.after(int(bot.think_time * 1000), self.bot_action)
+
+    def bot_action(self):
+        # One action by the bot whose turn it is: a hit, after which it acts again, or a stand.
+        if self.bot_to_play() is None:
+            return
+        if self.bot_wants_hit():
+            player_index = self.current_player_index
+            self.hit_action()
+            if self.current_player_index == player_index and not self.is_bust(player_index):
+                self.schedule_bot()
+        else:
+            self.stand_action()
 
     def determine_winners(self, players, dealer_score):
-        results = [] # List to store the results of the game.
         self.update_dealer_hand_display(reveal=True) # Reveal the dealer's full hand
-
-        # Separate players into non-busted and busted
-        non_bust_players = [player for player in players if not player.is_bust()]
-        busted_players = [player for player in players if player.is_bust()]
-
-        # Handle busted players
-        for busted_player in busted_players:
-            results.append(f"Player {busted_player.player_number} busts and loses, Score {busted_player.score}")
-
-        # Handle what to do if dealer busts
-        if self.dealer.is_bust():
-            results.append(f"Dealer busts, Score {self.dealer.score}")
-
-        else:
-            # Dealer did not bust; so evaluate against non-busted players
-            max_score = max(player.score for player in non_bust_players) if non_bust_players else 0
-            max_score_players = [player for player in non_bust_players if player.score == max_score]
-            looser_players = [player for player in non_bust_players if player not in max_score_players]
-
-            # This part checks if dealer wins, ties, or loses
-            for max_score_player in max_score_players:
-                if max_score_player.score > dealer_score:
-                    results.append(f"Player {max_score_player.player_number} Wins, Score {max_score_player.score}")
-                    results.append(f"Dealer loses, Score {self.dealer.score}")
-                elif max_score_player.score == dealer_score:
-                    results.append(
-                        f"Player {max_score_player.player_number} and Dealer tie, Score {max_score_player.score}")
-                else:
-                    results.append(f"Player {max_score_player.player_number} loses, Score {max_score_player.score}")
-                    results.append(f"Dealer wins, Score {self.dealer.score}")
-
-            # This handles other non-busted players who didn't achieve max score
-            for looser_player in looser_players:
-                results.append(f"Player {looser_player.player_number} loses, Score {looser_player.score}")
+        results = super().determine_winners(players, dealer_score)
 
         # Updates the GUI results message
         self.player_hand_label.config(text="\n".join(results))
 
         # End the game by disabling buttons and locks the state
         self.end_game()
+        return results
 
 
 
+    @metrics.timed('gui.update_player_display')
     def update_player_display(self):
         current_player = self.players[self.current_player_index] # Get the current player.
         score = self.calculate_score(current_player)  # Calculate the player's score.
@@ -140,50 +78,64 @@ class Blackjack:
             text=f"Player {self.current_player_index + 1}'s hand: {current_player.hand}, Score: {score}"
         )
 
-        # Clears the player's hand display with card images
-        for widget in self.player_hand_frame.winfo_children():
-            widget.destroy()
-
-        for card in current_player.hand:
-            card_image = self.get_card_image(card) # Load the image for each card.
-            card_label = Label(self.player_hand_frame, image=card_image, bg="green")
-            card_label.image = card_image  # Keep a reference to avoid garbage collection
-            card_label.pack(side=LEFT, padx=5)
+        # Show the player's hand with card images, reusing the labels already on screen
+        images = [self.get_card_image(card) for card in current_player.hand]
+        self.sync_card_labels(self.player_hand_frame, self.player_card_labels, images)
 
 
     # Update the dealer's hand display, optionally hiding one card.
+    @metrics.timed('gui.update_dealer_hand_display')
     def update_dealer_hand_display(self, reveal=False):
-        # Clear the dealer's hand frame to avoid overlapping card images
-        for widget in self.dealer_hand_frame.winfo_children():
-            widget.destroy()
+        images = []
         # Loop through each card in the dealer's hand
         for i, card in enumerate(self.dealer.hand):
             # If reveal is False, hide the first card (simulate face-down card)
             if i == 0 and not reveal:  # Hide the first card if reveal is False
-                card_image = ImageTk.PhotoImage(Image.open("./src/Classic/card_back.png").resize((100, 150)))
+                images.append(self.get_card_back_image())
             else:
                 # Otherwise, show the actual card
-                card_image = self.get_card_image(card)
-            # Display the card image in the dealer's hand frame
-            card_label = Label(self.dealer_hand_frame, image=card_image, bg="green")
-            card_label.image = card_image # Retain a reference to prevent garbage collection
+                images.append(self.get_card_image(card))
+        # Display the card images in the dealer's hand frame
+        self.sync_card_labels(self.dealer_hand_frame, self.dealer_card_labels, images)
+
+    def sync_card_labels(self, frame, labels, images):
+        # Make the card labels in `frame` show `images`, changing only what differs from what is
+        # already on screen: labels whose image changed are reconfigured, missing labels are appended
+        # and labels left over from a longer hand are removed. `labels` tracks the labels in the frame.
+        from tkinter import LEFT, Label
+
+        for card_label, card_image in zip(labels, images):
+            if card_label.image is not card_image:
+                card_label.config(image=card_image)
+                card_label.image = card_image # Retain a reference to prevent garbage collection
+        for card_image in images[len(labels):]:
+            card_label = Label(frame, image=card_image, bg="green")
+            card_label.image = card_image  # Keep a reference to avoid garbage collection
             card_label.pack(side=LEFT, padx=5)
+            labels.append(card_label)
+        for card_label in labels[len(images):]:
+            card_label.destroy()
+        del labels[len(images):]
 
     def end_game(self):
+        from tkinter import DISABLED, Button
+
         # Disable buttons at the end of the game
         for widget in self.game_screen.winfo_children():
             if isinstance(widget, Button):
                 widget.config(state=DISABLED)
 
-    def is_bust(self, current_player_index):
-        # Check if the player's score exceeds 21 (bust)
-        return self.players[current_player_index].is_bust()
-
     def start_game(self, win):
+        from tkinter import CENTER, Button, Frame, Label, Tk
+        from src.image_cache import card_images
+
         win.destroy()  # Close the welcome screen
 
         # Create the main game screen
         self.game_screen = Tk()
+        card_images.clear_photos()  # PhotoImages made for an earlier Tk instance can't be shown in this one
+        if self.prefetcher is not None:
+            self.prefetcher.poll(self.game_screen)  # Collect the images prefetched so far, and the rest as they arrive
         self.game_screen.title("Diya's Multiplayer Blackjack Game!")
         self.game_screen.geometry("1080x720")
         self.game_screen.configure(bg="green")  # Green background for the game screen
@@ -199,6 +151,10 @@ class Blackjack:
         self.dealer_hand_frame = Frame(self.game_screen, bg="green")
         self.dealer_hand_frame.place(relx=0.5, rely=0.3, anchor=CENTER)
 
+        # Card labels currently shown in each frame, updated in place by sync_card_labels
+        self.player_card_labels = []
+        self.dealer_card_labels = []
+
         # Label for the current player's hand (placeholder)
         self.player_hand_label = Label(
             self.game_screen,
@@ -216,7 +172,7 @@ class Blackjack:
             font=("Arial", 16),
             bg="white",
             fg="black",
-            command=self.hit_action,  # Call hit_action when clicked
+            command=lambda: self.human_action(self.hit_action),  # Call hit_action when clicked
         )
         hit_button.place(relx=0.4, rely=0.8, anchor=CENTER)
 
@@ -227,12 +183,13 @@ class Blackjack:
             font=("Arial", 16),
             bg="white",
             fg="black",
-            command=self.stand_action,  # Call stand_action when clicked
+            command=lambda: self.human_action(self.stand_action),  # Call stand_action when clicked
         )
         stand_button.place(relx=0.6, rely=0.8, anchor=CENTER)
 
         # Display Player 1's hand immediately
         self.update_player_display()
+        self.schedule_bot()  # Player 1 may be a bot
 
         # Run the main event loop for the game screen
         self.game_screen.mainloop()
@@ -240,44 +197,34 @@ class Blackjack:
 
 
     def get_card_image(self, card):
-        # Load the image for a given card.
-        rank, suit = card
-
-        # Map face card abbreviations to full names
-        rank_map = {
-            "J": "jack",
-            "Q": "queen",
-            "K": "king",
-            "A": "ace"
-        }
-
-        # Use the mapped name if it's a face card, otherwise use the rank as is
-        rank_str = rank_map.get(str(rank), str(rank).lower())
-
-        # Generate the card image file name
-        card_name = f"{rank_str}_of_{suit.lower()}.png"
-        card_path = f"./src/Classic/{card_name}"
-
-        # Debugging output to verify the path
-        print(f"Loading card image from: {card_path}")
-
-        # Load and resize the image
-        try:
-            return ImageTk.PhotoImage(Image.open(card_path).resize((100, 150)))  # Resize as needed
-        except FileNotFoundError:
-            # If the file is missing, log an error and raise an exception
-            print(f"Error: File not found - {card_path}")
-            raise
+        from src.image_cache import card_images
+
+        # Load the image for a given card from the shared cache, named after the card e.g. "queen_of_hearts".
+        return card_images.photo(IMAGE_KEYS[to_code(card)])
+
+    def get_card_back_image(self):
+        from src.image_cache import CARD_BACK, card_images
+
+        return card_images.photo(CARD_BACK)
 
     def play(self):
+        # The GUI libraries are only loaded once the game is actually shown.
+        from tkinter import CENTER, Button, Label, Tk
+        from PIL import ImageTk
+        from src.asset_pack import BACKGROUND, WINDOW_SIZE
+        from src.image_cache import card_images
+
         # Display the welcome screen with a background image.
         win = Tk()
         win.title("Welcome to Diya's Blackjack Game! :)")
         win.geometry("1080x720") # Set the window size
 
+        # Decode every card image in the background while the player is on the welcome screen
+        self.prefetcher = card_images.prefetch()
+        self.prefetcher.poll(win)
+
         # Load and set the background image
-        blackjack_img = "./src/blackjackbackgroundimage.webp"
-        bg = ImageTk.PhotoImage(Image.open(blackjack_img).resize((1080, 720)))
+        bg = ImageTk.PhotoImage(card_images.load(BACKGROUND, WINDOW_SIZE))
         bg_label = Label(win, image=bg)
         bg_label.place(x=0, y=0, relwidth=1, relheight=1)  # Cover the entire window
 
@@ -307,6 +254,10 @@ class Blackjack:
 
 
 if __name__ == '__main__':
+    import logging
+    import os
+
+    logging.basicConfig(level=os.environ.get('BLACKJACK_LOG_LEVEL', 'WARNING'))
     num_players = 2  # Example: 2 players
     blackjack = Blackjack(num_players)
     blackjack.play()
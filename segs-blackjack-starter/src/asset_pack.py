@@ -0,0 +1,89 @@
+import json
+import mmap
+import os
+
+# The asset pack is one file of raw, pre-resized RGBA pixels plus a JSON index giving the offset
+# and size of each image. Loading an image from it is a memory-mapped slice: no PNG/WebP decoding,
+# no resampling and no per-file open.
+PACK_VERSION = 1
+PACK_PATH = "./src/assets.pack"
+INDEX_PATH = "./src/assets.json"
+
+CARD_DIR = "./src/Classic"
+CARD_SIZE = (100, 150)  # Size cards are displayed at
+BACKGROUND = "background"  # Image key of the welcome screen background
+BACKGROUND_PATH = "./src/blackjackbackgroundimage.webp"
+WINDOW_SIZE = (1080, 720)
+ALIGNMENT = 64  # Images start on cache-line boundaries
+
+
+def build_asset_pack(card_dir=CARD_DIR, background_path=BACKGROUND_PATH, pack_path=PACK_PATH,
+                     index_path=INDEX_PATH):
+    # Decode and resize every card image and the background once, and write them to the pack.
+    from PIL import Image
+
+    sources = {os.path.splitext(name)[0]: (os.path.join(card_dir, name), CARD_SIZE)
+               for name in sorted(os.listdir(card_dir)) if name.endswith('.png')}
+    sources[BACKGROUND] = (background_path, WINDOW_SIZE)
+
+    images = {}
+    offset = 0
+    with open(pack_path + ".tmp", 'wb') as pack:
+        for key, (path, size) in sources.items():
+            with Image.open(path) as image:
+                pixels = image.convert('RGBA').resize(size).tobytes()
+            padding = -offset % ALIGNMENT
+            pack.write(b"\0" * padding)
+            offset += padding
+            pack.write(pixels)
+            images[key] = {'offset': offset, 'width': size[0], 'height': size[1]}
+            offset += len(pixels)
+    index = {'version': PACK_VERSION, 'size': offset, 'images': images}
+    with open(index_path + ".tmp", 'w') as index_file:
+        json.dump(index, index_file, indent=1)
+    # Swap both files in only once they are complete.
+    os.replace(pack_path + ".tmp", pack_path)
+    os.replace(index_path + ".tmp", index_path)
+    return index
+
+
+class AssetPack:
+    def __init__(self, pack_path=PACK_PATH, index_path=INDEX_PATH):
+        with open(index_path) as index_file:
+            index = json.load(index_file)
+        if index.get('version') != PACK_VERSION:
+            raise ValueError(f"Unsupported asset pack version {index.get('version')} in {index_path}")
+        self.images = index['images']
+        with open(pack_path, 'rb') as pack:
+            self._map = mmap.mmap(pack.fileno(), 0, access=mmap.ACCESS_READ)
+        if len(self._map) < index['size']:
+            self._map.close()
+            raise ValueError(f"Asset pack {pack_path} is truncated")
+
+    @classmethod
+    def open_default(cls):
+        # Open the pack built by rename_cards.py, or return None if it has not been built.
+        try:
+            return cls()
+        except (OSError, ValueError):
+            return None
+
+    def __contains__(self, key):
+        return key in self.images
+
+    def size(self, key):
+        entry = self.images[key]
+        return entry['width'], entry['height']
+
+    def image(self, key):
+        # Return a PIL image that reads its pixels straight from the memory map.
+        from PIL import Image
+
+        entry = self.images[key]
+        size = (entry['width'], entry['height'])
+        start = entry['offset']
+        pixels = memoryview(self._map)[start:start + size[0] * size[1] * 4]
+        return Image.frombuffer('RGBA', size, pixels, 'raw', 'RGBA', 0, 1)
+
+    def close(self):
+        self._map.close()
@@ -0,0 +1,44 @@
+from collections import namedtuple
+
+import numpy as np
+
+from .scoring import CARD_VALUES, MAX_SCORE
+
+# Hands are encoded as rows of rank indexes, padded with 0 on the right:
+# 1 = Ace, 2-10 = number cards, 11 = Jack, 12 = Queen, 13 = King.
+PAD = 0
+ACE = 1
+RANK_INDEX = {'A': 1, '2': 2, '3': 3, '4': 4, '5': 5, '6': 6, '7': 7, '8': 8, '9': 9, '10': 10, 'J': 11, 'Q': 12,
+              'K': 13}
+
+# Card value for each rank index, with the padding worth nothing. Aces are initially valued at 1.
+RANK_VALUES = np.zeros(len(RANK_INDEX) + 1, dtype=np.uint8)
+for _rank, _index in RANK_INDEX.items():
+    RANK_VALUES[_index] = CARD_VALUES[_rank]
+
+# hard: total with every Ace counted as 1
+# score: the same value Blackjack.calculate_score returns
+# soft: True where an Ace is counted as 11
+# bust: True where the score exceeds 21
+BatchScores = namedtuple('BatchScores', ['hard', 'score', 'soft', 'bust'])
+
+
+def encode_hands(hands, width=None):
+    # Convert a list of (rank, suit) hands into a padded rank-index matrix.
+    width = width or max((len(hand) for hand in hands), default=0)
+    matrix = np.zeros((len(hands), width), dtype=np.uint8)
+    for row, hand in enumerate(hands):
+        matrix[row, :len(hand)] = [RANK_INDEX[str(card[0])] for card in hand]
+    return matrix
+
+
+def score_hands(ranks):
+    # Score every row of a rank-index matrix in one vectorised pass.
+    ranks = np.asarray(ranks)
+    hard = RANK_VALUES[ranks].sum(axis=1, dtype=np.int16)
+    has_ace = (ranks == ACE).any(axis=1)
+    # Promoting a second Ace would add 20 to a total of at least 2, so at most one Ace can ever be
+    # counted as 11. This matches the loop in promote_aces exactly.
+    soft = has_ace & (hard + 10 <= MAX_SCORE)
+    score = hard + 10 * soft
+    return BatchScores(hard=hard, score=score, soft=soft, bust=score > MAX_SCORE)
@@ -0,0 +1,50 @@
+from .card import CODE_VALUES
+from .dealer import Dealer
+from .player import Player
+from .scoring import MAX_SCORE
+
+# Computer-controlled seats. A bot decides every action with a single lookup in a PolicyTable, a flat
+# table of hit/stand decisions indexed by the hand's score, whether it is soft and the value of the
+# dealer's upcard (Aces are 1).
+UPCARDS = range(1, 11)
+THINK_TIME = 0.0  # Seconds a bot waits before each action in the GUI and the server
+
+
+class PolicyTable:
+    def __init__(self, hits):
+        self.hits = bytes(hits)  # 1 to hit, 0 to stand, at index(score, soft, upcard)
+
+    @staticmethod
+    def index(score, soft, upcard):
+        return ((upcard - 1) * (MAX_SCORE + 1) + score) * 2 + soft
+
+    @classmethod
+    def build(cls, should_hit):
+        # Compile any function should_hit(score, soft, upcard), e.g. a simulation policy or
+        # solver.StrategyTable.should_hit, into a table.
+        hits = bytearray(len(UPCARDS) * (MAX_SCORE + 1) * 2)
+        for upcard in UPCARDS:
+            for score in range(MAX_SCORE + 1):
+                for soft in (False, True):
+                    hits[cls.index(score, soft, upcard)] = bool(should_hit(score, soft, upcard))
+        return cls(hits)
+
+    def should_hit(self, score, soft, upcard):
+        return score < MAX_SCORE and self.hits[self.index(score, soft, upcard)] == 1
+
+
+# Hit below 17 whatever the dealer shows, like the dealer.
+DEALER_POLICY = PolicyTable.build(lambda score, soft, upcard: score < Dealer.STAND_SCORE)
+
+
+class BotPlayer(Player):
+    __slots__ = ('policy', 'think_time')
+
+    def __init__(self, deck, player_number, policy=None, think_time=THINK_TIME):
+        super().__init__(deck=deck, player_number=player_number)
+        self.policy = policy if policy is not None else DEALER_POLICY
+        self.think_time = think_time
+
+    def should_hit(self, dealer):
+        # Decide against the dealer's upcard, the second card dealt (the first stays face down).
+        return self.policy.should_hit(self.score, self._hand.soft, CODE_VALUES[dealer.hand.codes[1]])
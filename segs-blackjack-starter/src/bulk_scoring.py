@@ -0,0 +1,197 @@
+import csv
+import io
+import json
+import os
+import sys
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+
+import numpy as np
+
+from .batch_scoring import RANK_INDEX, score_hands
+from .card import RANKS, SUITS
+
+# Scores hand dumps far larger than memory (pip install numpy). Hands are read one per line, either as
+# JSON Lines of (rank, suit) pairs or as CSV rows of alternating rank and suit cells:
+#
+#   [["A", "Spades"], [10, "Hearts"]]        A,Spades,10,Hearts
+#
+# Lines are read and scored CHUNK_LINES at a time with batch_scoring.score_hands, which follows the
+# same Ace rules as calculate_score, and the results of each chunk are written in one write. Only a
+# few chunks are held in memory whatever the size of the input. Every input line gives one output
+# line, in order and in the same format; a blank line is an empty hand:
+#
+#   {"hard": 11, "score": 21, "soft": true, "bust": false}        11,21,1,0
+#
+# With worker processes this process still reads every line, and every chunk and its output are
+# copied between processes. Workers only pay off for large inputs with several idle CPUs; on one or
+# two CPUs scoring in this process is faster. Their chunks are POOL_CHUNK_LINES long so the copying
+# is done in few, large messages.
+CHUNK_LINES = 1 << 14
+POOL_CHUNK_LINES = CHUNK_LINES * 4
+FORMATS = ('jsonl', 'csv')
+IO_BUFFER = 1 << 20  # Buffer size of the files opened here
+# Rank index (see batch_scoring) of every card, keyed by (rank, suit). Number ranks may be ints or
+# strings, so both are keys and no conversion is needed per card.
+CARD_INDEX = {(key, suit): RANK_INDEX[str(rank)] for rank in RANKS for key in {rank, str(rank)} for suit in SUITS}
+JSON_BOOLS = ('false', 'true')
+
+
+def parse_jsonl(lines):
+    for line in lines:
+        yield json.loads(line) if line.strip() else ()
+
+
+def parse_csv(lines):
+    for row in csv.reader(lines, skipinitialspace=True):
+        if len(row) % 2:
+            raise ValueError(f"Expected rank and suit pairs, got {row!r}")
+        yield zip(row[0::2], row[1::2])
+
+
+PARSERS = {'jsonl': parse_jsonl, 'csv': parse_csv}
+
+
+def encode_lines(lines, fmt, source="<stdin>", first_line=1):
+    # Parse a chunk of lines into a padded rank-index matrix like batch_scoring.encode_hands.
+    rows = []
+    try:
+        for hand in PARSERS[fmt](lines):
+            rows.append(bytes([CARD_INDEX[card[0], card[1]] for card in hand]))
+    except (ValueError, KeyError, IndexError, TypeError) as error:
+        # Every line before the bad one was encoded, so its number is first_line + len(rows)
+        raise ValueError(f"{source}, line {first_line + len(rows)}: invalid hand ({error!r})") from None
+    width = max(map(len, rows), default=0)
+    padded = b"".join(row.ljust(width, b"\0") for row in rows)
+    return np.frombuffer(padded, dtype=np.uint8).reshape(len(rows), width)
+
+
+def format_scores(scores, fmt):
+    # One output line per hand, joined into a single string.
+    columns = zip(scores.hard.tolist(), scores.score.tolist(), scores.soft.tolist(), scores.bust.tolist())
+    if fmt == 'csv':
+        return "".join(f"{hard},{score},{soft:d},{bust:d}\n" for hard, score, soft, bust in columns)
+    return "".join(f'{{"hard": {hard}, "score": {score}, "soft": {JSON_BOOLS[soft]}, "bust": {JSON_BOOLS[bust]}}}\n'
+                   for hard, score, soft, bust in columns)
+
+
+def score_lines(lines, fmt, source="<stdin>", first_line=1):
+    # Score one chunk of input lines and return its output. Runs in the worker processes.
+    return format_scores(score_hands(encode_lines(lines, fmt, source, first_line)), fmt)
+
+
+def score_text(text, fmt, source="<stdin>", first_line=1):
+    # score_lines for a chunk joined into one string, which is much cheaper to send to a worker
+    # process than a list of lines. The lines are split again just as the input file split them.
+    return score_lines(io.StringIO(text, newline=''), fmt, source, first_line)
+
+
+def chunks(lines, chunk_lines=CHUNK_LINES):
+    # Lists of up to `chunk_lines` lines with the number of their first line, read lazily.
+    lines = iter(lines)
+    first_line = 1
+    for chunk in iter(lambda: list(islice(lines, chunk_lines)), []):
+        yield first_line, chunk
+        first_line += len(chunk)
+
+
+def score_stream(sources, output, fmt, workers=1, chunk_lines=None):
+    # Score every line of `sources`, an iterable of (name, lines) pairs, and write the results to
+    # `output` in input order. Returns the number of hands scored. With workers=1 the chunks are
+    # scored in this process; otherwise they go to a pool of `workers` processes (None for one per
+    # CPU), with at most two chunks per worker in flight so memory stays bounded. `chunk_lines`
+    # defaults to CHUNK_LINES in this process and POOL_CHUNK_LINES with workers.
+    scored = 0
+    if workers == 1:
+        chunk_lines = chunk_lines or CHUNK_LINES
+        for source, lines in sources:
+            for first_line, chunk in chunks(lines, chunk_lines):
+                output.write(score_lines(chunk, fmt, source, first_line))
+                scored += len(chunk)
+        return scored
+
+    workers = workers or os.cpu_count()
+    chunk_lines = chunk_lines or POOL_CHUNK_LINES
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        pending = deque()
+        for source, lines in sources:
+            for first_line, chunk in chunks(lines, chunk_lines):
+                if len(pending) >= 2 * workers:
+                    output.write(pending.popleft().result())
+                pending.append(executor.submit(score_text, "".join(chunk), fmt, source, first_line))
+                scored += len(chunk)
+        while pending:
+            output.write(pending.popleft().result())
+    return scored
+
+
+def detect_format(path):
+    # The input format from a file name such as hands.csv or hands.jsonl.gz; JSON Lines by default.
+    name = path[:-3] if path.endswith('.gz') else path
+    return 'csv' if name.endswith('.csv') else 'jsonl'
+
+
+def input_format(paths):
+    # The format shared by every input file, from their names. Every line is parsed and written in
+    # one format, so files of different formats have to be scored separately.
+    formats = {detect_format(path) for path in paths if path != '-'}
+    if len(formats) > 1:
+        raise ValueError("The inputs mix CSV and JSON Lines files; score them separately or pass --format")
+    return formats.pop() if formats else 'jsonl'
+
+
+def open_input(path):
+    if path == '-':
+        return sys.stdin
+    if path.endswith('.gz'):
+        import gzip
+        return gzip.open(path, 'rt', newline='')
+    return open(path, newline='', buffering=IO_BUFFER)
+
+
+def read_sources(paths):
+    # (name, lines) for each input, opening the files one at a time.
+    for path in paths:
+        source = open_input(path)
+        try:
+            yield ("<stdin>" if path == '-' else path), source
+        finally:
+            if source is not sys.stdin:
+                source.close()
+
+
+if __name__ == '__main__':
+    import argparse
+    import time
+
+    parser = argparse.ArgumentParser(description="Score hands streamed from files or stdin.")
+    parser.add_argument('inputs', nargs='*', default=['-'],
+                        help="CSV or JSON Lines files, optionally gzipped (default: stdin)")
+    parser.add_argument('--format', choices=FORMATS, default=None,
+                        help="input and output format (default: from the file names, else jsonl)")
+    parser.add_argument('--output', default='-', help="file to write the scores to (default: stdout)")
+    parser.add_argument('--workers', type=int, default=1,
+                        help="score chunks in this many processes (0 for one per CPU). Chunks are read here "
+                             "and copied to the workers, so this only helps for large inputs with several "
+                             "idle CPUs")
+    parser.add_argument('--chunk-lines', type=int, default=None,
+                        help=f"lines read and scored at once (default: {CHUNK_LINES}, "
+                             f"or {POOL_CHUNK_LINES} with --workers)")
+    parser.add_argument('--quiet', action='store_true', help="do not print the throughput to stderr")
+    args = parser.parse_args()
+
+    try:
+        fmt = args.format or input_format(args.inputs)
+    except ValueError as error:
+        parser.error(str(error))
+    output = sys.stdout if args.output == '-' else open(args.output, 'w', buffering=IO_BUFFER)
+    start = time.perf_counter()
+    try:
+        with output:
+            scored = score_stream(read_sources(args.inputs), output, fmt, args.workers or None, args.chunk_lines)
+    except ValueError as error:
+        sys.exit(str(error))
+    elapsed = time.perf_counter() - start
+    if not args.quiet:
+        print(f"Scored {scored:,} hands in {elapsed:.1f}s ({scored / elapsed:,.0f} hands/s)", file=sys.stderr)
@@ -0,0 +1,114 @@
+from array import array
+from collections.abc import MutableSequence
+
+# Cards are stored as small ints from 0 to 51: code = rank_index * 4 + suit_index.
+# The order matches the order in which Deck builds its cards.
+RANKS = tuple(range(2, 11)) + ('J', 'Q', 'K', 'A')
+SUITS = ('Hearts', 'Diamonds', 'Clubs', 'Spades')
+NUM_CARDS = len(RANKS) * len(SUITS)
+
+# Names used in the card image file names, e.g. "queen_of_hearts".
+RANK_NAMES = {'J': 'jack', 'Q': 'queen', 'K': 'king', 'A': 'ace'}
+
+# Lookup tables indexed by card code.
+CARD_TUPLES = tuple((rank, suit) for rank in RANKS for suit in SUITS)
+CARD_RANKS = tuple(rank for rank, suit in CARD_TUPLES)
+CARD_SUITS = tuple(suit for rank, suit in CARD_TUPLES)
+# Card values with Aces counted as 1, the same values as scoring.CARD_VALUES.
+CODE_VALUES = bytes(1 if rank == 'A' else 10 if isinstance(rank, str) else rank for rank in CARD_RANKS)
+IS_ACE = bytes(rank == 'A' for rank in CARD_RANKS)
+IMAGE_KEYS = tuple(f"{RANK_NAMES.get(str(rank), str(rank))}_of_{suit.lower()}" for rank, suit in CARD_TUPLES)
+
+# Number ranks may be given as ints or strings, e.g. (8, 'Hearts') or ('8', 'Hearts').
+_CODES = {(str(rank), suit): code for code, (rank, suit) in enumerate(CARD_TUPLES)}
+
+
+def to_code(card):
+    # Convert a (rank, suit) tuple to its card code. Codes are passed through unchanged.
+    if isinstance(card, int):
+        if not 0 <= card < NUM_CARDS:
+            raise ValueError(f"Invalid card code: {card}")
+        return card
+    try:
+        return _CODES[str(card[0]), card[1]]
+    except (KeyError, IndexError, TypeError):
+        raise ValueError(f"Invalid card: {card!r}") from None
+
+
+def to_tuple(code):
+    # Convert a card code back to a (rank, suit) tuple.
+    return CARD_TUPLES[code]
+
+
+class CardArray(MutableSequence):
+    # A list of cards stored as one byte per card in an array('b').
+    # It reads and writes (rank, suit) tuples so tuple-based code keeps working, while `codes`
+    # gives direct access to the compact card codes.
+    __slots__ = ('codes',)
+
+    def __init__(self, cards=()):
+        if isinstance(cards, CardArray):
+            self.codes = array('b', cards.codes)
+        else:
+            self.codes = array('b', map(to_code, cards))
+
+    @classmethod
+    def from_codes(cls, codes):
+        cards = cls.__new__(cls)
+        cards.codes = array('b', codes)
+        return cards
+
+    def __len__(self):
+        return len(self.codes)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return type(self).from_codes(self.codes[index])
+        return CARD_TUPLES[self.codes[index]]
+
+    def __setitem__(self, index, card):
+        if isinstance(index, slice):
+            self.codes[index] = array('b', map(to_code, card))
+        else:
+            self.codes[index] = to_code(card)
+
+    def __delitem__(self, index):
+        del self.codes[index]
+
+    def __iter__(self):
+        return map(CARD_TUPLES.__getitem__, self.codes)
+
+    def __contains__(self, card):
+        try:
+            return to_code(card) in self.codes
+        except ValueError:
+            return False
+
+    def insert(self, index, card):
+        self.codes.insert(index, to_code(card))
+
+    def append(self, card):
+        self.codes.append(to_code(card))
+
+    def extend(self, cards):
+        if isinstance(cards, CardArray):
+            self.codes.extend(cards.codes)
+        else:
+            self.codes.extend(map(to_code, cards))
+
+    def pop(self, index=-1):
+        return CARD_TUPLES[self.codes.pop(index)]
+
+    def clear(self):
+        del self.codes[:]
+
+    def __eq__(self, other):
+        if isinstance(other, CardArray):
+            return self.codes == other.codes
+        try:
+            return list(self) == list(other)
+        except TypeError:
+            return NotImplemented
+
+    def __repr__(self):
+        return repr(list(self))
@@ -0,0 +1,100 @@
+from array import array
+
+from .card import CODE_VALUES, NUM_CARDS, RANKS, SUITS
+from .scoring import MAX_SCORE
+
+# What is left in a Deck or Shoe, kept up to date as cards are dealt so queries never rescan the
+# cards. Every draw costs a few integer updates; anything derived from the counts (per-value counts,
+# bust odds) is computed on the first query after a draw and cached until the next one.
+CARDS_PER_DECK = NUM_CARDS
+RANK_INDEX = {str(rank): index for index, rank in enumerate(RANKS)}
+# Hi-Lo count tag of every card code: 2-6 count +1 when dealt, 7-9 count 0, tens and Aces -1.
+HI_LO = tuple(1 if 2 <= value <= 6 else -1 if value in (1, 10) else 0 for value in CODE_VALUES)
+
+
+class CompositionIndex:
+    __slots__ = ('rank_counts', 'remaining', 'running_count', '_values', '_bust')
+
+    def __init__(self, codes=()):
+        self.reset(codes)
+
+    def reset(self, codes):
+        # Recount from the card codes left, e.g. after a shuffle. The running count restarts at 0.
+        rank_counts = array('l', [0]) * len(RANKS)
+        for code in codes:
+            rank_counts[code >> 2] += 1
+        self.rank_counts = rank_counts
+        self.remaining = sum(rank_counts)
+        self.running_count = 0
+        self._values = None
+        self._bust = None
+
+    def reset_full(self, num_decks=1):
+        # Reset to `num_decks` complete decks without counting them card by card.
+        self.rank_counts = array('l', [len(SUITS) * num_decks]) * len(RANKS)
+        self.remaining = CARDS_PER_DECK * num_decks
+        self.running_count = 0
+        self._values = None
+        self._bust = None
+
+    def remove(self, code):
+        # Record that the card `code` has been dealt.
+        self.rank_counts[code >> 2] -= 1
+        self.remaining -= 1
+        self.running_count += HI_LO[code]
+        self._values = self._bust = None
+
+    def remove_codes(self, codes):
+        for code in codes:
+            self.remove(code)
+
+    def rank_count(self, rank):
+        # Cards of `rank` left, e.g. rank_count('A') or rank_count(10).
+        return self.rank_counts[RANK_INDEX[str(rank)]]
+
+    def values(self):
+        # Cards left by value as a tuple of 10 counts, Aces first and every ten-valued card last. This
+        # is the composition used by dealer_odds and solver.
+        if self._values is None:
+            counts = [0] * 10
+            for index, count in enumerate(self.rank_counts):
+                counts[CODE_VALUES[index * 4] - 1] += count
+            self._values = tuple(counts)
+        return self._values
+
+    def probability(self, value):
+        # Chance that the next card has `value` (1 for an Ace, 10 for any ten-valued card).
+        return self.values()[value - 1] / self.remaining if self.remaining else 0.0
+
+    def bust_probability(self, hard):
+        # Chance that the next card takes a hard total of `hard` over 21, counting an Ace as 1.
+        if self._bust is None:
+            table = [0.0] * (MAX_SCORE + 1)
+            if self.remaining:
+                values = self.values()
+                busting = 0  # Cards worth `value` or more
+                for value in range(10, 0, -1):
+                    busting += values[value - 1]
+                    # A card worth `value` busts every hard total from MAX_SCORE + 1 - value up
+                    table[MAX_SCORE + 1 - value] = busting / self.remaining
+            self._bust = table
+        if hard > MAX_SCORE:
+            return 1.0
+        return self._bust[max(hard, 0)]
+
+    @property
+    def decks_remaining(self):
+        return self.remaining / CARDS_PER_DECK
+
+    @property
+    def true_count(self):
+        # Running count per deck left to deal.
+        return self.running_count / self.decks_remaining if self.remaining else 0.0
+
+    def snapshot(self):
+        return {
+            'remaining': self.remaining,
+            'ranks': {str(rank): count for rank, count in zip(RANKS, self.rank_counts)},
+            'running_count': self.running_count,
+            'true_count': self.true_count,
+        }
@@ -2,6 +2,11 @@ from .player import Player
 
 
 class Dealer(Player):
+    STAND_SCORE = 17  # The dealer must hit until their score reaches at least this
+    RISK_MAX_SCORE = 19  # Between STAND_SCORE and this the dealer may risk one extra card
+    RISK_HIT_CHANCE = 0.5  # Chance of taking that extra card
+    __slots__ = ()
+
     def __init__(self, deck):
         # Calls the parent (Player) class's constructor to initialize shared attributes.
         super().__init__(deck=deck, player_number=0)
@@ -0,0 +1,95 @@
+from functools import lru_cache
+
+from .dealer import Dealer
+from .scoring import MAX_SCORE
+
+# Exact odds of the dealer's final total under the rules of BlackjackEngine.play_dealer: hit below
+# 17, then with a 50% chance take one extra card on 17-19.
+#
+# A shoe composition is a tuple of 10 counts: composition[value - 1] is the number of cards of that
+# value left, with Aces as value 1 and every ten-valued card as value 10.
+# A distribution is a tuple of 23 probabilities: distribution[total] is the chance the dealer finishes
+# on that total, and distribution[BUST] the chance the dealer goes over 21.
+BUST = MAX_SCORE + 1
+STANDARD_DECK_COUNTS = (1, 2, 6, 8)
+CACHE_SIZE = 1 << 16
+
+
+def full_composition(num_decks=1):
+    # Card counts for a full shoe: four of each value per deck, and sixteen ten-valued cards.
+    return (4 * num_decks,) * 9 + (16 * num_decks,)
+
+
+def remove_card(composition, value):
+    # The composition after one card of `value` has been dealt.
+    if composition[value - 1] <= 0:
+        raise ValueError(f"No cards of value {value} left in the composition")
+    return composition[:value - 1] + (composition[value - 1] - 1,) + composition[value:]
+
+
+def _final(score):
+    distribution = [0.0] * (BUST + 1)
+    distribution[min(score, BUST)] = 1.0
+    return tuple(distribution)
+
+
+def _mix(parts):
+    # Weighted sum of (probability, distribution) pairs.
+    total = [0.0] * (BUST + 1)
+    for probability, distribution in parts:
+        for index, value in enumerate(distribution):
+            total[index] += probability * value
+    return tuple(total)
+
+
+def _draws(composition):
+    # (probability, value, composition after drawing) for every value that can be drawn next.
+    cards = sum(composition)
+    return [(count / cards, value, remove_card(composition, value))
+            for value, count in enumerate(composition, start=1) if count]
+
+
+@lru_cache(maxsize=CACHE_SIZE)
+def _dealer_outcome(composition, hard, has_ace, risk_taken):
+    score = hard + 10 if has_ace and hard + 10 <= MAX_SCORE else hard
+    if not any(composition):
+        return _final(score)  # The shoe has run out, so the dealer stands (see play_dealer)
+    if score < Dealer.STAND_SCORE and not risk_taken:
+        return _mix((probability, _dealer_outcome(after, hard + value, has_ace or value == 1, False))
+                    for probability, value, after in _draws(composition))
+    if Dealer.STAND_SCORE <= score <= Dealer.RISK_MAX_SCORE and not risk_taken:
+        # Either stand, or take exactly one more card and stop whatever it brings.
+        extra = _mix((probability, _dealer_outcome(after, hard + value, has_ace or value == 1, True))
+                     for probability, value, after in _draws(composition))
+        return _mix([(1 - Dealer.RISK_HIT_CHANCE, _final(score)), (Dealer.RISK_HIT_CHANCE, extra)])
+    return _final(score)
+
+
+@lru_cache(maxsize=None)
+def full_shoe_table(num_decks=1):
+    # Distributions for every upcard (1-10) dealt from a full shoe of `num_decks` decks.
+    composition = full_composition(num_decks)
+    return {upcard: _dealer_outcome(remove_card(composition, upcard), upcard, upcard == 1, False)
+            for upcard in range(1, 11)}
+
+
+def precompute(deck_counts=STANDARD_DECK_COUNTS):
+    # Fill the full-shoe tables for the usual deck counts, e.g. at server start up.
+    for num_decks in deck_counts:
+        full_shoe_table(num_decks)
+
+
+def dealer_distribution(upcard, composition=None, num_decks=1):
+    # Distribution of the dealer's final total given their upcard value (Aces are 1) and the cards
+    # left in the shoe, excluding the upcard. Without a composition a full shoe is assumed.
+    if composition is None:
+        return full_shoe_table(num_decks)[upcard]
+    return _dealer_outcome(tuple(composition), upcard, upcard == 1, False)
+
+
+def bust_probability(upcard, composition=None, num_decks=1):
+    return dealer_distribution(upcard, composition, num_decks)[BUST]
+
+
+def cache_info():
+    return _dealer_outcome.cache_info()
@@ -1,16 +1,74 @@
 import random
+from array import array
+
+from .card import CARD_TUPLES, NUM_CARDS, CardArray
+from .composition import CompositionIndex
+
+FULL_DECK = array('b', range(NUM_CARDS))  # Copied for every new deck, which is much faster than building it
 
 
 class Deck:
-    def __init__(self):
-        # Generate a full deck of 52 cards by combining ranks and suits
-        self.cards = [
-            (rank, suit) for rank in list(range(2, 11)) + ['J', 'Q', 'K', 'A']
-            for suit in ['Hearts', 'Diamonds', 'Clubs', 'Spades']
-        ]
+    # `rng` is any object with random.Random's shuffle method, e.g. a seeded random.Random, or an
+    # rng.GeneratorRandom or rng.ShuffleBuffer for NumPy's PCG64. By default the global random module
+    # is used.
+    #
+    # `composition` (a composition.CompositionIndex) tracks the cards left. It follows every card
+    # dealt through draw_card, draw_code and draw, and is recounted when the deck is rebuilt or its
+    # cards are replaced. Changing the cards in place (e.g. deck.cards.pop()) bypasses it: call
+    # recount() afterwards.
+    def __init__(self, rng=None):
+        self.rng = rng if rng is not None else random
+        self.composition = CompositionIndex()
+        self.start_round()
+
+    def start_round(self, min_cards=0):
+        # `min_cards` is only there to match Shoe.start_round: a Deck always starts a round full.
+        # Generate a full deck of 52 cards, stored compactly as card codes (see card.py)
+        self._cards = CardArray.from_codes(FULL_DECK)
         # Shuffle the deck to randomise the order of cards.
-        random.shuffle(self.cards)
+        self.rng.shuffle(self._cards.codes)
+        self.composition.reset_full()
+        return True
+
+    @property
+    def cards(self):
+        return self._cards
+
+    @cards.setter
+    def cards(self, cards):
+        # Accept any list of (rank, suit) tuples or card codes.
+        self._cards = CardArray(cards)
+        self.recount()
+
+    def recount(self):
+        # Rebuild the composition from the cards left, after they were changed in place. The running
+        # count restarts at 0, as the cards taken out are not known.
+        self.composition.reset(self._cards.codes)
+
+    @property
+    def remaining(self):
+        return len(self._cards)
 
     def draw_card(self):
         # Pop and return the top card from the deck, or return None if the deck is empty.
-        return self.cards.pop() if self.cards else None
+        code = self.draw_code()
+        return None if code is None else CARD_TUPLES[code]
+
+    def draw_code(self):
+        # Like draw_card, but returns the card code.
+        codes = self._cards.codes
+        if not codes:
+            return None
+        code = codes.pop()
+        self.composition.remove(code)
+        return code
+
+    def draw(self, n):
+        # Draw the top `n` cards at once, in the order draw_card would return them.
+        codes = self._cards.codes
+        if n > len(codes):
+            raise IndexError(f"Cannot draw {n} cards, only {len(codes)} left in the deck")
+        drawn = CardArray.from_codes(reversed(codes[len(codes) - n:]))
+        del codes[len(codes) - n:]
+        self.composition.remove_codes(drawn.codes)
+        return drawn
@@ -0,0 +1,166 @@
+import random
+
+from .bot import THINK_TIME, BotPlayer
+from .card import to_code
+from .dealer import Dealer
+from .deck import Deck
+from .metrics import metrics
+from .player import Player
+from .scoring import score_hand
+from .settlement import settle
+
+
+# The Blackjack rules engine: dealing, scoring, the dealer's play and settlement.
+# It has no GUI dependencies, so it can be imported and run headless; blackjack.Blackjack adds the
+# Tk front end on top of it.
+class BlackjackEngine:
+    # Initialises the Blackjack game. `deck` can be a shoe.Shoe for multi-deck play; by default a
+    # single Deck is used. `rng` (e.g. a seeded random.Random) shuffles the default deck and makes
+    # the dealer's risky draws; by default the global random module is used. Every round is logged to
+    # `history` (a history.HistoryWriter) when one is given, paid out to `ledger` (a
+    # settlement.Ledger with a balance per player) and stored by `recorder` (a
+    # results_store.ResultsWriter) when they are given.
+    #
+    # Player numbers listed in `bots` are played by bot.BotPlayers following `bot_policy` (a
+    # bot.PolicyTable), waiting `think_time` seconds before each action in the GUI and the server.
+    def __init__(self, num_players=1, deck=None, rng=None, history=None, ledger=None, recorder=None, bots=(),
+                 bot_policy=None, think_time=THINK_TIME):
+        self.rng = rng if rng is not None else random
+        self.history = history
+        self.ledger = ledger
+        self.recorder = recorder
+        self.settlement = None  # The last round's settlement.Settlement
+        self.round_id = 0
+        self.deck = deck if deck is not None else Deck(rng=self.rng) # Create a deck of cards.
+        # Create players and assign them to the game. Each player gets a number
+        self.players = [BotPlayer(deck=self.deck, player_number=player_number, policy=bot_policy, think_time=think_time)
+                        if player_number in bots else Player(deck=self.deck, player_number=player_number)
+                        for player_number in range(1, num_players + 1)]  # List of hands for each player
+        self.dealer = Dealer(deck=self.deck)  # The dealer uses the same deck.
+        self.current_player_index = 0  # Tracks whose turn it is
+
+    def new_round(self):
+        # Clear every hand so another round can be dealt. A Deck is refilled and reshuffled, and a
+        # Shoe is reshuffled only once its cut card has come out or it can not deal two cards to
+        # every player and the dealer.
+        for player in self.players:
+            player.hand = ()
+        self.dealer.hand = ()
+        self.current_player_index = 0
+        self.deck.start_round(2 * (len(self.players) + 1))
+
+    @metrics.timed('engine.deal_hand')
+    def deal_hand(self):
+        # Deal two cards to each player
+        for player in self.players:
+            player.init_draw_cards()
+        # Deal two cards to the dealer
+        self.dealer.init_draw_cards()
+        self.round_id += 1
+        metrics.increment('engine.rounds')
+        if self.history is not None:
+            self.history.start_round(self.round_id, len(self.players))
+            for player in self.players:
+                self.history.deal(player.player_number, player.hand.codes)
+            self.history.deal(0, self.dealer.hand.codes)
+
+    def calculate_score(self, player):
+        # Calculate the total score for the player's hand and update the player's score attribute.
+        player.score = score_hand(player.hand)
+        return player.score
+
+    @metrics.timed('engine.hit')
+    def hit(self): # Handle the logic for when a player chooses to "hit".
+        current_player = self.players[self.current_player_index] # Logic to draw a card for the player is shown here
+        card = current_player.hit()
+        if self.history is not None and card is not None:
+            self.history.hit(current_player.player_number, to_code(card))
+        # Recalculate and return the updated score for the player.
+        return self.calculate_score(current_player)
+
+    def next_player(self):
+        # Advance to the next player. Returns True if a player is still to play, or False once every
+        # player has taken their turn and the dealer has played and the round has been settled.
+        if self.history is not None and not self.is_bust(self.current_player_index):
+            self.history.stand(self.players[self.current_player_index].player_number)
+        self.current_player_index += 1
+        if self.current_player_index >= len(self.players):  # All players have taken their turn
+            self.current_player_index = 0  # Reset for the next round (if needed)
+            self.dealer_turn()  # Proceed to the dealer's turn
+            return False
+        return True
+
+    def bot_to_play(self):
+        # The bot.BotPlayer whose turn it is, or None if it is a human player's turn.
+        player = self.players[self.current_player_index]
+        return player if isinstance(player, BotPlayer) else None
+
+    def bot_wants_hit(self):
+        # Whether the bot whose turn it is hits. A bot never hits once the deck has run out.
+        return self.bot_to_play().should_hit(self.dealer) and self.deck.remaining > 0
+
+    def play_bots(self):
+        # Play every bot's turn straight away, from the current seat until a human player is to play.
+        # Returns like next_player: True if a player is still to play, or False once the round has
+        # been settled.
+        while self.bot_to_play() is not None:
+            while self.bot_wants_hit():
+                self.hit()
+            if not self.next_player():
+                return False
+        return True
+
+    def play_dealer(self):
+        # Play out the dealer's hand and return the dealer's final score.
+        dealer_score = self.calculate_score(self.dealer) # Calculate the dealer's initial score.
+        # Dealer must hit until their score reaches at least 17 or higher
+        while dealer_score < Dealer.STAND_SCORE:
+            if self.dealer_hit() is None:
+                break  # The deck has run out
+            dealer_score = self.calculate_score(self.dealer)
+
+        # Add a small chance for the dealer to draw again at 17-19 to introduce risk
+        if Dealer.STAND_SCORE <= dealer_score <= Dealer.RISK_MAX_SCORE and self.rng.random() < Dealer.RISK_HIT_CHANCE:
+            self.dealer_hit()
+            dealer_score = self.calculate_score(self.dealer)
+        return dealer_score
+
+    def dealer_hit(self):
+        card = self.dealer.hit()
+        if self.history is not None and card is not None:
+            self.history.dealer_draw(to_code(card))
+        return card
+
+    @metrics.timed('engine.dealer_turn')
+    def dealer_turn(self):
+        dealer_score = self.play_dealer()
+        # Determine the winners of the game after the dealer's turn ends.
+        return self.determine_winners(self.players, dealer_score)
+
+    @metrics.timed('engine.determine_winners')
+    def determine_winners(self, players, dealer_score):
+        # Settle the round and return a list of result messages.
+        return self.settle(players, dealer_score).render()
+
+    @metrics.timed('engine.settle')
+    def settle(self, players, dealer_score):
+        # Settle the round without building any messages: returns a settlement.Settlement, which is
+        # also kept as self.settlement, and pays it out to the ledger if there is one.
+        settlement = self.settlement = settle(players, dealer_score, self.dealer.is_bust())
+        if self.ledger is not None:
+            self.ledger.apply(settlement)
+        if self.history is not None:
+            self.log_settlement(settlement)
+        if self.recorder is not None:
+            self.recorder.record(self.round_id, settlement, players, self.dealer)
+        return settlement
+
+    def log_settlement(self, settlement):
+        history = self.history
+        for seat in settlement.seats:
+            history.settle(seat.player_number, seat.outcome, min(seat.score, 255))
+        history.settle(0, 0, settlement.dealer_score)
+
+    def is_bust(self, current_player_index):
+        # Check if the player's score exceeds 21 (bust)
+        return self.players[current_player_index].is_bust()
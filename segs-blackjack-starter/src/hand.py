@@ -0,0 +1,80 @@
+from array import array
+
+from .card import CARD_TUPLES, CODE_VALUES, IS_ACE, CardArray, to_code
+from .scoring import MAX_SCORE
+
+
+class Hand(CardArray):
+    # A CardArray that keeps a running hard total and Ace count as cards are added or removed,
+    # so the score, soft and bust state can be read in constant time.
+    __slots__ = ('hard', 'aces')
+
+    def __init__(self, cards=()):
+        super().__init__(cards)
+        self._recount()
+
+    @classmethod
+    def from_codes(cls, codes):
+        hand = cls.__new__(cls)
+        hand.codes = array('b', codes)
+        hand._recount()
+        return hand
+
+    def _recount(self):
+        codes = self.codes
+        self.hard = sum(map(CODE_VALUES.__getitem__, codes))
+        self.aces = sum(map(IS_ACE.__getitem__, codes))
+
+    @property
+    def score(self):
+        # At most one Ace can be counted as 11, which gives the same result as scoring.promote_aces.
+        hard = self.hard
+        return hard + 10 if self.aces and hard + 10 <= MAX_SCORE else hard
+
+    @property
+    def soft(self):
+        # True when an Ace is currently counted as 11.
+        return self.aces > 0 and self.hard + 10 <= MAX_SCORE
+
+    @property
+    def bust(self):
+        return self.hard > MAX_SCORE
+
+    def add_code(self, code):
+        # Fast path for dealing: append a card code without any conversion.
+        self.codes.append(code)
+        self.hard += CODE_VALUES[code]
+        self.aces += IS_ACE[code]
+
+    def append(self, card):
+        self.add_code(to_code(card))
+
+    def extend(self, cards):
+        codes = cards.codes if isinstance(cards, CardArray) else array('b', map(to_code, cards))
+        self.codes.extend(codes)
+        self.hard += sum(map(CODE_VALUES.__getitem__, codes))
+        self.aces += sum(map(IS_ACE.__getitem__, codes))
+
+    def insert(self, index, card):
+        code = to_code(card)
+        self.codes.insert(index, code)
+        self.hard += CODE_VALUES[code]
+        self.aces += IS_ACE[code]
+
+    def pop(self, index=-1):
+        code = self.codes.pop(index)
+        self.hard -= CODE_VALUES[code]
+        self.aces -= IS_ACE[code]
+        return CARD_TUPLES[code]
+
+    def __setitem__(self, index, card):
+        super().__setitem__(index, card)
+        self._recount()
+
+    def __delitem__(self, index):
+        del self.codes[index]
+        self._recount()
+
+    def clear(self):
+        del self.codes[:]
+        self.hard = self.aces = 0
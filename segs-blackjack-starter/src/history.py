@@ -0,0 +1,219 @@
+import logging
+import os
+import struct
+import zlib
+
+from .hand import Hand
+from .player import Player
+from .settlement import Outcome, settle
+
+log = logging.getLogger(__name__)
+
+# An append-only binary log of every round: deals, hits, stands, dealer draws and settlements.
+#
+# The file starts with MAGIC, followed by records framed as
+#   payload length (u16) | schema version (u8) | event type (u8) | payload | CRC-32 (u32)
+# with the CRC covering the whole header and the payload. Readers skip records of any other schema
+# version and stop at the first partial record or CRC failure, reporting the log as truncated. A
+# crash can only leave such a record at the end of the file, and HistoryWriter cuts it off before
+# appending to an existing log.
+MAGIC = b"BJHL"
+SCHEMA_VERSION = 1
+HEADER = struct.Struct('<HBB')
+CRC = struct.Struct('<I')
+BUFFER_SIZE = 1 << 16
+
+# Event types and their payloads. Seat 0 is the dealer, players are seats 1 and up.
+ROUND = 1  # round id (u64), number of players (u8)
+DEAL = 2  # seat (u8), card codes (u8 each)
+HIT = 3  # seat (u8), card code (u8)
+STAND = 4  # seat (u8)
+DEALER_DRAW = 5  # card code (u8)
+SETTLE = 6  # seat (u8), outcome (u8), score (u8); seat 0 records the dealer's final score
+
+ROUND_PAYLOAD = struct.Struct('<QB')
+SETTLE_PAYLOAD = struct.Struct('<BBB')
+
+# Settlement outcomes, stored as settlement.Outcome values.
+WIN, LOSS, TIE, BUST = Outcome.WIN, Outcome.LOSS, Outcome.TIE, Outcome.BUST
+
+
+class HistoryWriter:
+    def __init__(self, path, buffer_size=BUFFER_SIZE):
+        self.recovered = 0  # Bytes of a torn or corrupt tail cut off an existing log
+        if os.path.exists(path):
+            size = os.path.getsize(path)
+            end = HistoryReader(path).scan()
+            if end < size:
+                # Appending after a bad record would hide every new record from readers.
+                log.warning("Cutting %d bytes of a partial or corrupt record off %s", size - end, path)
+                with open(path, 'r+b') as log_file:
+                    log_file.truncate(end)
+                self.recovered = size - end
+        self.file = open(path, 'ab', buffering=buffer_size)
+        if self.file.tell() == 0:
+            self.file.write(MAGIC)
+
+    def write(self, event, payload):
+        record = HEADER.pack(len(payload), SCHEMA_VERSION, event) + payload
+        self.file.write(record + CRC.pack(zlib.crc32(record)))
+
+    def start_round(self, round_id, num_players):
+        self.write(ROUND, ROUND_PAYLOAD.pack(round_id, num_players))
+
+    def deal(self, seat, codes):
+        self.write(DEAL, bytes((seat,)) + bytes(codes))
+
+    def hit(self, seat, code):
+        self.write(HIT, bytes((seat, code)))
+
+    def stand(self, seat):
+        self.write(STAND, bytes((seat,)))
+
+    def dealer_draw(self, code):
+        self.write(DEALER_DRAW, bytes((code,)))
+
+    def settle(self, seat, outcome, score):
+        self.write(SETTLE, SETTLE_PAYLOAD.pack(seat, outcome, score))
+
+    def flush(self):
+        self.file.flush()
+
+    def close(self):
+        self.file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+class HistoryReader:
+    # Iterates over the (event, payload) records of the current schema version. `truncated` is set if
+    # the log ends in a partial or corrupt record, e.g. after a crash, and `end` is the file offset
+    # just past the last good record read.
+    def __init__(self, path, chunk_size=1 << 20):
+        self.path = path
+        self.chunk_size = chunk_size
+        self.truncated = False
+        self.end = 0
+
+    def records(self):
+        # Every good record as (version, event, payload), including other schema versions.
+        header_size, crc_size = HEADER.size, CRC.size
+        with open(self.path, 'rb') as log_file:
+            magic = log_file.read(len(MAGIC))
+            if magic != MAGIC:
+                if MAGIC.startswith(magic):
+                    # Empty, or cut off while the magic number was being written
+                    self.truncated = bool(magic)
+                    return
+                raise ValueError(f"{self.path} is not a hand history log")
+            self.end = offset = len(MAGIC)  # `offset` is the file offset of buffer[0]
+            buffer = b""
+            while True:
+                chunk = log_file.read(self.chunk_size)
+                buffer += chunk
+                position = 0
+                size = len(buffer)
+                while size - position >= header_size:
+                    length, version, event = HEADER.unpack_from(buffer, position)
+                    crc_position = position + header_size + length
+                    record_end = crc_position + crc_size
+                    if record_end > size:
+                        break
+                    crc, = CRC.unpack_from(buffer, crc_position)
+                    if crc != zlib.crc32(buffer[position:crc_position]):
+                        self.truncated = True
+                        return
+                    yield version, event, buffer[position + header_size:crc_position]
+                    position = record_end
+                    self.end = offset + position
+                buffer = buffer[position:]
+                offset += position
+                if not chunk:
+                    self.truncated = bool(buffer)
+                    return
+
+    def __iter__(self):
+        for version, event, payload in self.records():
+            if version == SCHEMA_VERSION:
+                yield event, payload
+
+    def scan(self):
+        # Read the whole log and return the length of its good part.
+        for _ in self.records():
+            pass
+        return self.end
+
+
+class LoggedRound:
+    __slots__ = ('round_id', 'hands', 'outcomes', 'scores')
+
+    def __init__(self, round_id, num_players):
+        self.round_id = round_id
+        self.hands = [bytearray() for _ in range(num_players + 1)]  # Index 0 is the dealer
+        self.outcomes = [0] * (num_players + 1)
+        self.scores = [0] * (num_players + 1)
+
+
+def read_rounds(reader):
+    # Rebuild complete rounds from a HistoryReader.
+    current = None
+    for event, payload in reader:
+        if event == ROUND:
+            if current is not None:
+                yield current
+            current = LoggedRound(*ROUND_PAYLOAD.unpack(payload))
+        elif current is None:
+            continue  # Records before the first round marker can't be placed
+        elif event == DEAL or event == HIT:
+            current.hands[payload[0]] += payload[1:]
+        elif event == DEALER_DRAW:
+            current.hands[0] += payload
+        elif event == SETTLE:
+            seat, outcome, score = SETTLE_PAYLOAD.unpack(payload)
+            current.outcomes[seat] = outcome
+            current.scores[seat] = score
+    if current is not None:
+        yield current
+
+
+class ReplayReport:
+    def __init__(self):
+        self.rounds = 0
+        self.hands = 0
+        self.outcomes = {WIN: 0, LOSS: 0, TIE: 0, BUST: 0}  # Outcomes under the replayed rules
+        self.mismatches = []  # Ids of rounds whose replayed outcome or score differs from the log
+        self.truncated = False
+
+
+def replay(path, settle=settle):
+    # Re-run every logged round through the engine's settlement at full speed. The logged cards are
+    # rebuilt into Players and a dealer Hand, which score them like the game does, and the players
+    # are settled with `settle(players, dealer_score)` (settlement.settle by default). Rounds whose
+    # outcomes or scores differ from the logged ones are reported, which audits the log or shows
+    # which rounds a rule change would affect.
+    report = ReplayReport()
+    reader = HistoryReader(path)
+    outcomes = report.outcomes
+    for logged in read_rounds(reader):
+        players = []
+        for seat, codes in enumerate(logged.hands[1:], start=1):
+            player = Player(deck=None, player_number=seat)
+            player.hand = Hand.from_codes(codes)
+            players.append(player)
+        dealer_score = Hand.from_codes(logged.hands[0]).score
+        settlement = settle(players, dealer_score)
+        replayed = [seat.outcome for seat in settlement.seats]
+        scores = [min(seat.score, 255) for seat in settlement.seats]
+        for outcome in replayed:
+            outcomes[outcome] += 1
+        if (replayed != logged.outcomes[1:] or scores != logged.scores[1:]
+                or dealer_score != logged.scores[0]):
+            report.mismatches.append(logged.round_id)
+        report.rounds += 1
+        report.hands += len(players)
+    report.truncated = reader.truncated
+    return report
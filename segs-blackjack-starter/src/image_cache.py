@@ -0,0 +1,182 @@
+import logging
+import os
+import queue
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+from PIL import Image, ImageTk
+
+from .asset_pack import BACKGROUND, BACKGROUND_PATH, CARD_DIR, CARD_SIZE, AssetPack
+from .card import IMAGE_KEYS
+from .metrics import metrics
+
+log = logging.getLogger(__name__)
+
+CARD_BACK = "card_back"  # Image key of the face-down card
+CARD_KEYS = IMAGE_KEYS + (CARD_BACK,)  # Every image a game can show
+PREFETCH_WORKERS = min(4, os.cpu_count() or 1)
+POLL_INTERVAL = 20  # Milliseconds between checks for prefetched images on the Tk thread
+
+
+class CardImageCache:
+    # Caches decoded and resized card images, keyed by image key (e.g. "queen_of_hearts") and size.
+    # PIL images are kept in a bounded LRU; Tk PhotoImages made from them are shared across redraws.
+    # Images are read from the asset pack (see asset_pack.py) when one is given and has the image at
+    # the requested size, and decoded from the image files otherwise.
+    def __init__(self, directory=CARD_DIR, max_images=128, pack=None):
+        self.directory = directory
+        self.pack = pack
+        self.max_images = max_images
+        self._images = OrderedDict()  # (key, size) -> resized PIL image, least recently used first
+        self._photos = OrderedDict()  # (key, size) -> ImageTk.PhotoImage, least recently used first
+        self.hits = 0
+        self.misses = 0
+        self.photo_hits = 0
+        self.photo_misses = 0
+
+    def path(self, key):
+        if key == BACKGROUND:
+            return BACKGROUND_PATH
+        return f"{self.directory}/{key}.png"
+
+    def load(self, key, size):
+        # Load one image, without caching it.
+        pack = self.pack
+        if pack is not None and key in pack and pack.size(key) == tuple(size):
+            metrics.increment('images.pack_loads')
+            with metrics.span('images.pack_load'):
+                return pack.image(key)
+        # Otherwise decode and resize the image file.
+        card_path = self.path(key)
+        log.debug("Loading card image from %s", card_path)
+        metrics.increment('images.file_loads')
+        try:
+            with metrics.span('images.file_load'), Image.open(card_path) as image:
+                return image.resize(size)
+        except FileNotFoundError:
+            # If the file is missing, log an error and raise an exception
+            log.error("File not found - %s", card_path)
+            raise
+
+    def add(self, key, image, size=CARD_SIZE):
+        # Put an image loaded elsewhere (see Prefetcher) into the cache, unless it is already there.
+        cache_key = (key, size)
+        if cache_key not in self._images:
+            self._images[cache_key] = image
+            if len(self._images) > self.max_images:
+                self._images.popitem(last=False)
+
+    def prefetch(self, keys=CARD_KEYS, size=CARD_SIZE, workers=PREFETCH_WORKERS):
+        # Start loading `keys` in the background; see Prefetcher.
+        return Prefetcher(self, keys, size, workers)
+
+    def image(self, key, size=CARD_SIZE):
+        # Return the resized PIL image for `key`, loading it on a miss.
+        cache_key = (key, size)
+        image = self._images.get(cache_key)
+        if image is not None:
+            self.hits += 1
+            metrics.increment('images.hits')
+            self._images.move_to_end(cache_key)
+            return image
+        self.misses += 1
+        metrics.increment('images.misses')
+        image = self.load(key, size)
+        self._images[cache_key] = image
+        if len(self._images) > self.max_images:
+            self._images.popitem(last=False)
+        return image
+
+    def photo(self, key, size=CARD_SIZE):
+        # Return a Tk PhotoImage for `key`. The same object is handed out on every redraw, so a
+        # redraw costs no disk read, resample or Tk image upload.
+        cache_key = (key, size)
+        photo = self._photos.get(cache_key)
+        if photo is not None:
+            self.photo_hits += 1
+            self._photos.move_to_end(cache_key)
+            return photo
+        self.photo_misses += 1
+        photo = self._photos[cache_key] = ImageTk.PhotoImage(self.image(key, size))
+        # Bounded like the images. A game shows far fewer than max_images cards at once, so an evicted
+        # PhotoImage, which Tk frees once it is no longer referenced, is never one still on screen.
+        if len(self._photos) > self.max_images:
+            self._photos.popitem(last=False)
+        return photo
+
+    def clear_photos(self):
+        # PhotoImages belong to the Tk interpreter that created them, so drop them when it is destroyed.
+        self._photos.clear()
+
+    def clear(self):
+        self._images.clear()
+        self.clear_photos()
+
+    def stats(self):
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'photo_hits': self.photo_hits,
+            'photo_misses': self.photo_misses,
+            'images': len(self._images),
+            'photos': len(self._photos),
+        }
+
+
+class Prefetcher:
+    # Decodes and resizes images on a pool of worker threads (PIL releases the GIL while it does so)
+    # and passes them back through a queue. The workers only call cache.load, which reads the image
+    # and records metrics (the registry is thread-safe); the cache's images are only changed by the
+    # thread calling drain() or poll(), i.e. the Tk thread. An image that fails to load is logged and
+    # skipped; the cache then loads it on demand as usual.
+    def __init__(self, cache, keys, size=CARD_SIZE, workers=PREFETCH_WORKERS):
+        self.cache = cache
+        self.size = size
+        self.ready = queue.SimpleQueue()
+        self.pending = len(keys)
+        self.failed = {}  # key -> exception
+        self.executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="prefetch")
+        for key in keys:
+            self.executor.submit(self._load, key)
+        self.executor.shutdown(wait=False)  # The workers exit once the queue of keys is done
+
+    def _load(self, key):
+        # Runs on a worker thread.
+        try:
+            image = self.cache.load(key, self.size)
+        except Exception as error:
+            self.ready.put((key, None, error))
+        else:
+            self.ready.put((key, image, None))
+
+    @property
+    def done(self):
+        return self.pending == 0
+
+    def drain(self):
+        # Move every image loaded so far into the cache. Returns True once all of them have arrived.
+        while True:
+            try:
+                key, image, error = self.ready.get_nowait()
+            except queue.Empty:
+                return self.done
+            self.pending -= 1
+            if image is None:
+                log.warning("Could not prefetch %s: %s", key, error)
+                self.failed[key] = error
+            else:
+                self.cache.add(key, image, self.size)
+
+    def poll(self, widget, interval=POLL_INTERVAL):
+        # Drain now and then every `interval` milliseconds on `widget`'s event loop until done.
+        if not self.drain():
+            widget.after(interval, self.poll, widget, interval)
+
+    def wait(self):
+        # Block until every image has been loaded, and drain them.
+        self.executor.shutdown(wait=True)
+        return self.drain()
+
+
+# Process-wide cache used by the GUI.
+card_images = CardImageCache(pack=AssetPack.open_default())
@@ -0,0 +1,44 @@
+import os
+import random
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from .simulation import Simulation, SimulationReport
+
+# Rounds are split into fixed-size chunks and every chunk is played with its own RNG seeded from
+# the master seed and the chunk number. Which worker plays a chunk, and in what order chunks finish,
+# makes no difference to the result, so merged totals are identical for any number of workers.
+CHUNK_ROUNDS = 100_000
+
+
+def chunk_rng(seed, chunk):
+    # An independent RNG for one chunk. String seeds are hashed with SHA-512 by random.Random, so
+    # neighbouring chunks get unrelated streams, and the result does not depend on PYTHONHASHSEED.
+    return random.Random(f"{seed}:{chunk}")
+
+
+def run_chunk(settings, seed, chunk, rounds):
+    # Play one chunk and return its totals as a plain tuple, which is cheap to send between processes.
+    simulation = Simulation(**settings)
+    simulation.rng = chunk_rng(seed, chunk)
+    report = simulation.run(rounds)
+    return tuple(getattr(report, name) for name in SimulationReport.__slots__)
+
+
+def run_parallel(rounds, seed=0, workers=None, chunk_rounds=CHUNK_ROUNDS, **settings):
+    # Play `rounds` rounds across a pool of worker processes and return the merged SimulationReport.
+    # `settings` are passed to Simulation (num_players, policy, num_decks, penetration); the policy
+    # must be picklable, e.g. one made by simulation.stand_on. With workers=1 the chunks are played
+    # in this process, giving the same result without a pool.
+    chunks = [(chunk, min(chunk_rounds, rounds - start)) for chunk, start in enumerate(range(0, rounds, chunk_rounds))]
+    report = SimulationReport()
+    if workers == 1:
+        for chunk, chunk_size in chunks:
+            report.merge(SimulationReport(*run_chunk(settings, seed, chunk, chunk_size)))
+        return report
+
+    with ProcessPoolExecutor(max_workers=workers or os.cpu_count()) as executor:
+        futures = [executor.submit(run_chunk, settings, seed, chunk, chunk_size) for chunk, chunk_size in chunks]
+        # Merge partial totals as they arrive; integer sums do not depend on the order.
+        for future in as_completed(futures):
+            report.merge(SimulationReport(*future.result()))
+    return report
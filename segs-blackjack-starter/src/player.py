@@ -1,21 +1,51 @@
+from .card import CARD_TUPLES
+from .hand import Hand
+
+
 class Player:
+    # `score` is a plain attribute, read on every decision and settlement. hit, init_draw_cards and
+    # assigning `hand` keep it in sync with the hand. Changing the hand in place (e.g. hand.append or
+    # hand.add_code) does not: call BlackjackEngine.calculate_score(player), or assign the hand.
     MAX_SCORE = 21
+    __slots__ = ('_hand', 'score', 'deck', 'player_number')
 
     def __init__(self, deck, player_number):
-        self.hand = [] # The player's current hand of cards, initially empty.
+        self._hand = Hand() # The player's current hand of cards, initially empty.
         self.score = 0 # The initial score is set to 0
-        self.deck = deck # Reference to the shared deck object for drawing cards.
+        self.deck = deck # Reference to the shared deck (or shoe.Shoe) for drawing cards.
         self.player_number = player_number # Unique identifier for the player.
 
+    @property
+    def hand(self):
+        return self._hand
+
+    @hand.setter
+    def hand(self, cards):
+        # Accept any list of (rank, suit) tuples or card codes.
+        self._hand = Hand(cards)
+        self.score = self._hand.score
+
+    @property
+    def soft(self):
+        # True when an Ace in the hand is currently counted as 11.
+        return self._hand.soft
+
 
     def init_draw_cards(self):
         # Adds two cards from the deck to the player's hand
-        self.hand.extend([self.deck.cards.pop(), self.deck.cards.pop()])
+        self._hand.extend(self.deck.draw(2))
+        self.score = self._hand.score
 
 
     def hit(self):
         # Draw one card from the deck and add it to the player's hand, if cards remain in the deck.
-        self.hand.append(self.deck.cards.pop() if self.deck.cards else None)
+        # Returns the card drawn, or None (leaving the hand unchanged) if the deck is empty.
+        code = self.deck.draw_code()
+        if code is None:
+            return None
+        self._hand.add_code(code)
+        self.score = self._hand.score
+        return CARD_TUPLES[code]
 
 
     def is_bust(self):
@@ -1,4 +1,8 @@
+import argparse
 import os
+import re
+
+from .asset_pack import BACKGROUND_PATH, CARD_DIR, INDEX_PATH, PACK_PATH, build_asset_pack
 
 # Define suits mapping
 suits = {
@@ -25,26 +29,41 @@ ranks = {
     '13': 'king'
 }
 
-# Folder containing your card images
-source_folder = './Classic/'
+# Shorthand file names such as "h12.png" (queen of hearts). Files that are already renamed are left alone.
+SHORTHAND_NAME = re.compile(r'^([shdc])(\d\d)\.png$')
+
+
+def rename_cards(source_folder):
+    # Rename the files
+    for filename in os.listdir(source_folder):
+        match = SHORTHAND_NAME.match(filename)
+        if match:
+            # Parse the shorthand: suit character (s, h, d, c) then two rank digits (e.g. 01, 12)
+            suit_code, rank_code = match.groups()
+
+            # Get the full suit and rank names
+            suit_name = suits.get(suit_code, 'unknown')
+            rank_name = ranks.get(rank_code, 'unknown')
 
-# Rename the files
-for filename in os.listdir(source_folder):
-    if filename.endswith('.png'):
-        # Parse the shorthand
-        suit_code = filename[0]  # First character (s, h, d, c)
-        rank_code = filename[1:3]  # Next two characters (e.g., 01, 12)
+            # Generate the new file name
+            new_name = f"{rank_name}_of_{suit_name}.png"
+            old_path = os.path.join(source_folder, filename)
+            new_path = os.path.join(source_folder, new_name)
 
-        # Get the full suit and rank names
-        suit_name = suits.get(suit_code, 'unknown')
-        rank_name = ranks.get(rank_code, 'unknown')
+            # Rename the file
+            os.rename(old_path, new_path)
+            print(f"Renamed: {filename} -> {new_name}")
 
-        # Generate the new file name
-        new_name = f"{rank_name}_of_{suit_name}.png"
-        old_path = os.path.join(source_folder, filename)
-        new_path = os.path.join(source_folder, new_name)
 
-        # Rename the file
-        os.rename(old_path, new_path)
-        print(f"Renamed: {filename} -> {new_name}")
+if __name__ == '__main__':
+    # Asset build step, run from the folder containing README.md: python3 -m src.rename_cards
+    parser = argparse.ArgumentParser(description="Rename card images and build the asset pack.")
+    parser.add_argument('--cards', default=CARD_DIR, help="folder containing your card images")
+    parser.add_argument('--background', default=BACKGROUND_PATH, help="welcome screen background image")
+    parser.add_argument('--pack', default=PACK_PATH, help="asset pack file to write")
+    parser.add_argument('--index', default=INDEX_PATH, help="asset pack index file to write")
+    args = parser.parse_args()
 
+    rename_cards(args.cards)
+    index = build_asset_pack(args.cards, args.background, args.pack, args.index)
+    print(f"Packed {len(index['images'])} images ({index['size']:,} bytes) into {args.pack}")
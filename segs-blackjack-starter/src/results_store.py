@@ -0,0 +1,192 @@
+import json
+import os
+import sys
+from array import array
+from collections import namedtuple
+
+import numpy as np
+
+from .card import CODE_VALUES
+from .settlement import Outcome
+
+# A columnar store of per-seat round results (pip install numpy). Each column is a raw file of
+# fixed-width values in a directory, next to a JSON manifest holding the row count:
+#
+#   results/manifest.json, results/round_id.col, results/seat.col, ...
+#
+# ResultsWriter buffers rows in arrays and appends them to the column files a chunk at a time, then
+# updates the manifest, so a crash only loses the rows since the last flush. ResultsStore memory-maps
+# the columns and aggregates them chunk by chunk, so files far larger than memory can be analyzed.
+STORE_VERSION = 1
+MANIFEST = "manifest.json"
+CHUNK_ROWS = 1 << 16  # Rows buffered by ResultsWriter, and rows aggregated at once by ResultsStore
+
+# Column name, array typecode and NumPy dtype. Cards are card codes (see card.py); the upcard is the
+# dealer's second card, the one dealt face up.
+COLUMNS = (
+    ('round_id', 'Q', np.uint64),
+    ('seat', 'B', np.uint8),
+    ('first_card', 'B', np.uint8),
+    ('second_card', 'B', np.uint8),
+    ('upcard', 'B', np.uint8),
+    ('score', 'B', np.uint8),
+    ('dealer_score', 'B', np.uint8),
+    ('outcome', 'B', np.uint8),
+    ('payout', 'f', np.float32),
+)
+CODE_VALUE_TABLE = np.frombuffer(CODE_VALUES, dtype=np.uint8)
+
+
+def upcard_value(chunk):
+    # Group-by key: the dealer's upcard value, with Aces as 1 and ten-valued cards as 10.
+    return CODE_VALUE_TABLE[chunk['upcard']]
+
+
+def initial_total(chunk):
+    # Group-by key: the hard total of the player's first two cards.
+    return CODE_VALUE_TABLE[chunk['first_card']] + CODE_VALUE_TABLE[chunk['second_card']]
+
+
+def column_path(directory, name):
+    return os.path.join(directory, f"{name}.col")
+
+
+def read_manifest(directory):
+    with open(os.path.join(directory, MANIFEST)) as manifest_file:
+        manifest = json.load(manifest_file)
+    if manifest.get('version') != STORE_VERSION:
+        raise ValueError(f"Unsupported results store version {manifest.get('version')} in {directory}")
+    if manifest['byteorder'] != sys.byteorder:
+        raise ValueError(f"{directory} was written on a {manifest['byteorder']}-endian machine")
+    return manifest
+
+
+class ResultsWriter:
+    # Appends rows to a store, creating it if needed. Rows written past the manifest's row count by an
+    # interrupted flush are cut off when the store is reopened.
+    def __init__(self, directory, chunk_rows=CHUNK_ROWS):
+        self.directory = directory
+        self.chunk_rows = chunk_rows
+        os.makedirs(directory, exist_ok=True)
+        try:
+            self.rows = read_manifest(directory)['rows']
+        except FileNotFoundError:
+            self.rows = 0
+            self.write_manifest()
+        self.files = {}
+        for name, typecode, _ in COLUMNS:
+            column_file = open(column_path(directory, name), 'ab')
+            column_file.truncate(self.rows * array(typecode).itemsize)
+            self.files[name] = column_file
+        self.buffers = {name: array(typecode) for name, typecode, _ in COLUMNS}
+        self.buffered = 0
+
+    def append(self, round_id, seat, first_card, second_card, upcard, score, dealer_score, outcome, payout):
+        buffers = self.buffers
+        buffers['round_id'].append(round_id)
+        buffers['seat'].append(seat)
+        buffers['first_card'].append(first_card)
+        buffers['second_card'].append(second_card)
+        buffers['upcard'].append(upcard)
+        buffers['score'].append(min(score, 255))
+        buffers['dealer_score'].append(min(dealer_score, 255))
+        buffers['outcome'].append(outcome)
+        buffers['payout'].append(payout)
+        self.buffered += 1
+        if self.buffered >= self.chunk_rows:
+            self.flush()
+
+    def record(self, round_id, settlement, players, dealer):
+        # Append one row per seat of a settled round (see BlackjackEngine.settle).
+        upcard = dealer.hand.codes[1]
+        dealer_score = settlement.dealer_score
+        for seat, player in zip(settlement.seats, players):
+            codes = player.hand.codes
+            self.append(round_id, seat.player_number, codes[0], codes[1], upcard, seat.score, dealer_score,
+                        seat.outcome, seat.payout)
+
+    def flush(self):
+        if not self.buffered:
+            return
+        for name, buffer in self.buffers.items():
+            self.files[name].write(buffer.tobytes())
+            self.files[name].flush()
+            del buffer[:]
+        self.rows += self.buffered
+        self.buffered = 0
+        self.write_manifest()
+
+    def write_manifest(self):
+        manifest = {'version': STORE_VERSION, 'rows': self.rows, 'byteorder': sys.byteorder,
+                    'columns': [[name, np.dtype(dtype).str] for name, _, dtype in COLUMNS]}
+        path = os.path.join(self.directory, MANIFEST)
+        with open(path + ".tmp", 'w') as manifest_file:
+            json.dump(manifest, manifest_file)
+        os.replace(path + ".tmp", path)
+
+    def close(self):
+        self.flush()
+        for column_file in self.files.values():
+            column_file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+class GroupStats(namedtuple('GroupStats', ['keys', 'rows', 'wins', 'losses', 'ties', 'busts', 'payout'])):
+    # Totals per group key, as arrays aligned with `keys`. Only keys that have rows are included.
+    __slots__ = ()
+
+    @property
+    def win_rate(self):
+        return self.wins / self.rows
+
+    @property
+    def mean_payout(self):
+        return self.payout / self.rows
+
+
+class ResultsStore:
+    # Read-only, memory-mapped view of a store written by ResultsWriter.
+    def __init__(self, directory):
+        self.directory = directory
+        self.rows = read_manifest(directory)['rows']
+        self.columns = {}
+        for name, _, dtype in COLUMNS:
+            if self.rows:
+                self.columns[name] = np.memmap(column_path(directory, name), dtype=dtype, mode='r',
+                                               shape=(self.rows,))
+            else:
+                self.columns[name] = np.zeros(0, dtype=dtype)
+
+    def __len__(self):
+        return self.rows
+
+    def __getitem__(self, name):
+        return self.columns[name]
+
+    def chunks(self, chunk_rows=CHUNK_ROWS):
+        # Dicts of column slices, `chunk_rows` rows at a time.
+        for start in range(0, self.rows, chunk_rows):
+            yield {name: column[start:start + chunk_rows] for name, column in self.columns.items()}
+
+    def group_by(self, by, chunk_rows=CHUNK_ROWS):
+        # Count rows, outcomes and total payout per group. `by` is a column name or a function of a
+        # chunk returning small non-negative integer keys, e.g. upcard_value.
+        totals = np.zeros((6, 0))
+        for chunk in self.chunks(chunk_rows):
+            keys = (by(chunk) if callable(by) else chunk[by]).astype(np.intp)
+            size = max(totals.shape[1], int(keys.max()) + 1)
+            if size > totals.shape[1]:
+                totals = np.pad(totals, ((0, 0), (0, size - totals.shape[1])))
+            outcome = chunk['outcome']
+            totals[0] += np.bincount(keys, minlength=size)
+            for row, value in enumerate((Outcome.WIN, Outcome.LOSS, Outcome.TIE, Outcome.BUST), start=1):
+                totals[row] += np.bincount(keys, weights=outcome == value, minlength=size)
+            totals[5] += np.bincount(keys, weights=chunk['payout'], minlength=size)
+        present = np.flatnonzero(totals[0])
+        counts = totals[:5, present].astype(np.int64)
+        return GroupStats(present, *counts, totals[5, present])
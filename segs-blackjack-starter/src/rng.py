@@ -0,0 +1,69 @@
+from array import array
+
+import numpy as np
+
+from .card import NUM_CARDS
+
+# Random number sources built on NumPy's PCG64 generator (pip install numpy). Deck, Shoe and
+# BlackjackEngine only ever call rng.shuffle(codes) and rng.random(), so either class can be passed
+# as their `rng` in place of random.Random. The same seed always gives the same games.
+#
+#   rng = ShuffleBuffer(seed=7)
+#   engine = BlackjackEngine(num_players=3, deck=Deck(rng=rng), rng=rng)
+BATCH = 4096  # Shuffles (or uniform floats) generated per vectorized call
+
+
+def pcg64(seed=None):
+    return np.random.Generator(np.random.PCG64(seed))
+
+
+class GeneratorRandom:
+    # Adapts a numpy.random.Generator to the random.Random methods the game uses. Uniform floats are
+    # drawn `batch` at a time and handed out one per call to random().
+    def __init__(self, seed=None, generator=None, batch=BATCH):
+        self.generator = generator if generator is not None else pcg64(seed)
+        self.batch = batch
+        self._floats = []
+        self._next_float = 0
+
+    def random(self):
+        index = self._next_float
+        if index >= len(self._floats):
+            self._floats = self.generator.random(self.batch).tolist()
+            index = 0
+        self._next_float = index + 1
+        return self._floats[index]
+
+    def shuffle(self, cards):
+        # Shuffle a list, or an array of card codes without copying it.
+        if isinstance(cards, array):
+            self.generator.shuffle(np.frombuffer(cards, dtype=cards.typecode))
+        else:
+            self.generator.shuffle(cards)
+
+
+class ShuffleBuffer(GeneratorRandom):
+    # Shuffles sequences of `size` cards with permutations generated `batch` at a time in a single
+    # vectorized call; each shuffle() then only applies the next permutation. Use size=NUM_CARDS for
+    # a Deck and size=num_decks * NUM_CARDS for a Shoe. Sequences of any other size are shuffled
+    # directly.
+    def __init__(self, size=NUM_CARDS, seed=None, generator=None, batch=BATCH):
+        super().__init__(seed, generator, batch)
+        self.size = size
+        self._permutations = None
+        self._next_permutation = 0
+
+    def refill(self):
+        positions = np.arange(self.size, dtype=np.min_scalar_type(self.size - 1))
+        self._permutations = self.generator.permuted(np.tile(positions, (self.batch, 1)), axis=1)
+        self._next_permutation = 0
+
+    def shuffle(self, cards):
+        if len(cards) != self.size or not isinstance(cards, array):
+            super().shuffle(cards)
+            return
+        if self._permutations is None or self._next_permutation >= len(self._permutations):
+            self.refill()
+        view = np.frombuffer(cards, dtype=cards.typecode)
+        view[:] = view[self._permutations[self._next_permutation]]
+        self._next_permutation += 1
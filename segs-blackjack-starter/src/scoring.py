@@ -0,0 +1,31 @@
+from .card import CODE_VALUES, IS_ACE
+
+MAX_SCORE = 21
+
+# Assign numeric values to cards. Aces are initially valued at 1
+CARD_VALUES = {'2': 2, '3': 3, '4': 4, '5': 5, '6': 6, '7': 7, '8': 8, '9': 9, '10': 10, 'J': 10, 'Q': 10, 'K': 10,
+               'A': 1}
+
+
+def promote_aces(score, num_aces):
+    # Adjust Ace values to 11 where possible without causing a bust.
+    while num_aces > 0 and score + 10 <= MAX_SCORE:
+        score += 10
+        num_aces -= 1
+    return score
+
+
+def score_hand(hand):
+    # Calculate the total score for a hand of (rank, suit) cards.
+    score = getattr(hand, 'score', None)
+    if score is not None:
+        # Hands (hand.Hand) keep a running total, so their score is read directly.
+        return score
+    codes = getattr(hand, 'codes', None)
+    if codes is not None:
+        # Compact hands (card.CardArray) are scored straight from the lookup tables.
+        return promote_aces(sum(map(CODE_VALUES.__getitem__, codes)), sum(map(IS_ACE.__getitem__, codes)))
+    score = sum(CARD_VALUES[str(card[0])] for card in hand)
+    # Count the number of Aces in the hand.
+    num_aces = sum(1 for card in hand if card[0] == 'A')
+    return promote_aces(score, num_aces)
@@ -0,0 +1,356 @@
+import asyncio
+import json
+import logging
+import random
+
+from .card import CARD_TUPLES
+from .engine import BlackjackEngine
+from .shoe import Shoe
+
+# An asyncio server hosting many Blackjack tables in one process. Clients speak line-delimited JSON
+# over TCP or a Unix socket:
+#
+#   {"op": "join", "table": "t1"}   take the next free seat at a table (created on demand)
+#   {"op": "deal"}                  start a round at your table
+#   {"op": "hit"} / {"op": "stand"} act on your turn
+#   {"op": "leave"}                 leave the table
+#   {"op": "add_bot"}               fill the next free seat at your table with a bot
+#
+# The server replies with {"event": ...} messages, and {"error": ...} for rejected requests. Players
+# take turns in seat order exactly as in BlackjackEngine, and a player who does not act within the
+# turn timeout stands automatically. Bots act on their own after the server's bot think time, and a
+# table is closed once only bots are left at it.
+SEATS_PER_TABLE = 7
+TURN_TIMEOUT = 30.0  # Seconds a player has to act
+QUEUE_SIZE = 256  # Messages buffered for a client before it is considered too slow and dropped
+MAX_LINE = 4096  # Longest request line accepted
+MAX_TABLES = 10000
+BOT_THINK_TIME = 1.0  # Seconds a bot waits before each action
+
+log = logging.getLogger(__name__)
+
+
+def cards_json(hand):
+    return [[rank, suit] for rank, suit in map(CARD_TUPLES.__getitem__, hand.codes)]
+
+
+class TableEngine(BlackjackEngine):
+    # The rules engine for one round at a table, keeping the settlement messages.
+    def determine_winners(self, players, dealer_score):
+        self.results = super().determine_winners(players, dealer_score)
+        return self.results
+
+
+class Client:
+    def __init__(self, reader, writer, queue_size=QUEUE_SIZE):
+        self.reader = reader
+        self.writer = writer
+        self.queue = asyncio.Queue(maxsize=queue_size)
+        self.table = None
+        self.closed = False
+
+    def send(self, message):
+        # Queue a message without waiting. A client that lets its queue fill up is disconnected, so a
+        # slow reader can never hold up a table or make the server buffer without limit.
+        if self.closed:
+            return
+        try:
+            self.queue.put_nowait((json.dumps(message) + "\n").encode())
+        except asyncio.QueueFull:
+            self.close()
+
+    def close(self):
+        if not self.closed:
+            self.closed = True
+            self.writer.close()
+
+    async def write_loop(self):
+        try:
+            while not self.closed:
+                self.writer.write(await self.queue.get())
+                await self.writer.drain()  # Wait while the socket's buffer is full
+        except ConnectionError:
+            self.close()
+        except asyncio.CancelledError:
+            self.close()
+            raise
+
+
+class BotSeat:
+    # Holds a seat for a bot. Bots need no messages, so anything sent to them is dropped.
+    table = None
+
+    def send(self, message):
+        pass
+
+
+class Table:
+    def __init__(self, name, server):
+        self.name = name
+        self.server = server
+        self.seats = []  # Clients in seat order; None marks a seat left during a round
+        self.shoe = Shoe(num_decks=server.num_decks, rng=server.rng)
+        self.engine = None  # The round in progress, if any
+        self.timer = None
+
+    @property
+    def in_round(self):
+        return self.engine is not None
+
+    def broadcast(self, message):
+        for client in self.seats:
+            if client is not None:
+                client.send(message)
+
+    def join(self, client):
+        if self.in_round:
+            return "A round is in progress"
+        if len(self.seats) >= self.server.seats_per_table:
+            return "The table is full"
+        self.seats.append(client)
+        client.table = self
+        client.send({'event': 'joined', 'table': self.name, 'seat': len(self.seats)})
+        return None
+
+    def add_bot(self):
+        if self.in_round:
+            return "A round is in progress"
+        if len(self.seats) >= self.server.seats_per_table:
+            return "The table is full"
+        self.seats.append(BotSeat())
+        self.broadcast({'event': 'bot_joined', 'table': self.name, 'seat': len(self.seats)})
+        return None
+
+    @property
+    def has_humans(self):
+        return any(isinstance(client, Client) for client in self.seats)
+
+    def leave(self, client):
+        seat = self.seats.index(client)
+        client.table = None
+        if not self.in_round:
+            del self.seats[seat]
+            if not self.has_humans:
+                self.server.remove_table(self)
+            return
+        self.seats[seat] = None
+        if seat == self.engine.current_player_index:
+            self.stand()
+
+    def deal(self):
+        if self.in_round:
+            return "A round is in progress"
+        bots = [seat for seat, client in enumerate(self.seats, start=1) if isinstance(client, BotSeat)]
+        engine = TableEngine(num_players=len(self.seats), deck=self.shoe, rng=self.server.rng, bots=bots,
+                             think_time=self.server.bot_think_time)
+        engine.new_round()
+        engine.deal_hand()
+        self.engine = engine  # Only once the deal has succeeded, so a failed deal leaves no round behind
+        self.start_turn()
+        return None
+
+    def act(self, client, op):
+        if not self.in_round:
+            return "No round in progress"
+        if self.seats.index(client) != self.engine.current_player_index:
+            return "It is not your turn"
+        self.play(op)
+        return None
+
+    def play(self, op):
+        # Apply a hit or stand for the player whose turn it is.
+        if op == 'hit':
+            self.engine.hit()
+            if self.engine.is_bust(self.engine.current_player_index):
+                self.stand()
+            else:
+                self.start_turn()
+        else:
+            self.stand()
+
+    def stand(self):
+        # Move on to the next player, or finish the round once everyone has played.
+        if self.engine.next_player():
+            self.start_turn()
+        else:
+            self.end_round()
+
+    def start_turn(self):
+        # Tell the table whose turn it is, standing straight away for empty seats.
+        if self.timer is not None:
+            self.timer.cancel()
+        seat = self.engine.current_player_index
+        if self.seats[seat] is None:
+            self.stand()
+            return
+        self.broadcast(self.state())
+        engine = self.engine
+        bot = engine.bot_to_play()
+        if bot is not None:
+            self.timer = asyncio.get_running_loop().call_later(bot.think_time, self.bot_action, engine, seat)
+            return
+        self.timer = asyncio.get_running_loop().call_later(self.server.turn_timeout, self.timed_out, engine, seat)
+
+    def bot_action(self, engine, seat):
+        # Let the bot on `seat` act, if the same turn of the same round is still waiting.
+        self.timer = None
+        if self.engine is not engine or engine.current_player_index != seat:
+            return
+        try:
+            self.play('hit' if engine.bot_wants_hit() else 'stand')
+        except Exception:
+            # Called from the event loop, where an exception would only be logged and the round would
+            # stall with no timer set. Stand for the bot instead.
+            log.exception("Bot on seat %d at table %r failed, standing", seat + 1, self.name)
+            if self.engine is engine and engine.current_player_index == seat:
+                self.stand()
+
+    def timed_out(self, engine, seat):
+        # Only stand if the same turn of the same round is still waiting.
+        self.timer = None
+        if self.engine is engine and engine.current_player_index == seat:
+            self.stand()
+
+    def end_round(self):
+        if self.timer is not None:
+            self.timer.cancel()
+            self.timer = None
+        engine = self.engine
+        self.engine = None
+        outcomes = [{'seat': seat.player_number, 'outcome': seat.outcome.name.lower(), 'score': seat.score,
+                     'payout': seat.payout} for seat in engine.settlement.seats]
+        self.broadcast({'event': 'results', 'table': self.name, 'results': engine.results, 'outcomes': outcomes,
+                        'dealer': cards_json(engine.dealer.hand), 'dealer_score': engine.dealer.score})
+        self.seats = [client for client in self.seats if client is not None]
+        if not self.has_humans:
+            self.server.remove_table(self)
+
+    def state(self):
+        engine = self.engine
+        return {
+            'event': 'turn',
+            'table': self.name,
+            'seat': engine.current_player_index + 1,
+            'hands': [{'seat': player.player_number, 'cards': cards_json(player.hand), 'score': player.score}
+                      for player in engine.players],
+            # The dealer's first card stays face down until the round is settled.
+            'dealer_upcard': cards_json(engine.dealer.hand)[1:],
+        }
+
+
+class GameServer:
+    def __init__(self, turn_timeout=TURN_TIMEOUT, seats_per_table=SEATS_PER_TABLE, max_tables=MAX_TABLES,
+                 queue_size=QUEUE_SIZE, num_decks=6, seed=None, bot_think_time=BOT_THINK_TIME):
+        self.turn_timeout = turn_timeout
+        self.bot_think_time = bot_think_time
+        self.seats_per_table = seats_per_table
+        self.max_tables = max_tables
+        self.queue_size = queue_size
+        self.num_decks = num_decks
+        self.rng = random.Random(seed)
+        self.tables = {}
+
+    def remove_table(self, table):
+        if self.tables.get(table.name) is table:
+            del self.tables[table.name]
+
+    async def start(self, host='127.0.0.1', port=8765, unix_path=None):
+        if unix_path:
+            return await asyncio.start_unix_server(self.handle_client, path=unix_path, limit=MAX_LINE)
+        return await asyncio.start_server(self.handle_client, host, port, limit=MAX_LINE)
+
+    async def handle_client(self, reader, writer):
+        client = Client(reader, writer, self.queue_size)
+        writer_task = asyncio.create_task(client.write_loop())
+        try:
+            while not client.closed:
+                line = await reader.readline()
+                if not line:
+                    break
+                try:
+                    message = json.loads(line)
+                    op = message['op']
+                except (ValueError, KeyError, TypeError):
+                    client.send({'error': "Expected a JSON object with an 'op'"})
+                    continue
+                try:
+                    error = self.dispatch(client, op, message)
+                except Exception:
+                    # A bug in one request must not drop the connection or stall the table
+                    log.exception("Request %r from a client failed", message)
+                    error = "Internal error"
+                if error:
+                    client.send({'error': error, 'op': op})
+        except (ConnectionError, ValueError):
+            pass  # Disconnected, or a line longer than MAX_LINE
+        finally:
+            if client.table is not None:
+                client.table.leave(client)
+            client.close()
+            writer_task.cancel()
+
+    def dispatch(self, client, op, message):
+        # Apply one request. Returns an error message, or None if it was accepted.
+        if op == 'join':
+            if client.table is not None:
+                return "Already at a table"
+            name = str(message.get('table', ''))
+            table = self.tables.get(name)
+            if table is None:
+                if len(self.tables) >= self.max_tables:
+                    return "No more tables can be opened"
+                table = self.tables[name] = Table(name, self)
+            error = table.join(client)
+            if error and not table.seats:
+                self.remove_table(table)
+            return error
+        table = client.table
+        if table is None:
+            return "Join a table first"
+        if op == 'leave':
+            table.leave(client)
+            client.send({'event': 'left', 'table': table.name})
+            return None
+        if op == 'deal':
+            return table.deal()
+        if op in ('hit', 'stand'):
+            return table.act(client, op)
+        if op == 'add_bot':
+            return table.add_bot()
+        return f"Unknown op {op!r}"
+
+
+if __name__ == '__main__':
+    import argparse
+
+    from .metrics import SnapshotWriter, metrics
+
+    parser = argparse.ArgumentParser(description="Serve Blackjack tables over line-delimited JSON.")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--unix', default=None, help="listen on this Unix socket path instead of TCP")
+    parser.add_argument('--turn-timeout', type=float, default=TURN_TIMEOUT)
+    parser.add_argument('--decks', type=int, default=6)
+    parser.add_argument('--bot-think-time', type=float, default=BOT_THINK_TIME)
+    parser.add_argument('--metrics-port', type=int, default=None,
+                        help="serve metrics as JSON on http://127.0.0.1:PORT/metrics")
+    parser.add_argument('--metrics-file', default=None, help="write a metrics snapshot to this file periodically")
+    parser.add_argument('--log-level', default='INFO')
+    args = parser.parse_args()
+
+    logging.basicConfig(level=args.log_level)
+    if args.metrics_port is not None or args.metrics_file:
+        metrics.enable()
+    if args.metrics_port is not None:
+        metrics.serve(port=args.metrics_port)
+    if args.metrics_file:
+        SnapshotWriter(metrics, args.metrics_file).start()
+
+    async def main():
+        server = await GameServer(turn_timeout=args.turn_timeout, num_decks=args.decks,
+                                  bot_think_time=args.bot_think_time).start(
+            args.host, args.port, args.unix)
+        async with server:
+            await server.serve_forever()
+
+    asyncio.run(main())
@@ -0,0 +1,143 @@
+from array import array
+from collections import namedtuple
+from enum import IntEnum
+
+from .scoring import MAX_SCORE
+
+# Settles a round under the table rules of BlackjackEngine.determine_winners: busted players lose,
+# everyone else wins if the dealer busts. Otherwise only the players holding the best score at the
+# table are compared with the dealer, and the rest lose.
+#
+# Every seat gets a structured result; the messages shown by the GUI are only built when render()
+# is called. Payouts are multiples of the stake: a win pays 1 (BLACKJACK_PAYOUT for a two-card 21),
+# a tie 0 and a loss or bust -1.
+BLACKJACK_PAYOUT = 1.5
+
+
+class Outcome(IntEnum):
+    # Also the values stored in hand history logs, the results store and simulation totals.
+    WIN = 1
+    LOSS = 2
+    TIE = 3
+    BUST = 4
+
+
+WIN, LOSS, TIE, BUST = Outcome.WIN, Outcome.LOSS, Outcome.TIE, Outcome.BUST
+PAYOUTS = {Outcome.WIN: 1.0, Outcome.LOSS: -1.0, Outcome.TIE: 0.0, Outcome.BUST: -1.0}
+
+
+def best_score(scores):
+    # The best score at the table among the players who did not bust, 0 if none.
+    max_score = 0
+    for score in scores:
+        if max_score < score <= MAX_SCORE:
+            max_score = score
+    return max_score
+
+
+def outcome(score, max_score, dealer_score, dealer_bust):
+    # The table rule for one player, given the best score at the table (see best_score).
+    if score > MAX_SCORE:
+        return BUST
+    if dealer_bust or (score == max_score and score > dealer_score):
+        return WIN
+    if score == max_score and score == dealer_score:
+        return TIE
+    return LOSS
+
+
+def classify(scores, dealer_score, dealer_bust=None):
+    # The outcome of every player's score, without building a Settlement.
+    if dealer_bust is None:
+        dealer_bust = dealer_score > MAX_SCORE
+    max_score = best_score(scores)
+    return [outcome(score, max_score, dealer_score, dealer_bust) for score in scores]
+
+
+SeatResult = namedtuple('SeatResult', ['player_number', 'outcome', 'score', 'payout', 'blackjack', 'bust'])
+
+
+class Settlement:
+    # The results of one round: a SeatResult per player, in seat order.
+    __slots__ = ('seats', 'dealer_score', 'dealer_bust', 'max_score')
+
+    def __init__(self, seats, dealer_score, dealer_bust, max_score):
+        self.seats = seats
+        self.dealer_score = dealer_score
+        self.dealer_bust = dealer_bust
+        self.max_score = max_score  # Best score among the players who did not bust, 0 if none
+
+    @property
+    def outcomes(self):
+        return [seat.outcome for seat in self.seats]
+
+    def render(self):
+        # The result messages of BlackjackEngine.determine_winners, in the same order: busted players,
+        # then either the dealer's bust or the players holding the best score, then everyone else.
+        results = [f"Player {seat.player_number} busts and loses, Score {seat.score}"
+                   for seat in self.seats if seat.bust]
+        if self.dealer_bust:
+            results.append(f"Dealer busts, Score {self.dealer_score}")
+            return results
+        losers = []
+        for seat in self.seats:
+            if seat.bust:
+                continue
+            if seat.score < self.max_score:
+                losers.append(f"Player {seat.player_number} loses, Score {seat.score}")
+            elif seat.outcome == Outcome.WIN:
+                results.append(f"Player {seat.player_number} Wins, Score {seat.score}")
+                results.append(f"Dealer loses, Score {self.dealer_score}")
+            elif seat.outcome == Outcome.TIE:
+                results.append(f"Player {seat.player_number} and Dealer tie, Score {seat.score}")
+            else:
+                results.append(f"Player {seat.player_number} loses, Score {seat.score}")
+                results.append(f"Dealer wins, Score {self.dealer_score}")
+        return results + losers
+
+
+def settle(players, dealer_score, dealer_bust=None, blackjack_payout=BLACKJACK_PAYOUT):
+    # Settle every player against the dealer. Each player's score is read once, then the outcomes
+    # are decided from the collected scores.
+    if dealer_bust is None:
+        dealer_bust = dealer_score > MAX_SCORE
+    scores = [player.score for player in players]
+    max_score = best_score(scores)
+
+    seats = []
+    for player, score in zip(players, scores):
+        result = outcome(score, max_score, dealer_score, dealer_bust)
+        blackjack = score == MAX_SCORE and len(player.hand) == 2
+        payout = blackjack_payout if blackjack and result == Outcome.WIN else PAYOUTS[result]
+        seats.append(SeatResult(player.player_number, result, score, payout, blackjack, score > MAX_SCORE))
+    return Settlement(seats, dealer_score, dealer_bust, max_score)
+
+
+class Ledger:
+    # Bankrolls for a fixed number of seats, held in one array of doubles and indexed by player
+    # number (seat 1 is the first entry), so thousands of virtual players cost 8 bytes each.
+    __slots__ = ('balances',)
+
+    def __init__(self, num_seats, bankroll=0.0):
+        self.balances = array('d', [bankroll]) * num_seats
+
+    def __len__(self):
+        return len(self.balances)
+
+    def __getitem__(self, player_number):
+        return self.balances[player_number - 1]
+
+    def apply(self, settlement, stake=1.0):
+        # Pay out a settlement. `stake` is the amount every player bet, or a sequence of stakes
+        # indexed like the balances.
+        balances = self.balances
+        if isinstance(stake, (int, float)):
+            for seat in settlement.seats:
+                balances[seat.player_number - 1] += seat.payout * stake
+        else:
+            for seat in settlement.seats:
+                index = seat.player_number - 1
+                balances[index] += seat.payout * stake[index]
+
+    def total(self):
+        return sum(self.balances)
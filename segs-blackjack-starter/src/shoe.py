@@ -0,0 +1,78 @@
+import random
+from array import array
+
+from .card import NUM_CARDS, CARD_TUPLES, CardArray
+from .composition import CompositionIndex
+
+
+class Shoe:
+    # A shoe of several decks shuffled together. Cards are dealt by moving a cursor through a
+    # preallocated array, and the shoe is reshuffled between rounds once the cut card is reached.
+    # As with Deck, changing `codes` or `position` directly bypasses `composition`: call recount()
+    # afterwards.
+    def __init__(self, num_decks=6, penetration=0.75, rng=None):
+        if num_decks < 1:
+            raise ValueError("A shoe needs at least one deck")
+        if not 0 < penetration <= 1:
+            raise ValueError("Penetration must be a fraction of the shoe between 0 and 1")
+        self.num_decks = num_decks
+        self.rng = rng if rng is not None else random  # See Deck
+        self.penetration = penetration
+        self.codes = array('b', range(NUM_CARDS)) * num_decks
+        # The cut card: once this many cards have been dealt the shoe is reshuffled before the next round.
+        self.cut_card = int(len(self.codes) * penetration)
+        self.position = 0  # Index of the next card to deal
+        self.composition = CompositionIndex()  # The cards left to deal, see Deck
+        self.shuffle()
+
+    def shuffle(self):
+        # Shuffle every card back into the shoe.
+        self.rng.shuffle(self.codes)
+        self.position = 0
+        self.composition.reset_full(self.num_decks)
+
+    def recount(self):
+        # Rebuild the composition from the cards left to deal. The running count restarts at 0.
+        self.composition.reset(self.codes[self.position:])
+
+    @property
+    def remaining(self):
+        return len(self.codes) - self.position
+
+    @property
+    def needs_shuffle(self):
+        return self.position >= self.cut_card
+
+    def start_round(self, min_cards=0):
+        # Reshuffle if the cut card has come out, or if fewer than `min_cards` cards (the initial
+        # deal) are left, as can happen when the cut card is at the very end. Returns True if the
+        # shoe was reshuffled.
+        if self.needs_shuffle or self.remaining < min_cards:
+            self.shuffle()
+            return True
+        return False
+
+    def draw_code(self):
+        # Deal the next card code, or return None if the shoe is empty.
+        position = self.position
+        if position >= len(self.codes):
+            return None
+        self.position = position + 1
+        code = self.codes[position]
+        self.composition.remove(code)
+        return code
+
+    def draw_card(self):
+        # Deal the next card as a (rank, suit) tuple, or return None if the shoe is empty.
+        code = self.draw_code()
+        return None if code is None else CARD_TUPLES[code]
+
+    def draw(self, n):
+        # Deal the next `n` cards at once.
+        position = self.position
+        if n > len(self.codes) - position:
+            raise IndexError(f"Cannot draw {n} cards, only {len(self.codes) - position} left in the shoe")
+        self.position = position + n
+        codes = self.codes[position:position + n]
+        self.composition.remove_codes(codes)
+        return CardArray.from_codes(codes)
@@ -0,0 +1,240 @@
+import random
+from functools import partial
+
+from .dealer import Dealer
+from .card import CODE_VALUES, NUM_CARDS
+from .scoring import MAX_SCORE
+
+
+# A player policy is called as policy(score, soft, dealer_upcard) and returns True to hit.
+# `soft` is True when an Ace is currently counted as 11, `dealer_upcard` is the value of the
+# dealer's visible card (Aces are 1).
+def hit_below(threshold, score, soft, dealer_upcard):
+    return score < threshold
+
+
+def stand_on(threshold):
+    # Build a policy that hits until the score reaches `threshold`. Policies built this way can be
+    # pickled, so they can be sent to worker processes (see parallel.py).
+    return partial(hit_below, threshold)
+
+
+def never_hit(score, soft, dealer_upcard):
+    return False
+
+
+class SimulationReport:
+    __slots__ = ('rounds', 'wins', 'losses', 'ties', 'busts', 'dealer_busts')
+
+    def __init__(self, rounds=0, wins=0, losses=0, ties=0, busts=0, dealer_busts=0):
+        self.rounds = rounds  # Number of rounds played
+        self.wins = wins  # Hands that beat the dealer
+        self.losses = losses  # Hands that lost without busting
+        self.ties = ties  # Hands that tied with the dealer
+        self.busts = busts  # Hands that went over 21
+        self.dealer_busts = dealer_busts  # Rounds in which the dealer went over 21
+
+    @property
+    def hands(self):
+        # Every seat plays one hand per round and ends in exactly one of the four outcomes.
+        return self.wins + self.losses + self.ties + self.busts
+
+    def rate(self, count):
+        return count / self.hands if self.hands else 0.0
+
+    def merge(self, other):
+        # Add the totals of another report into this one.
+        for name in self.__slots__:
+            setattr(self, name, getattr(self, name) + getattr(other, name))
+        return self
+
+    def as_dict(self):
+        return {name: getattr(self, name) for name in self.__slots__}
+
+    def summary(self):
+        # Human-readable summary, built once at the end of a run rather than per round.
+        return "\n".join([
+            f"Rounds: {self.rounds}, Hands: {self.hands}",
+            f"Win rate:  {self.rate(self.wins):.4%}",
+            f"Loss rate: {self.rate(self.losses):.4%}",
+            f"Tie rate:  {self.rate(self.ties):.4%}",
+            f"Bust rate: {self.rate(self.busts):.4%}",
+            f"Dealer bust rate: {self.dealer_busts / self.rounds if self.rounds else 0.0:.4%}",
+        ])
+
+    def __repr__(self):
+        return f"SimulationReport({', '.join(f'{k}={v}' for k, v in self.as_dict().items())})"
+
+
+class Simulation:
+    # Plays Blackjack rounds without any GUI, following the same rules as BlackjackEngine.deal_hand,
+    # calculate_score, dealer_turn and determine_winners. By default each round is played from a
+    # freshly shuffled deck, just like a new Blackjack game. With a `penetration` the cards are
+    # dealt from a shoe of `num_decks` decks that is only reshuffled once that fraction of it has
+    # been dealt, like shoe.Shoe.
+    def __init__(self, num_players=1, policy=None, seed=None, num_decks=1, penetration=None):
+        deck_size = NUM_CARDS * num_decks
+        if 2 * (num_players + 1) > deck_size:
+            raise ValueError(f"Not enough cards to deal to {num_players} players")
+        if penetration is not None and not 0 < penetration <= 1:
+            raise ValueError("Penetration must be a fraction of the shoe between 0 and 1")
+        self.num_players = num_players
+        self.policy = policy or stand_on(Dealer.STAND_SCORE)
+        self.rng = random.Random(seed)
+        # Card values for the shoe, sorted so that a seed always picks the same cards. They come from
+        # the card tables rather than a Deck, whose shuffle would draw on the global random state.
+        self.deck_values = sorted(CODE_VALUES * num_decks)
+        # Reshuffle before a round once no more than this many cards are left. A fresh deck every
+        # round is the same as reshuffling whenever any card has been dealt.
+        if penetration is None:
+            self.reshuffle_at = deck_size - 1
+        else:
+            self.reshuffle_at = max(deck_size - int(deck_size * penetration), 2 * (num_players + 1) - 1)
+
+    def play(self, rounds):
+        # Play `rounds` rounds, yielding the players' final scores and the dealer's score after each.
+        # The scores list is reused from round to round, so copy it to keep it.
+        # Local names keep attribute lookups off the hot path.
+        rand = self.rng.random
+        policy = self.policy
+        deck_values = self.deck_values
+        deck_size = len(deck_values)
+        seats = range(self.num_players)
+        stand_score = Dealer.STAND_SCORE
+        risk_max_score = Dealer.RISK_MAX_SCORE
+        risk_hit_chance = Dealer.RISK_HIT_CHANCE
+        hards = [0] * self.num_players
+        aces = [0] * self.num_players
+        scores = [0] * self.num_players
+
+        reshuffle_at = self.reshuffle_at
+        cards = []
+        remaining = 0
+
+        for _ in range(rounds):
+            # Drawing a card from a random position of the unseen cards (a partial Fisher-Yates
+            # shuffle) is equivalent to dealing from a fully shuffled shoe, but only pays for the
+            # cards that are actually used.
+            if remaining <= reshuffle_at:
+                cards = deck_values[:]
+                remaining = deck_size
+
+            # Deal two cards to each player, then two to the dealer.
+            for seat in seats:
+                j = int(rand() * remaining)
+                remaining -= 1
+                first = cards[j]
+                cards[j] = cards[remaining]
+                j = int(rand() * remaining)
+                remaining -= 1
+                second = cards[j]
+                cards[j] = cards[remaining]
+                hards[seat] = first + second
+                aces[seat] = (first == 1) + (second == 1)
+            j = int(rand() * remaining)
+            remaining -= 1
+            dealer_hard = cards[j]
+            cards[j] = cards[remaining]
+            j = int(rand() * remaining)
+            remaining -= 1
+            upcard = cards[j]  # The dealer's first card is face down, the second is visible
+            cards[j] = cards[remaining]
+            dealer_hard += upcard
+            dealer_aces = (dealer_hard - upcard == 1) + (upcard == 1)
+
+            # Each player hits according to the policy until they stand or bust.
+            # At most one Ace can ever be promoted, so the score is hard + 10 when that fits.
+            for seat in seats:
+                hard = hards[seat]
+                num_aces = aces[seat]
+                soft = num_aces > 0 and hard + 10 <= MAX_SCORE
+                score = hard + 10 if soft else hard
+                while score <= MAX_SCORE and remaining and policy(score, soft, upcard):
+                    j = int(rand() * remaining)
+                    remaining -= 1
+                    card = cards[j]
+                    cards[j] = cards[remaining]
+                    hard += card
+                    num_aces += card == 1
+                    soft = num_aces > 0 and hard + 10 <= MAX_SCORE
+                    score = hard + 10 if soft else hard
+                scores[seat] = score
+
+            # Dealer's turn, as in Blackjack.dealer_turn.
+            dealer_score = dealer_hard + 10 if dealer_aces and dealer_hard + 10 <= MAX_SCORE else dealer_hard
+            while dealer_score < stand_score and remaining:
+                j = int(rand() * remaining)
+                remaining -= 1
+                card = cards[j]
+                cards[j] = cards[remaining]
+                dealer_hard += card
+                dealer_aces += card == 1
+                dealer_score = dealer_hard + 10 if dealer_aces and dealer_hard + 10 <= MAX_SCORE else dealer_hard
+            if stand_score <= dealer_score <= risk_max_score and rand() < risk_hit_chance and remaining:
+                j = int(rand() * remaining)
+                remaining -= 1
+                card = cards[j]
+                cards[j] = cards[remaining]
+                dealer_hard += card
+                dealer_aces += card == 1
+                dealer_score = dealer_hard + 10 if dealer_aces and dealer_hard + 10 <= MAX_SCORE else dealer_hard
+
+            yield scores, dealer_score
+
+    def run(self, rounds):
+        # Settle every round with the rule of settlement.classify (that is, BlackjackEngine.settle),
+        # written out with plain comparisons and counters so that nothing is allocated per round.
+        wins = losses = ties = busts = dealer_busts = 0
+        for scores, dealer_score in self.play(rounds):
+            if dealer_score > MAX_SCORE:
+                dealer_busts += 1
+                for score in scores:
+                    if score > MAX_SCORE:
+                        busts += 1
+                    else:
+                        wins += 1
+                continue
+            max_score = 0  # settlement.best_score
+            for score in scores:
+                if max_score < score <= MAX_SCORE:
+                    max_score = score
+            for score in scores:
+                if score > MAX_SCORE:
+                    busts += 1
+                elif score != max_score or score < dealer_score:
+                    losses += 1
+                elif score > dealer_score:
+                    wins += 1
+                else:
+                    ties += 1
+        return SimulationReport(rounds, wins, losses, ties, busts, dealer_busts)
+
+
+if __name__ == '__main__':
+    import argparse
+    import time
+
+    parser = argparse.ArgumentParser(description="Run a headless Blackjack simulation.")
+    parser.add_argument('--rounds', type=int, default=1_000_000, help="number of rounds to play")
+    parser.add_argument('--players', type=int, default=1, help="number of players at the table")
+    parser.add_argument('--stand-on', type=int, default=Dealer.STAND_SCORE,
+                        help="players hit until their score reaches this value")
+    parser.add_argument('--seed', type=int, default=None, help="seed for reproducible runs")
+    parser.add_argument('--workers', type=int, default=None,
+                        help="play chunks of rounds in this many processes (0 for one per CPU)")
+    parser.add_argument('--decks', type=int, default=1, help="number of decks in the shoe")
+    parser.add_argument('--penetration', type=float, default=None,
+                        help="fraction of the shoe dealt before reshuffling (default: a fresh shoe every round)")
+    args = parser.parse_args()
+
+    settings = dict(num_players=args.players, policy=stand_on(args.stand_on), num_decks=args.decks,
+                    penetration=args.penetration)
+    start = time.perf_counter()
+    if args.workers is None:
+        result = Simulation(seed=args.seed, **settings).run(args.rounds)
+    else:
+        from .parallel import run_parallel
+        result = run_parallel(args.rounds, seed=args.seed or 0, workers=args.workers or None, **settings)
+    elapsed = time.perf_counter() - start
+    print(result.summary())
+    print(f"{args.rounds / elapsed:,.0f} rounds/s")
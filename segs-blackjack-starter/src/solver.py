@@ -0,0 +1,156 @@
+import json
+import os
+from functools import lru_cache
+
+from .card import CODE_VALUES, to_code
+from .dealer import Dealer
+from .dealer_odds import BUST, CACHE_SIZE, dealer_distribution, full_composition, remove_card
+from .scoring import MAX_SCORE
+
+# Expected value of hitting and standing for every player hand against every dealer upcard, under
+# the dealer rules of BlackjackEngine.play_dealer. A win is worth +1, a tie 0 and a loss or bust -1.
+#
+# This is an infinite-deck approximation: the player's draws and the dealer's distribution are both
+# taken from a fixed composition, the cards left when the decision is made, which is not depleted by
+# the cards the player goes on to draw. Exact depletion needs a dealer distribution per sequence of
+# player draws, which takes seconds per hand.
+#
+# Settlement follows the table rule of settlement.settle for a player who knows the best score
+# already standing at the table (`table_score`, 0 when heads-up or first to act): a player below it
+# loses unless the dealer busts. Players still to act are not modelled.
+#
+# A hand's state is its score and whether it is soft (an Ace counted as 11). A hand holding an Ace
+# that can no longer be counted as 11 plays exactly like a hard hand of the same score.
+TABLE_VERSION = 1
+TABLE_PATH = "./src/strategy_{num_decks}_decks.json"
+SCORES = range(MAX_SCORE + 1)
+UPCARDS = range(1, 11)  # Dealer upcard values, Aces are 1
+
+
+def rules():
+    # Everything the tables depend on besides the number of decks. Stored tables computed under
+    # different rules are recomputed.
+    return {
+        'version': TABLE_VERSION,
+        'max_score': MAX_SCORE,
+        'dealer_stand_score': Dealer.STAND_SCORE,
+        'dealer_risk_max_score': Dealer.RISK_MAX_SCORE,
+        'dealer_risk_hit_chance': Dealer.RISK_HIT_CHANCE,
+    }
+
+
+def stand_value(score, distribution, table_score=0):
+    # Expected value of standing on `score` against a dealer final-total distribution, when the
+    # best score standing at the table is `table_score`.
+    if score < table_score:
+        # Not on the table's best score: only a dealer bust wins
+        return distribution[BUST] - (1.0 - distribution[BUST])
+    win = distribution[BUST] + sum(distribution[:score])
+    lose = sum(distribution[score + 1:BUST])
+    return win - lose
+
+
+@lru_cache(maxsize=CACHE_SIZE)
+def infinite_deck_values(composition, upcard, table_score=0):
+    # {(score, soft): (stand EV, hit EV)} for a dealer upcard and the cards left in the shoe
+    # (excluding the player's cards and the upcard). Every card the player draws, and the dealer's
+    # distribution, is taken from this same composition.
+    distribution = dealer_distribution(upcard, composition)
+    cards = sum(composition)
+    draws = [(count / cards, value) for value, count in enumerate(composition, start=1) if count]
+    values = {}
+
+    def best(hard, has_ace):
+        # Expected value of playing the hand on optimally. Hitting only ever increases the hard
+        # total, so the recursion ends at a bust.
+        if hard > MAX_SCORE:
+            return -1.0
+        soft = has_ace and hard + 10 <= MAX_SCORE
+        score = hard + 10 if soft else hard
+        key = (score, soft)
+        if key not in values:
+            stand = stand_value(score, distribution, table_score)
+            hit = sum(probability * best(hard + value, has_ace or value == 1) for probability, value in draws)
+            values[key] = (stand, hit)
+        return max(values[key])
+
+    for hard in range(2, MAX_SCORE + 1):
+        best(hard, False)
+        best(hard, True)
+    return values
+
+
+class StrategyTable:
+    # Hit and stand expected values for a full shoe, heads-up (table_score 0), held in flat lists so a
+    # lookup is a single index calculation.
+    def __init__(self, num_decks, stand, hit):
+        self.num_decks = num_decks
+        self.stand = stand
+        self.hit = hit
+
+    @staticmethod
+    def index(score, soft, upcard):
+        return ((upcard - 1) * len(SCORES) + score) * 2 + soft
+
+    @classmethod
+    def compute(cls, num_decks=1):
+        size = len(UPCARDS) * len(SCORES) * 2
+        stand = [0.0] * size
+        hit = [0.0] * size
+        for upcard in UPCARDS:
+            composition = remove_card(full_composition(num_decks), upcard)
+            for (score, soft), (stand_ev, hit_ev) in infinite_deck_values(composition, upcard).items():
+                stand[cls.index(score, soft, upcard)] = stand_ev
+                hit[cls.index(score, soft, upcard)] = hit_ev
+        return cls(num_decks, stand, hit)
+
+    @classmethod
+    def load(cls, num_decks=1, path=None):
+        # Load the stored table for `num_decks`, recomputing and saving it if it is missing or was
+        # computed under different rules.
+        path = path or TABLE_PATH.format(num_decks=num_decks)
+        try:
+            with open(path) as table_file:
+                stored = json.load(table_file)
+            if stored['rules'] == rules() and stored['num_decks'] == num_decks:
+                return cls(num_decks, stored['stand'], stored['hit'])
+        except (OSError, ValueError, KeyError):
+            pass
+        table = cls.compute(num_decks)
+        table.save(path)
+        return table
+
+    def save(self, path):
+        with open(path + ".tmp", 'w') as table_file:
+            json.dump({'rules': rules(), 'num_decks': self.num_decks, 'stand': self.stand, 'hit': self.hit},
+                      table_file)
+        os.replace(path + ".tmp", path)
+
+    def values(self, score, soft, upcard):
+        # (stand EV, hit EV) for a hand state against a dealer upcard value.
+        if score > MAX_SCORE:
+            raise ValueError(f"A score of {score} is bust, there is no decision to make")
+        index = self.index(score, soft, upcard)
+        return self.stand[index], self.hit[index]
+
+    def should_hit(self, score, soft, upcard):
+        if score > MAX_SCORE:
+            return False
+        index = self.index(score, soft, upcard)
+        return self.hit[index] > self.stand[index]
+
+    def advise(self, hand, upcard):
+        # "hit" or "stand" for a Player.hand against the dealer's visible card.
+        upcard_value = CODE_VALUES[to_code(upcard)]
+        return "hit" if self.should_hit(hand.score, hand.soft, upcard_value) else "stand"
+
+
+def advise(hand, upcard, composition, table_score=0):
+    # "hit" or "stand" for a hand given the cards left in the shoe (excluding the player's cards and
+    # the dealer's upcard, as in Shoe.composition.values()), e.g. late in a shoe, under the
+    # infinite-deck approximation above. A bust hand stands. Results are cached per composition.
+    if hand.score > MAX_SCORE:
+        return "stand"
+    upcard_value = CODE_VALUES[to_code(upcard)]
+    stand, hit = infinite_deck_values(tuple(composition), upcard_value, table_score)[hand.score, hand.soft]
+    return "hit" if hit > stand else "stand"
@@ -0,0 +1,84 @@
+import os
+import tempfile
+import unittest
+
+from PIL import Image
+
+from src.asset_pack import BACKGROUND, CARD_SIZE, WINDOW_SIZE, AssetPack, build_asset_pack
+from src.image_cache import CardImageCache
+from src.rename_cards import rename_cards
+
+
+class AssetPackTestCase(unittest.TestCase):
+
+    def setUp(self):
+        """
+        Creates a folder with a few card images and a background, and builds a pack from them.
+        """
+        self.folder = tempfile.TemporaryDirectory()
+        self.cards = os.path.join(self.folder.name, 'Classic')
+        os.mkdir(self.cards)
+        Image.new('RGBA', (200, 300), (255, 0, 0, 255)).save(os.path.join(self.cards, 'ace_of_spades.png'))
+        Image.new('RGB', (120, 180), (0, 0, 255)).save(os.path.join(self.cards, 'card_back.png'))
+        self.background = os.path.join(self.folder.name, 'background.webp')
+        Image.new('RGB', (400, 300), (0, 128, 0)).save(self.background)
+        self.pack_path = os.path.join(self.folder.name, 'assets.pack')
+        self.index_path = os.path.join(self.folder.name, 'assets.json')
+        build_asset_pack(self.cards, self.background, self.pack_path, self.index_path)
+        self.pack = AssetPack(self.pack_path, self.index_path)
+
+    def tearDown(self):
+        """
+        Removes the temporary images and pack.
+        """
+        self.folder.cleanup()
+
+    def test_pack_holds_resized_images(self):
+        """
+        Test that cards are packed at card size and the background at window size.
+        """
+        self.assertEqual(self.pack.size('ace_of_spades'), CARD_SIZE)
+        self.assertEqual(self.pack.size('card_back'), CARD_SIZE)
+        self.assertEqual(self.pack.size(BACKGROUND), WINDOW_SIZE)
+
+    def test_packed_pixels_match_source(self):
+        """
+        Test that an image read from the pack has the same pixels as the resized source file.
+        """
+        expected = Image.open(os.path.join(self.cards, 'card_back.png')).convert('RGBA').resize(CARD_SIZE)
+        self.assertEqual(self.pack.image('card_back').tobytes(), expected.tobytes())
+
+    def test_cache_loads_from_pack(self):
+        """
+        Test that the image cache reads from the pack without touching the image files.
+        """
+        os.remove(os.path.join(self.cards, 'ace_of_spades.png'))
+        cache = CardImageCache(directory=self.cards, pack=self.pack)
+        self.assertEqual(cache.image('ace_of_spades').size, CARD_SIZE)
+
+    def test_cache_falls_back_to_files_for_other_sizes(self):
+        """
+        Test that sizes which are not in the pack are decoded from the image files.
+        """
+        cache = CardImageCache(directory=self.cards, pack=self.pack)
+        self.assertEqual(cache.image('ace_of_spades', (50, 75)).size, (50, 75))
+
+    def test_missing_pack_raises(self):
+        """
+        Test that opening a pack that has not been built raises an OSError.
+        """
+        with self.assertRaises(OSError):
+            AssetPack(os.path.join(self.folder.name, 'missing.pack'), self.index_path)
+
+    def test_rename_only_touches_shorthand_names(self):
+        """
+        Test that shorthand file names are renamed and already renamed files are left alone.
+        """
+        Image.new('RGBA', (10, 10)).save(os.path.join(self.cards, 'h12.png'))
+        rename_cards(self.cards)
+        self.assertEqual(sorted(os.listdir(self.cards)),
+                         ['ace_of_spades.png', 'card_back.png', 'queen_of_hearts.png'])
+
+
+if __name__ == '__main__':
+    unittest.main()
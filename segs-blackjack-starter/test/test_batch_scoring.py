@@ -0,0 +1,60 @@
+import itertools
+import random
+import unittest
+
+from src.scoring import score_hand
+
+try:
+    import numpy as np
+    from src.batch_scoring import encode_hands, score_hands
+except ImportError:  # NumPy is only needed for batch scoring
+    np = None
+
+RANKS = [2, 3, 4, 5, 6, 7, 8, 9, 10, 'J', 'Q', 'K', 'A']
+
+
+@unittest.skipIf(np is None, "NumPy is not installed")
+class BatchScoringTestCase(unittest.TestCase):
+
+    def assertMatchesScalar(self, hands):
+        scores = score_hands(encode_hands(hands))
+        for row, hand in enumerate(hands):
+            self.assertEqual(scores.score[row], score_hand(hand), f"Batch score differs for {hand}")
+            self.assertEqual(scores.bust[row], score_hand(hand) > 21)
+
+    def test_matches_scalar_for_all_two_and_three_card_hands(self):
+        """
+        Test that every two and three card hand scores the same as the scalar score_hand.
+        """
+        hands = [[(rank, 'Hearts') for rank in ranks]
+                 for size in (2, 3) for ranks in itertools.product(RANKS, repeat=size)]
+        self.assertMatchesScalar(hands)
+
+    def test_matches_scalar_for_random_long_hands(self):
+        """
+        Test that long, padded hands with many Aces score the same as the scalar score_hand.
+        """
+        rng = random.Random(3)
+        hands = [[(rng.choice(RANKS), 'Spades') for _ in range(rng.randint(1, 11))] for _ in range(5000)]
+        self.assertMatchesScalar(hands)
+
+    def test_soft_and_hard_totals(self):
+        """
+        Test that a soft hand reports its hard total and soft flag.
+        """
+        scores = score_hands(encode_hands([[('A', 'Hearts'), (6, 'Clubs')], [('A', 'Hearts'), ('K', 'Clubs'),
+                                                                             (5, 'Clubs')]]))
+        self.assertEqual(list(scores.hard), [7, 16])
+        self.assertEqual(list(scores.score), [17, 16])
+        self.assertEqual(list(scores.soft), [True, False])
+
+    def test_empty_batch(self):
+        """
+        Test that scoring no hands returns empty results.
+        """
+        scores = score_hands(np.zeros((0, 5), dtype=np.uint8))
+        self.assertEqual(len(scores.score), 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,43 @@
+import unittest
+
+from benchmarks.bench_engine import compare, run
+
+
+def results(calibration_ns=1000.0, **metrics):
+    return {'calibration_ns': calibration_ns,
+            'results': {name: {'value': value, 'unit': unit} for name, (value, unit) in metrics.items()}}
+
+
+class BenchmarkTestCase(unittest.TestCase):
+
+    def test_run_covers_every_path(self):
+        """
+        Test that a tiny run times every benchmarked path and reports values for each.
+        """
+        report = run(number=2, repeat=1, rounds=3, images=False)['results']
+        for name in ('Deck()', 'calculate_score[cards=8]', 'deal_hand[players=7,decks=8]',
+                     'dealer_turn[players=1,decks=1]', 'determine_winners[players=3,decks=6]',
+                     'rounds[players=5,decks=2]', 'peak_memory[players=1,decks=1]'):
+            self.assertGreater(report[name]['value'], 0, name)
+
+    def test_compare_flags_regressions_past_the_threshold(self):
+        """
+        Test that slower timings, lower throughput and higher memory count as regressions only beyond the threshold.
+        """
+        baseline = results(a=(100, 'ns'), b=(100, 'ns'), c=(1000, 'rounds/s'), d=(10, 'KiB'), gone=(1, 'ns'))
+        current = results(a=(115, 'ns'), b=(130, 'ns'), c=(700, 'rounds/s'), d=(13, 'KiB'), new=(1, 'ns'))
+        regressed = [name for name, *_ in compare(current, baseline, threshold=0.2)]
+        self.assertEqual(regressed, ['b', 'c', 'd'])
+
+    def test_compare_normalizes_by_calibration(self):
+        """
+        Test that with normalize a uniformly slower machine does not count as a regression, but memory is not scaled.
+        """
+        baseline = results(1000.0, a=(100, 'ns'), c=(1000, 'rounds/s'), d=(10, 'KiB'))
+        current = results(2000.0, a=(200, 'ns'), c=(500, 'rounds/s'), d=(10, 'KiB'))
+        self.assertEqual(len(compare(current, baseline)), 2)
+        self.assertEqual(compare(current, baseline, normalize=True), [])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,90 @@
+import random
+import unittest
+from unittest.mock import MagicMock
+
+from blackjack import Blackjack
+from src.bot import DEALER_POLICY, BotPlayer, PolicyTable
+from src.dealer import Dealer
+from src.deck import Deck
+from src.engine import BlackjackEngine
+
+
+class BotTestCase(unittest.TestCase):
+
+    def test_policy_table_lookup(self):
+        """
+        Test that a compiled table gives the same decisions as the function it was built from, and never hits 21.
+        """
+        def policy(score, soft, upcard):
+            return score < 12 or (soft and score < 18) or (score < 17 and upcard >= 7)
+
+        table = PolicyTable.build(policy)
+        for upcard in range(1, 11):
+            for score in range(4, 21):
+                for soft in (False, True):
+                    self.assertEqual(table.should_hit(score, soft, upcard), policy(score, soft, upcard))
+        self.assertFalse(PolicyTable.build(lambda score, soft, upcard: True).should_hit(21, False, 10))
+
+    def test_bot_decides_against_the_upcard(self):
+        """
+        Test that a bot looks up its score, softness and the dealer's face-up card.
+        """
+        deck = Deck()
+        dealer = Dealer(deck=deck)
+        dealer.hand = [('2', 'Hearts'), ('K', 'Clubs')]  # The King is face up
+        bot = BotPlayer(deck=deck, player_number=1,
+                        policy=PolicyTable.build(lambda score, soft, upcard: soft and upcard == 10))
+        bot.hand = [('A', 'Hearts'), ('6', 'Clubs')]
+        self.assertTrue(bot.should_hit(dealer))
+        bot.hand = [('10', 'Hearts'), ('7', 'Clubs')]
+        self.assertFalse(bot.should_hit(dealer))
+
+    def test_all_bot_table_plays_itself(self):
+        """
+        Test that a table of bots plays whole rounds through to settlement, each bot standing on 17 or more.
+        """
+        engine = BlackjackEngine(num_players=4, rng=random.Random(2), bots=(1, 2, 3, 4))
+        for _ in range(200):
+            engine.new_round()
+            engine.deal_hand()
+            self.assertFalse(engine.play_bots())
+            for player in engine.players:
+                self.assertTrue(player.score >= 17 or engine.deck.remaining == 0)
+            self.assertEqual(len(engine.settlement.seats), 4)
+
+    def test_bots_wait_for_humans(self):
+        """
+        Test that bots play up to the next human seat, and carry on once that player stands.
+        """
+        engine = BlackjackEngine(num_players=3, rng=random.Random(4), bots=(1, 3))
+        engine.deal_hand()
+        self.assertTrue(engine.play_bots())
+        self.assertEqual(engine.current_player_index, 1)
+        self.assertIsNone(engine.bot_to_play())
+        self.assertTrue(engine.next_player())
+        self.assertFalse(engine.play_bots())
+        self.assertIsNotNone(engine.settlement)
+
+    def test_gui_schedules_bot_actions(self):
+        """
+        Test that in the GUI bots act through Tk's after() with their think time, and ignore the buttons.
+        """
+        blackjack = Blackjack(num_players=2, rng=random.Random(6), bots=(2,), think_time=0.25)
+        blackjack.game_screen = MagicMock()
+        blackjack.player_hand_label = MagicMock()
+        blackjack.update_player_display = MagicMock()
+        blackjack.determine_winners = MagicMock()
+        blackjack.deal_hand()
+        blackjack.human_action(blackjack.stand_action)  # Player 1 is human, so the click counts
+        blackjack.game_screen.after.assert_called_with(250, blackjack.bot_action)
+        blackjack.human_action(blackjack.stand_action)  # Ignored during the bot's turn
+        self.assertEqual(blackjack.current_player_index, 1)
+        while blackjack.determine_winners.call_count == 0:
+            blackjack.bot_action()
+        bot = blackjack.players[1]
+        self.assertTrue(bot.score >= 17 or blackjack.deck.remaining == 0)
+        self.assertIs(DEALER_POLICY, bot.policy)
+
+
+if __name__ == '__main__':
+    unittest.main()
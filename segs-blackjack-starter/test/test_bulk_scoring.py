@@ -0,0 +1,84 @@
+import io
+import json
+import random
+import unittest
+
+from src.card import CARD_TUPLES
+from src.scoring import score_hand
+
+try:
+    import numpy as np
+    from src.bulk_scoring import input_format, score_stream
+except ImportError:  # NumPy is only needed for batch scoring
+    np = None
+
+
+@unittest.skipIf(np is None, "NumPy is not installed")
+class BulkScoringTestCase(unittest.TestCase):
+
+    def setUp(self):
+        """
+        Creates random hands of one to eight cards.
+        """
+        rng = random.Random(5)
+        self.hands = [[CARD_TUPLES[rng.randrange(len(CARD_TUPLES))] for _ in range(rng.randint(1, 8))]
+                      for _ in range(1000)]
+
+    def score(self, text, fmt, **options):
+        output = io.StringIO()
+        scored = score_stream([("hands", io.StringIO(text))], output, fmt, **options)
+        lines = output.getvalue().splitlines()
+        self.assertEqual(scored, len(lines))
+        return lines
+
+    def test_jsonl_matches_scalar(self):
+        """
+        Test that every JSON Lines hand scores the same as score_hand, in input order.
+        """
+        text = "".join(json.dumps(hand) + "\n" for hand in self.hands)
+        results = [json.loads(line) for line in self.score(text, 'jsonl', chunk_lines=64)]
+        self.assertEqual([result['score'] for result in results], [score_hand(hand) for hand in self.hands])
+        self.assertEqual([result['bust'] for result in results], [score_hand(hand) > 21 for hand in self.hands])
+
+    def test_csv_matches_scalar(self):
+        """
+        Test that CSV hands give hard total, score, soft and bust columns, with blank lines as empty hands.
+        """
+        text = "".join(",".join(f"{rank},{suit}" for rank, suit in hand) + "\n" for hand in self.hands)
+        lines = self.score("A, Spades,K, Hearts\n\n" + text, 'csv', chunk_lines=100)
+        self.assertEqual(lines[:2], ["11,21,1,0", "0,0,0,0"])
+        self.assertEqual([int(line.split(',')[1]) for line in lines[2:]], [score_hand(hand) for hand in self.hands])
+
+    def test_worker_processes_keep_order(self):
+        """
+        Test that scoring chunks in worker processes gives exactly the in-process output.
+        """
+        text = "".join(json.dumps(hand) + "\n" for hand in self.hands)
+        self.assertEqual(self.score(text, 'jsonl', workers=2, chunk_lines=50),
+                         self.score(text, 'jsonl', chunk_lines=50))
+        text = "".join(",".join(f"{rank},{suit}" for rank, suit in hand) + "\r\n" for hand in self.hands)
+        self.assertEqual(self.score(text, 'csv', workers=2), self.score(text, 'csv'))
+
+    def test_invalid_hand_reports_line(self):
+        """
+        Test that an invalid card raises ValueError naming the input and the line, across chunks.
+        """
+        text = '[["A", "Spades"]]\n' * 5 + '[["Z", "Spades"]]\n'
+        with self.assertRaisesRegex(ValueError, "hands, line 6"):
+            self.score(text, 'jsonl', chunk_lines=4)
+        with self.assertRaisesRegex(ValueError, "hands, line 2"):
+            self.score("A,Spades\nA,Spades,K\n", 'csv')
+
+    def test_input_format_from_file_names(self):
+        """
+        Test that the format comes from the file names, and that mixing formats is rejected.
+        """
+        self.assertEqual(input_format(['a.csv', 'b.csv.gz']), 'csv')
+        self.assertEqual(input_format(['a.jsonl', '-']), 'jsonl')
+        self.assertEqual(input_format(['-']), 'jsonl')
+        with self.assertRaises(ValueError):
+            input_format(['a.csv', 'b.jsonl'])
+
+
+if __name__ == '__main__':
+    unittest.main()
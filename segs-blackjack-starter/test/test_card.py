@@ -0,0 +1,79 @@
+import unittest
+
+from src.card import CODE_VALUES, IMAGE_KEYS, NUM_CARDS, CardArray, to_code, to_tuple
+from src.dealer import Dealer
+from src.deck import Deck
+from src.player import Player
+
+
+class CardTestCase(unittest.TestCase):
+
+    def test_codes_round_trip(self):
+        """
+        Test that every card code converts to a (rank, suit) tuple and back.
+        """
+        for code in range(NUM_CARDS):
+            self.assertEqual(to_code(to_tuple(code)), code)
+
+    def test_string_and_int_ranks_give_same_code(self):
+        """
+        Test that number ranks can be given either as ints or as strings.
+        """
+        self.assertEqual(to_code((8, 'Hearts')), to_code(('8', 'Hearts')))
+
+    def test_invalid_card_rejected(self):
+        """
+        Test that unknown cards and out of range codes raise a ValueError.
+        """
+        for card in [('1', 'Hearts'), ('A', 'Stars'), None, 52, -1]:
+            with self.assertRaises(ValueError):
+                to_code(card)
+
+    def test_lookup_tables(self):
+        """
+        Test the precomputed value and image key tables for a few cards.
+        """
+        self.assertEqual(CODE_VALUES[to_code(('A', 'Spades'))], 1)
+        self.assertEqual(CODE_VALUES[to_code(('Q', 'Clubs'))], 10)
+        self.assertEqual(CODE_VALUES[to_code((7, 'Hearts'))], 7)
+        self.assertEqual(IMAGE_KEYS[to_code(('Q', 'Hearts'))], "queen_of_hearts")
+        self.assertEqual(IMAGE_KEYS[to_code((10, 'Diamonds'))], "10_of_diamonds")
+
+    def test_card_array_behaves_like_list_of_tuples(self):
+        """
+        Test that a CardArray reads and writes (rank, suit) tuples while storing one byte per card.
+        """
+        cards = CardArray([('K', 'Hearts'), (2, 'Clubs')])
+        cards.append(('A', 'Spades'))
+        self.assertEqual(cards, [('K', 'Hearts'), (2, 'Clubs'), ('A', 'Spades')])
+        self.assertEqual(cards[0], ('K', 'Hearts'))
+        self.assertIn(('A', 'Spades'), cards)
+        self.assertEqual(cards.pop(), ('A', 'Spades'))
+        self.assertEqual(len(cards), 2)
+        self.assertEqual(cards.codes.itemsize, 1)
+
+    def test_deck_stores_every_card_once(self):
+        """
+        Test that a deck holds each of the 52 card codes exactly once.
+        """
+        self.assertEqual(sorted(Deck().cards.codes), list(range(NUM_CARDS)))
+
+    def test_hand_assignment_converts_tuples(self):
+        """
+        Test that assigning a list of tuples to a hand stores it as a CardArray.
+        """
+        player = Player(deck=Deck(), player_number=1)
+        player.hand = [('8', 'Hearts'), ('9', 'Diamonds')]
+        self.assertIsInstance(player.hand, CardArray)
+        self.assertEqual(player.hand, [(8, 'Hearts'), (9, 'Diamonds')])
+
+    def test_players_have_no_instance_dict(self):
+        """
+        Test that players and dealers use __slots__ instead of a per-instance __dict__.
+        """
+        self.assertFalse(hasattr(Player(deck=Deck(), player_number=1), '__dict__'))
+        self.assertFalse(hasattr(Dealer(deck=Deck()), '__dict__'))
+
+
+if __name__ == '__main__':
+    unittest.main()
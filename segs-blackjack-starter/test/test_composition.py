@@ -0,0 +1,108 @@
+import random
+import unittest
+
+from src.card import CARD_RANKS, CODE_VALUES
+from src.composition import HI_LO, CompositionIndex
+from src.deck import Deck
+from src.shoe import Shoe
+
+
+def rescan(codes):
+    """
+    The per-value counts of a list of codes, counted the slow way.
+    """
+    return tuple(sum(1 for code in codes if CODE_VALUES[code] == value) for value in range(1, 11))
+
+
+class CompositionTestCase(unittest.TestCase):
+
+    def test_full_deck(self):
+        """
+        Test that a new deck has four of every rank, sixteen ten-valued cards and a running count of 0.
+        """
+        composition = Deck().composition
+        self.assertEqual(composition.remaining, 52)
+        self.assertEqual(composition.rank_count('A'), 4)
+        self.assertEqual(composition.rank_count(10), 4)
+        self.assertEqual(composition.values(), (4,) * 9 + (16,))
+        self.assertEqual((composition.running_count, composition.true_count), (0, 0.0))
+
+    def test_deck_draws_update_the_index(self):
+        """
+        Test that cards dealt by every draw method are removed from the index and counted.
+        """
+        deck = Deck(rng=random.Random(2))
+        deck.draw(3)
+        deck.draw_code()
+        deck.draw_card()
+        composition = deck.composition
+        self.assertEqual(composition.remaining, len(deck.cards))
+        self.assertEqual(composition.values(), rescan(deck.cards.codes))
+
+    def test_shoe_tracks_running_and_true_count(self):
+        """
+        Test that the running count is the Hi-Lo total of the cards dealt and the true count divides it by decks left.
+        """
+        shoe = Shoe(num_decks=6, rng=random.Random(4))
+        dealt = list(shoe.draw(100).codes) + [shoe.draw_code() for _ in range(56)]
+        composition = shoe.composition
+        self.assertEqual(composition.running_count, sum(HI_LO[code] for code in dealt))
+        self.assertEqual(composition.remaining, 6 * 52 - 156)
+        self.assertAlmostEqual(composition.true_count, composition.running_count / 3)
+        self.assertEqual(composition.values(), rescan(shoe.codes[shoe.position:]))
+        self.assertEqual(composition.rank_count('K'), sum(1 for code in shoe.codes[shoe.position:]
+                                                         if CARD_RANKS[code] == 'K'))
+
+    def test_recount_after_changes_in_place(self):
+        """
+        Test that recount() brings the index up to date after the cards were changed without drawing.
+        """
+        deck = Deck(rng=random.Random(6))
+        del deck.cards.codes[:10]
+        deck.cards.pop()
+        deck.recount()
+        self.assertEqual(deck.composition.remaining, 41)
+        self.assertEqual(deck.composition.values(), rescan(deck.cards.codes))
+
+        shoe = Shoe(num_decks=2, rng=random.Random(6))
+        shoe.position = 30
+        shoe.recount()
+        self.assertEqual(shoe.composition.values(), rescan(shoe.codes[30:]))
+
+    def test_shuffle_resets_the_index(self):
+        """
+        Test that reshuffling the shoe restores a full composition and a zero count.
+        """
+        shoe = Shoe(num_decks=2, penetration=0.5, rng=random.Random(1))
+        shoe.draw(60)
+        self.assertTrue(shoe.start_round())
+        self.assertEqual(shoe.composition.remaining, 104)
+        self.assertEqual(shoe.composition.running_count, 0)
+
+    def test_bust_probability(self):
+        """
+        Test the chance of busting a hard total against a direct count, and that it follows draws.
+        """
+        deck = Deck()
+        deck.cards = [('K', 'Hearts'), ('5', 'Clubs'), ('A', 'Spades'), ('9', 'Hearts')]
+        composition = deck.composition
+        self.assertEqual(composition.bust_probability(11), 0.0)
+        self.assertEqual(composition.bust_probability(12), 0.25)  # Only the King
+        self.assertEqual(composition.bust_probability(13), 0.5)  # The King or the 9
+        self.assertEqual(composition.bust_probability(17), 0.75)
+        self.assertEqual(composition.bust_probability(21), 1.0)
+        deck.draw_card()  # The 9
+        self.assertAlmostEqual(composition.bust_probability(13), 1 / 3)
+
+    def test_reset_from_codes(self):
+        """
+        Test that an index can be built for any list of codes.
+        """
+        index = CompositionIndex([48, 49, 0])  # Two Aces and a 2
+        self.assertEqual(index.rank_count('A'), 2)
+        self.assertAlmostEqual(index.probability(1), 2 / 3)
+        self.assertEqual(index.snapshot()['ranks']['2'], 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,68 @@
+import random
+import unittest
+
+from src.card import NUM_CARDS, to_code
+from src.dealer_odds import BUST, dealer_distribution, full_composition, remove_card
+from src.engine import BlackjackEngine
+
+
+class DealerOddsTestCase(unittest.TestCase):
+
+    def test_distributions_sum_to_one(self):
+        """
+        Test that the final totals for every upcard and deck count cover all outcomes.
+        """
+        for num_decks in (1, 6):
+            for upcard in range(1, 11):
+                self.assertAlmostEqual(sum(dealer_distribution(upcard, num_decks=num_decks)), 1.0, places=12)
+
+    def test_dealer_always_stands_on_twenty(self):
+        """
+        Test that a shoe of only ten-valued cards gives a ten upcard a certain 20, which the dealer never risks.
+        """
+        distribution = dealer_distribution(10, (0,) * 9 + (10,))
+        self.assertEqual(distribution[20], 1.0)
+
+    def test_dealer_risks_seventeen_half_the_time(self):
+        """
+        Test that a 7 upcard against only ten-valued cards stands on 17 or busts with one more card, half the time each.
+        """
+        distribution = dealer_distribution(7, (0,) * 9 + (10,))
+        self.assertEqual(distribution[17], 0.5)
+        self.assertEqual(distribution[BUST], 0.5)
+
+    def test_empty_shoe_stands(self):
+        """
+        Test that the dealer stands on whatever they hold when no cards are left.
+        """
+        self.assertEqual(dealer_distribution(5, (0,) * 10)[5], 1.0)
+
+    def test_remove_card(self):
+        """
+        Test that removing a card lowers only that value's count, and can not go below zero.
+        """
+        self.assertEqual(remove_card(full_composition(), 1), (3,) + (4,) * 8 + (16,))
+        with self.assertRaises(ValueError):
+            remove_card((0,) * 10, 3)
+
+    def test_matches_dealer_play(self):
+        """
+        Test that the exact odds agree with the dealer actually playing out thousands of hands.
+        """
+        upcard = ('6', 'Hearts')
+        engine = BlackjackEngine(num_players=1, rng=random.Random(2))
+        rest = [code for code in range(NUM_CARDS) if code != to_code(upcard)]
+        trials = 20000
+        finals = [0] * (BUST + 1)
+        for _ in range(trials):
+            engine.deck.cards = rest
+            engine.rng.shuffle(engine.deck.cards.codes)
+            engine.dealer.hand = [upcard]
+            finals[min(engine.play_dealer(), BUST)] += 1
+        expected = dealer_distribution(6, remove_card(full_composition(), 6))
+        for total in range(BUST + 1):
+            self.assertAlmostEqual(finals[total] / trials, expected[total], delta=0.015, msg=f"Total {total}")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,84 @@
+import unittest
+from unittest.mock import MagicMock, patch
+
+from blackjack import Blackjack
+
+
+class DisplayTestCase(unittest.TestCase):
+
+    def setUp(self):
+        """
+        Creates a game whose card labels are mocks, with each card's "image" being the card itself.
+        """
+        self.label_patch = patch('tkinter.Label', side_effect=lambda *args, **kwargs: MagicMock())
+        self.Label = self.label_patch.start()
+        self.blackjack = Blackjack(num_players=2)
+        self.blackjack.player_hand_label = MagicMock()
+        self.blackjack.player_hand_frame = MagicMock()
+        self.blackjack.dealer_hand_frame = MagicMock()
+        self.blackjack.player_card_labels = []
+        self.blackjack.dealer_card_labels = []
+        self.blackjack.get_card_image = lambda card: card
+        self.blackjack.get_card_back_image = lambda: 'back'
+        self.blackjack.deal_hand()
+
+    def tearDown(self):
+        """
+        Restores tkinter.Label.
+        """
+        self.label_patch.stop()
+
+    def shown(self, labels):
+        return [label.image for label in labels]
+
+    def test_hit_appends_one_label(self):
+        """
+        Test that a hit adds one card label and leaves the existing ones alone.
+        """
+        self.blackjack.update_player_display()
+        first_labels = list(self.blackjack.player_card_labels)
+        self.blackjack.hit()
+        self.blackjack.update_player_display()
+        self.assertEqual(self.Label.call_count, 3)
+        self.assertEqual(self.blackjack.player_card_labels[:2], first_labels)
+        for label in first_labels:
+            label.config.assert_not_called()
+        self.assertEqual(self.shown(self.blackjack.player_card_labels), list(self.blackjack.players[0].hand))
+
+    def test_next_player_reuses_labels(self):
+        """
+        Test that moving to the next player swaps the images on the existing labels instead of creating new ones.
+        """
+        self.blackjack.update_player_display()
+        self.blackjack.current_player_index = 1
+        self.blackjack.update_player_display()
+        self.assertEqual(self.Label.call_count, 2)
+        self.assertEqual(self.shown(self.blackjack.player_card_labels), list(self.blackjack.players[1].hand))
+
+    def test_shorter_hand_removes_extra_labels(self):
+        """
+        Test that labels left over from a longer hand are destroyed.
+        """
+        self.blackjack.hit()
+        self.blackjack.update_player_display()
+        extra = self.blackjack.player_card_labels[2]
+        self.blackjack.current_player_index = 1
+        self.blackjack.update_player_display()
+        extra.destroy.assert_called_once()
+        self.assertEqual(len(self.blackjack.player_card_labels), 2)
+
+    def test_reveal_swaps_one_image(self):
+        """
+        Test that revealing the dealer's hand only changes the face-down card's image.
+        """
+        self.blackjack.update_dealer_hand_display()
+        hidden, upcard = self.blackjack.dealer_card_labels
+        self.assertEqual(hidden.image, 'back')
+        self.blackjack.update_dealer_hand_display(reveal=True)
+        hidden.config.assert_called_once_with(image=self.blackjack.dealer.hand[0])
+        upcard.config.assert_not_called()
+        self.assertEqual(self.Label.call_count, 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
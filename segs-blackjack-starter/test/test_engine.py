@@ -0,0 +1,46 @@
+import os
+import subprocess
+import sys
+import unittest
+
+from src.engine import BlackjackEngine
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+class EngineTestCase(unittest.TestCase):
+
+    def test_core_does_not_import_gui_libraries(self):
+        """
+        Test that importing the game, including the Blackjack front end class, does not load tkinter or PIL.
+        """
+        code = "import sys, blackjack, src.engine; print(sorted(m for m in ('tkinter', 'PIL') if m in sys.modules))"
+        output = subprocess.run([sys.executable, '-c', code], capture_output=True, text=True, check=True,
+                                cwd=PROJECT_ROOT).stdout
+        self.assertEqual(output.strip(), "[]")
+
+    def test_headless_round(self):
+        """
+        Test that a whole round can be played and settled by the engine without a GUI.
+        """
+        engine = BlackjackEngine(num_players=2)
+        engine.deal_hand()
+        self.assertTrue(engine.next_player(), "Player 2 should be next.")
+        self.assertFalse(engine.next_player(), "The dealer should play after the last player.")
+        self.assertGreaterEqual(engine.dealer.score, 17)
+        self.assertEqual(engine.current_player_index, 0)
+
+    def test_results_mention_every_player(self):
+        """
+        Test that the settlement messages include every player when the dealer does not bust.
+        """
+        engine = BlackjackEngine(num_players=3)
+        engine.deal_hand()
+        engine.dealer.hand = [('K', 'Hearts'), ('Q', 'Clubs')]  # Dealer always stands on 20
+        results = engine.dealer_turn()
+        for player_number in (1, 2, 3):
+            self.assertTrue(any(f"Player {player_number} " in result for result in results))
+
+
+if __name__ == '__main__':
+    unittest.main()
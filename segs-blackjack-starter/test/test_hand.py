@@ -0,0 +1,90 @@
+import random
+import unittest
+from unittest.mock import MagicMock
+
+from blackjack import Blackjack
+from src.card import CARD_TUPLES
+from src.deck import Deck
+from src.hand import Hand
+from src.player import Player
+from src.scoring import score_hand
+
+
+class HandTestCase(unittest.TestCase):
+
+    def test_running_score_matches_full_recalculation(self):
+        """
+        Test that the running score always equals a full rescore of the hand as cards are added and removed.
+        """
+        rng = random.Random(5)
+        hand = Hand()
+        for _ in range(2000):
+            if hand and rng.random() < 0.3:
+                hand.pop(rng.randrange(len(hand)))
+            else:
+                hand.append(rng.choice(CARD_TUPLES))
+            self.assertEqual(hand.score, score_hand(list(hand)))
+            self.assertEqual(hand.bust, score_hand(list(hand)) > 21)
+
+    def test_soft_hand(self):
+        """
+        Test that a hand is soft only while an Ace can be counted as 11.
+        """
+        hand = Hand([('A', 'Hearts'), (6, 'Clubs')])
+        self.assertTrue(hand.soft)
+        self.assertEqual(hand.score, 17)
+        hand.append(('K', 'Spades'))
+        self.assertFalse(hand.soft)
+        self.assertEqual(hand.score, 17)
+
+    def test_replacing_and_deleting_cards_updates_score(self):
+        """
+        Test that item assignment and deletion keep the running score correct.
+        """
+        hand = Hand([('K', 'Hearts'), ('Q', 'Clubs')])
+        hand[1] = ('A', 'Clubs')
+        self.assertEqual(hand.score, 21)
+        del hand[0]
+        self.assertEqual(hand.score, 11)
+        hand.clear()
+        self.assertEqual(hand.score, 0)
+
+    def test_player_score_kept_up_to_date(self):
+        """
+        Test that a player's score is updated by init_draw_cards and hit without calling calculate_score.
+        """
+        player = Player(deck=Deck(), player_number=1)
+        player.init_draw_cards()
+        self.assertEqual(player.score, score_hand(list(player.hand)))
+        player.hit()
+        self.assertEqual(player.score, score_hand(list(player.hand)))
+
+    def test_hit_on_empty_deck_leaves_hand_unchanged(self):
+        """
+        Test that hitting on an empty deck returns None and does not add anything to the hand.
+        """
+        deck = Deck()
+        deck.cards = []
+        player = Player(deck=deck, player_number=1)
+        player.hand = [('5', 'Hearts'), ('6', 'Clubs')]
+        self.assertIsNone(player.hit())
+        self.assertEqual(len(player.hand), 2)
+        self.assertEqual(player.score, 11)
+
+    def test_dealer_stops_when_deck_runs_out(self):
+        """
+        Test that the dealer's turn ends instead of looping forever when the deck is empty.
+        """
+        blackjack = Blackjack(num_players=1)
+        blackjack.update_dealer_hand_display = MagicMock()
+        blackjack.player_hand_label = MagicMock()
+        blackjack.end_game = MagicMock()
+        blackjack.dealer.hand = [('2', 'Hearts'), ('3', 'Clubs')]
+        blackjack.deck.cards = []
+        blackjack.dealer_turn()
+        self.assertEqual(blackjack.dealer.score, 5)
+        blackjack.end_game.assert_called_once()
+
+
+if __name__ == '__main__':
+    unittest.main()
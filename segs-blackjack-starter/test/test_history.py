@@ -0,0 +1,135 @@
+import os
+import random
+import tempfile
+import unittest
+import zlib
+
+from src.engine import BlackjackEngine
+from src.history import (CRC, HEADER, MAGIC, ROUND, SCHEMA_VERSION, WIN, HistoryReader, HistoryWriter,
+                         read_rounds, replay)
+from src.settlement import settle
+from src.shoe import Shoe
+
+
+class HistoryTestCase(unittest.TestCase):
+
+    def setUp(self):
+        """
+        Plays fifty logged rounds at a three player table into a temporary log.
+        """
+        self.folder = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.folder.name, 'hands.log')
+        self.play(50, seed=8)
+
+    def play(self, rounds, seed):
+        rng = random.Random(seed)
+        with HistoryWriter(self.path) as history:
+            engine = BlackjackEngine(num_players=3, deck=Shoe(num_decks=6, rng=rng), rng=rng, history=history)
+            for _ in range(rounds):
+                engine.new_round()
+                engine.deal_hand()
+                while True:
+                    while engine.players[engine.current_player_index].score < 15:
+                        engine.hit()
+                    if not engine.next_player():
+                        break
+        return history
+
+    def tearDown(self):
+        """
+        Removes the temporary log.
+        """
+        self.folder.cleanup()
+
+    def test_replay_matches_log(self):
+        """
+        Test that replaying the log under the same rules reproduces every logged outcome.
+        """
+        report = replay(self.path)
+        self.assertEqual((report.rounds, report.hands), (50, 150))
+        self.assertEqual(report.mismatches, [])
+        self.assertFalse(report.truncated)
+        self.assertEqual(sum(report.outcomes.values()), 150)
+
+    def test_rounds_hold_every_card(self):
+        """
+        Test that rebuilt rounds hold each player's full hand, starting with the two dealt cards.
+        """
+        for logged in read_rounds(HistoryReader(self.path)):
+            self.assertEqual(len(logged.hands), 4)
+            self.assertTrue(all(len(hand) >= 2 for hand in logged.hands))
+
+    def test_replay_with_changed_rules(self):
+        """
+        Test that replaying with different settlement rules reports the rounds whose outcome changes.
+        """
+        # Settle every round as if the dealer had 21
+        report = replay(self.path, settle=lambda players, dealer_score: settle(players, 21))
+        self.assertEqual(report.outcomes[WIN], 0)
+        self.assertTrue(report.mismatches)
+
+    def test_truncated_log(self):
+        """
+        Test that a log cut off mid-record is read up to the last complete record and flagged as truncated.
+        """
+        with open(self.path, 'r+b') as log:
+            log.truncate(os.path.getsize(self.path) - 3)
+        report = replay(self.path)
+        self.assertTrue(report.truncated)
+        self.assertEqual(report.rounds, 50)
+        self.assertEqual(report.mismatches, [50], "The last round lost its final settlement record.")
+
+    def test_corrupt_record_stops_reading(self):
+        """
+        Test that a record failing its checksum ends the log.
+        """
+        with open(self.path, 'r+b') as log:
+            log.seek(len(MAGIC) + 6)
+            log.write(b"\xff")
+        report = replay(self.path)
+        self.assertTrue(report.truncated)
+        self.assertEqual(report.rounds, 0)
+
+    def test_corrupt_length_detected(self):
+        """
+        Test that the checksum covers the length field, so a corrupted length is not read as a record.
+        """
+        with open(self.path, 'r+b') as log:
+            log.seek(len(MAGIC))
+            log.write(b"\x08")  # The first record's payload is 9 bytes long
+        reader = HistoryReader(self.path)
+        self.assertEqual(list(reader), [])
+        self.assertTrue(reader.truncated)
+
+    def test_reopen_after_crash(self):
+        """
+        Test that reopening a log with a torn last record cuts it off, so rounds appended later are replayed.
+        """
+        with open(self.path, 'r+b') as log:
+            log.truncate(os.path.getsize(self.path) - 2)
+        history = self.play(30, seed=9)
+        self.assertGreater(history.recovered, 0)
+        report = replay(self.path)
+        self.assertFalse(report.truncated)
+        self.assertEqual(report.rounds, 80)
+        self.assertEqual(report.mismatches, [50], "Only the torn round lost its final settlement record.")
+
+    def test_unknown_version_skipped(self):
+        """
+        Test that a record of another schema version is skipped and the records after it are still read.
+        """
+        size = os.path.getsize(self.path)
+        record = HEADER.pack(3, SCHEMA_VERSION + 1, ROUND) + b"new"
+        with open(self.path, 'r+b') as log:
+            log.seek(len(MAGIC))
+            rest = log.read()
+            log.seek(len(MAGIC))
+            log.write(record + CRC.pack(zlib.crc32(record)) + rest)
+        reader = HistoryReader(self.path)
+        self.assertEqual(sum(1 for event, _ in reader if event == ROUND), 50)
+        self.assertFalse(reader.truncated)
+        self.assertEqual(reader.end, size + len(record) + CRC.size)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,110 @@
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+from PIL import Image
+
+from src.image_cache import CardImageCache
+
+
+class CardImageCacheTestCase(unittest.TestCase):
+
+    def setUp(self):
+        """
+        Creates a folder of small card images for the cache to load.
+        """
+        self.folder = tempfile.TemporaryDirectory()
+        for key in ['ace_of_spades', 'king_of_hearts', '2_of_clubs']:
+            Image.new('RGBA', (30, 45), 'white').save(os.path.join(self.folder.name, f"{key}.png"))
+        self.cache = CardImageCache(directory=self.folder.name, max_images=2)
+
+    def tearDown(self):
+        """
+        Removes the temporary card images.
+        """
+        self.folder.cleanup()
+
+    def test_second_load_is_a_hit(self):
+        """
+        Test that a card is read from disk once and then served from the cache, already resized.
+        """
+        first = self.cache.image('ace_of_spades')
+        second = self.cache.image('ace_of_spades')
+        self.assertIs(first, second)
+        self.assertEqual(first.size, (100, 150))
+        self.assertEqual((self.cache.hits, self.cache.misses), (1, 1))
+
+    def test_sizes_are_cached_separately(self):
+        """
+        Test that the same card at two sizes gives two cache entries.
+        """
+        self.assertEqual(self.cache.image('ace_of_spades', (50, 75)).size, (50, 75))
+        self.assertEqual(self.cache.image('ace_of_spades').size, (100, 150))
+        self.assertEqual(self.cache.misses, 2)
+
+    def test_least_recently_used_image_evicted(self):
+        """
+        Test that the cache holds at most max_images and evicts the least recently used one.
+        """
+        self.cache.image('ace_of_spades')
+        self.cache.image('king_of_hearts')
+        self.cache.image('ace_of_spades')  # Ace is now the most recently used
+        self.cache.image('2_of_clubs')  # Evicts the King
+        self.assertEqual(self.cache.stats()['images'], 2)
+        self.cache.image('ace_of_spades')
+        self.assertEqual(self.cache.misses, 3)
+        self.cache.image('king_of_hearts')
+        self.assertEqual(self.cache.misses, 4)
+
+    def test_photos_bounded(self):
+        """
+        Test that PhotoImages are kept in an LRU bounded by max_images as well.
+        """
+        with mock.patch('src.image_cache.ImageTk.PhotoImage', side_effect=lambda image: object()):
+            first = self.cache.photo('ace_of_spades')
+            self.cache.photo('king_of_hearts')
+            self.assertIs(self.cache.photo('ace_of_spades'), first)  # The King is now least recently used
+            self.cache.photo('2_of_clubs')
+            self.assertEqual(self.cache.stats()['photos'], 2)
+            self.assertIs(self.cache.photo('ace_of_spades'), first)
+            self.cache.photo('king_of_hearts')
+            self.assertEqual(self.cache.photo_misses, 4)
+
+    def test_missing_image_raises(self):
+        """
+        Test that a missing image file raises FileNotFoundError and is not cached.
+        """
+        with self.assertRaises(FileNotFoundError):
+            self.cache.image('card_back')
+        self.assertEqual(self.cache.stats()['images'], 0)
+
+    def test_prefetch_fills_cache(self):
+        """
+        Test that prefetched images are cached and a missing one is recorded instead of raising.
+        """
+        prefetcher = self.cache.prefetch(['ace_of_spades', 'king_of_hearts', 'card_back'], workers=2)
+        self.assertTrue(prefetcher.wait())
+        self.assertEqual(list(prefetcher.failed), ['card_back'])
+        self.assertEqual(self.cache.image('ace_of_spades').size, (100, 150))
+        self.assertEqual(self.cache.image('king_of_hearts').size, (100, 150))
+        self.assertEqual((self.cache.hits, self.cache.misses), (2, 0))
+
+    def test_poll_reschedules_until_done(self):
+        """
+        Test that poll() keeps rescheduling itself on the widget until every image has arrived.
+        """
+        prefetcher = self.cache.prefetch(['ace_of_spades'], workers=1)
+        prefetcher.pending += 1  # Pretend one more image is still loading
+        widget = mock.Mock()
+        prefetcher.wait()
+        prefetcher.poll(widget)
+        widget.after.assert_called_once_with(20, prefetcher.poll, widget, 20)
+        prefetcher.pending -= 1
+        widget.reset_mock()
+        prefetcher.poll(widget)
+        widget.after.assert_not_called()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,119 @@
+import json
+import os
+import tempfile
+import threading
+import unittest
+import urllib.request
+
+from src.engine import BlackjackEngine
+from src.metrics import BUCKETS, Histogram, Metrics, metrics
+
+
+class MetricsTestCase(unittest.TestCase):
+
+    def setUp(self):
+        """
+        Creates an enabled registry.
+        """
+        self.metrics = Metrics(enabled=True)
+
+    def test_disabled_registry_records_nothing(self):
+        """
+        Test that counters, spans and timed functions record nothing while metrics are disabled.
+        """
+        self.metrics.disable()
+        timed = self.metrics.timed('call')(lambda value: value * 2)
+        self.assertEqual(timed(4), 8)
+        self.metrics.increment('count')
+        with self.metrics.span('block'):
+            pass
+        self.assertEqual((self.metrics.counters, self.metrics.histograms), ({}, {}))
+
+    def test_counters_and_spans(self):
+        """
+        Test that counters add up and spans and timed functions each record one observation per use.
+        """
+        self.metrics.increment('count')
+        self.metrics.increment('count', 2)
+        timed = self.metrics.timed('call')(lambda: None)
+        timed()
+        timed()
+        with self.metrics.span('block'):
+            pass
+        snapshot = self.metrics.snapshot()
+        self.assertEqual(snapshot['counters'], {'count': 3})
+        self.assertEqual(snapshot['histograms']['call']['count'], 2)
+        self.assertEqual(snapshot['histograms']['block']['count'], 1)
+
+    def test_threads_record_every_update(self):
+        """
+        Test that counters and histograms updated from several threads at once lose no updates.
+        """
+        def record():
+            for _ in range(20000):
+                self.metrics.increment('count')
+                self.metrics.observe('value', 1.0)
+
+        threads = [threading.Thread(target=record) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        snapshot = self.metrics.snapshot()
+        self.assertEqual(snapshot['counters']['count'], 80000)
+        self.assertEqual(snapshot['histograms']['value']['count'], 80000)
+
+    def test_histogram_quantiles(self):
+        """
+        Test that quantiles report the upper bound of the bucket holding them.
+        """
+        histogram = Histogram()
+        for _ in range(90):
+            histogram.observe(BUCKETS[0] / 2)
+        for _ in range(10):
+            histogram.observe(BUCKETS[5])
+        self.assertEqual(histogram.quantile(0.5), BUCKETS[0])
+        self.assertEqual(histogram.quantile(0.99), BUCKETS[5])
+        self.assertEqual(histogram.count, 100)
+
+    def test_engine_stages_are_timed(self):
+        """
+        Test that a round played with metrics enabled records the engine's stages.
+        """
+        metrics.reset()
+        metrics.enable()
+        try:
+            engine = BlackjackEngine(num_players=2)
+            engine.deal_hand()
+            engine.hit()
+            engine.dealer_turn()
+        finally:
+            metrics.disable()
+        histograms = metrics.snapshot()['histograms']
+        for stage in ('engine.deal_hand', 'engine.hit', 'engine.dealer_turn', 'engine.determine_winners'):
+            self.assertEqual(histograms[stage]['count'], 1, stage)
+        self.assertEqual(metrics.counters['engine.rounds'], 1)
+        metrics.reset()
+
+    def test_snapshot_file_and_endpoint(self):
+        """
+        Test that snapshots can be written to a file and fetched over HTTP.
+        """
+        self.metrics.increment('count')
+        with tempfile.TemporaryDirectory() as folder:
+            path = os.path.join(folder, 'metrics.json')
+            self.metrics.write(path)
+            with open(path) as snapshot_file:
+                self.assertEqual(json.load(snapshot_file)['counters'], {'count': 1})
+        server = self.metrics.serve(port=0)
+        try:
+            url = f"http://127.0.0.1:{server.server_address[1]}/metrics"
+            with urllib.request.urlopen(url, timeout=5) as response:
+                self.assertEqual(json.load(response)['counters'], {'count': 1})
+        finally:
+            server.shutdown()
+            server.server_close()
+
+
+if __name__ == '__main__':
+    unittest.main()
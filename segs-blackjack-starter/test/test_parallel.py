@@ -0,0 +1,55 @@
+import random
+import unittest
+
+from src.deck import Deck
+from src.engine import BlackjackEngine
+from src.parallel import run_parallel
+from src.shoe import Shoe
+from src.simulation import stand_on
+
+
+class ParallelTestCase(unittest.TestCase):
+
+    def test_same_totals_for_any_number_of_workers(self):
+        """
+        Test that the merged totals for a master seed do not depend on how many workers play the chunks.
+        """
+        settings = dict(num_players=2, policy=stand_on(16), seed=11, chunk_rounds=500)
+        in_process = run_parallel(3100, workers=1, **settings)
+        pooled = run_parallel(3100, workers=2, **settings)
+        self.assertEqual(in_process.as_dict(), pooled.as_dict())
+        self.assertEqual(in_process.rounds, 3100)
+
+    def test_different_seeds_give_different_totals(self):
+        """
+        Test that changing the master seed changes the results.
+        """
+        first = run_parallel(2000, seed=1, workers=1, chunk_rounds=500)
+        second = run_parallel(2000, seed=2, workers=1, chunk_rounds=500)
+        self.assertNotEqual(first.as_dict(), second.as_dict())
+
+    def test_seeded_deck_and_shoe(self):
+        """
+        Test that decks and shoes shuffled with the same seeded RNG come out in the same order.
+        """
+        self.assertEqual(Deck(rng=random.Random(4)).cards, Deck(rng=random.Random(4)).cards)
+        self.assertEqual(Shoe(rng=random.Random(4)).codes, Shoe(rng=random.Random(4)).codes)
+
+    def test_seeded_engine_rounds_repeat(self):
+        """
+        Test that two engines with the same seed deal and settle identical rounds, including the dealer's risky draws.
+        """
+        def play(seed):
+            engine = BlackjackEngine(num_players=2, rng=random.Random(seed))
+            rounds = []
+            for _ in range(50):
+                engine.new_round()
+                engine.deal_hand()
+                rounds.append(engine.dealer_turn())
+            return rounds
+
+        self.assertEqual(play(9), play(9))
+
+
+if __name__ == '__main__':
+    unittest.main()
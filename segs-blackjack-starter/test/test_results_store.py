@@ -0,0 +1,104 @@
+import os
+import random
+import tempfile
+import unittest
+
+from src.deck import Deck
+from src.engine import BlackjackEngine
+from src.settlement import Outcome
+
+try:
+    import numpy as np
+    from src.results_store import ResultsStore, ResultsWriter, upcard_value
+except ImportError:  # NumPy is only needed for the results store
+    np = None
+
+
+@unittest.skipIf(np is None, "NumPy is not installed")
+class ResultsStoreTestCase(unittest.TestCase):
+
+    def setUp(self):
+        """
+        Creates a temporary folder for the store.
+        """
+        self.folder = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.folder.name, 'results')
+
+    def tearDown(self):
+        """
+        Removes the store.
+        """
+        self.folder.cleanup()
+
+    def play(self, rounds, writer, num_players=3, seed=1):
+        """
+        Plays rounds through an engine that records them to `writer`, returning the engine's settlements.
+        """
+        rng = random.Random(seed)
+        engine = BlackjackEngine(num_players=num_players, deck=Deck(rng=rng), rng=rng, recorder=writer)
+        settlements = []
+        for _ in range(rounds):
+            engine.new_round()
+            engine.deal_hand()
+            engine.dealer_turn()
+            settlements.append(engine.settlement)
+        return settlements
+
+    def test_engine_rounds_are_stored(self):
+        """
+        Test that every seat of every settled round becomes one row, across several chunk flushes.
+        """
+        with ResultsWriter(self.path, chunk_rows=7) as writer:
+            settlements = self.play(20, writer)
+        store = ResultsStore(self.path)
+        self.assertEqual(len(store), 60)
+        self.assertEqual(list(store['round_id'][:4]), [1, 1, 1, 2])
+        self.assertEqual(list(store['seat'][:3]), [1, 2, 3])
+        expected = [seat.outcome for settlement in settlements for seat in settlement.seats]
+        self.assertEqual(store['outcome'].tolist(), expected)
+        self.assertIsInstance(store['payout'], np.memmap)
+
+    def test_group_by_matches_a_direct_count(self):
+        """
+        Test that chunked group-by totals agree with counting the rows one by one.
+        """
+        with ResultsWriter(self.path) as writer:
+            self.play(300, writer)
+        store = ResultsStore(self.path)
+        stats = store.group_by(upcard_value, chunk_rows=100)
+        self.assertEqual(stats.rows.sum(), len(store))
+        for key, rows, wins in zip(stats.keys, stats.rows, stats.wins):
+            selected = upcard_value(store.columns) == key
+            self.assertEqual(rows, selected.sum())
+            self.assertEqual(wins, (store['outcome'][selected] == Outcome.WIN).sum())
+        by_seat = store.group_by('seat')
+        self.assertEqual(by_seat.keys.tolist(), [1, 2, 3])
+        self.assertTrue(((by_seat.win_rate >= 0) & (by_seat.win_rate <= 1)).all())
+
+    def test_reopening_appends_and_drops_unflushed_bytes(self):
+        """
+        Test that a reopened store appends after its last complete flush, discarding bytes from an interrupted one.
+        """
+        with ResultsWriter(self.path) as writer:
+            self.play(5, writer)
+        with open(os.path.join(self.path, 'seat.col'), 'ab') as column:
+            column.write(b"\x09\x09")  # Left behind by a crash before the manifest was updated
+        with ResultsWriter(self.path) as writer:
+            self.play(5, writer, seed=2)
+        store = ResultsStore(self.path)
+        self.assertEqual(len(store), 30)
+        self.assertEqual(os.path.getsize(os.path.join(self.path, 'seat.col')), 30)
+        self.assertNotIn(9, store['seat'].tolist())
+
+    def test_empty_store(self):
+        """
+        Test that a store with no rows can be opened and grouped.
+        """
+        ResultsWriter(self.path).close()
+        store = ResultsStore(self.path)
+        self.assertEqual(len(store), 0)
+        self.assertEqual(store.group_by('seat').rows.tolist(), [])
+
+
+if __name__ == '__main__':
+    unittest.main()
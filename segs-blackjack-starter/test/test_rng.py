@@ -0,0 +1,78 @@
+import unittest
+
+from src.card import NUM_CARDS
+from src.deck import Deck
+from src.engine import BlackjackEngine
+from src.shoe import Shoe
+
+try:
+    import numpy as np
+    from src.rng import GeneratorRandom, ShuffleBuffer
+except ImportError:  # NumPy is only needed for the NumPy random sources
+    np = None
+
+
+@unittest.skipIf(np is None, "NumPy is not installed")
+class RngTestCase(unittest.TestCase):
+
+    def test_same_seed_same_decks(self):
+        """
+        Test that decks shuffled from the same seed come out in the same order, for both generators.
+        """
+        for rng_class in (GeneratorRandom, ShuffleBuffer):
+            first = Deck(rng=rng_class(seed=5))
+            second = Deck(rng=rng_class(seed=5))
+            self.assertEqual(first.cards, second.cards, rng_class.__name__)
+            self.assertNotEqual(first.cards, Deck(rng=rng_class(seed=6)).cards, rng_class.__name__)
+
+    def test_buffer_gives_fresh_permutations(self):
+        """
+        Test that each round gets a different complete deck, including after the buffer is refilled.
+        """
+        rng = ShuffleBuffer(seed=1, batch=4)
+        deck = Deck(rng=rng)
+        orders = set()
+        for _ in range(10):
+            deck.start_round()
+            self.assertEqual(sorted(deck.cards.codes), list(range(NUM_CARDS)))
+            orders.add(bytes(deck.cards.codes))
+        self.assertEqual(len(orders), 10)
+
+    def test_shoe_and_other_sizes(self):
+        """
+        Test that a buffer sized for a shoe shuffles it, and that lists and other sizes are shuffled directly.
+        """
+        shoe = Shoe(num_decks=6, rng=ShuffleBuffer(size=6 * NUM_CARDS, seed=2))
+        self.assertEqual(sorted(shoe.codes), sorted(list(range(NUM_CARDS)) * 6))
+        cards = list(range(10))
+        ShuffleBuffer(seed=2).shuffle(cards)
+        self.assertEqual(sorted(cards), list(range(10)))
+
+    def test_engine_rounds_are_reproducible(self):
+        """
+        Test that an engine using one generator for its deck and the dealer's draws replays identically.
+        """
+        def play(seed):
+            rng = ShuffleBuffer(seed=seed)
+            engine = BlackjackEngine(num_players=3, deck=Deck(rng=rng), rng=rng)
+            results = []
+            for _ in range(50):
+                engine.new_round()
+                engine.deal_hand()
+                results.append(engine.dealer_turn())
+            return results
+
+        self.assertEqual(play(9), play(9))
+
+    def test_random_is_uniform_in_range(self):
+        """
+        Test that random() returns floats in [0, 1) across batch refills.
+        """
+        rng = GeneratorRandom(seed=3, batch=16)
+        values = [rng.random() for _ in range(100)]
+        self.assertTrue(all(0 <= value < 1 for value in values))
+        self.assertEqual(len(set(values)), 100)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,155 @@
+import asyncio
+import json
+import unittest
+from unittest import mock
+
+from src.server import GameServer, TableEngine
+
+
+class ServerTestCase(unittest.IsolatedAsyncioTestCase):
+
+    async def asyncSetUp(self):
+        """
+        Starts a server on a free local port.
+        """
+        self.game_server = GameServer(turn_timeout=5.0, seed=1)
+        self.server = await self.game_server.start(port=0)
+        self.port = self.server.sockets[0].getsockname()[1]
+        self.connections = []
+
+    async def asyncTearDown(self):
+        """
+        Closes every client connection and the server.
+        """
+        for reader, writer in self.connections:
+            writer.close()
+        self.server.close()
+        await self.server.wait_closed()
+
+    async def connect(self):
+        connection = await asyncio.open_connection('127.0.0.1', self.port)
+        self.connections.append(connection)
+        return connection
+
+    async def request(self, connection, **message):
+        connection[1].write((json.dumps(message) + "\n").encode())
+        await connection[1].drain()
+
+    async def receive(self, connection, event):
+        # Read messages until one with the given event (or an error) arrives.
+        while True:
+            message = json.loads(await asyncio.wait_for(connection[0].readline(), 2))
+            if message.get('event') == event or 'error' in message:
+                return message
+
+    async def test_two_players_play_a_round(self):
+        """
+        Test that two clients at one table take turns in seat order and both receive the results.
+        """
+        first, second = await self.connect(), await self.connect()
+        await self.request(first, op='join', table='t1')
+        self.assertEqual((await self.receive(first, 'joined'))['seat'], 1)
+        await self.request(second, op='join', table='t1')
+        self.assertEqual((await self.receive(second, 'joined'))['seat'], 2)
+
+        await self.request(first, op='deal')
+        turn = await self.receive(first, 'turn')
+        self.assertEqual(turn['seat'], 1)
+        self.assertEqual(len(turn['dealer_upcard']), 1, "The dealer's hole card should stay hidden.")
+
+        await self.request(second, op='stand')
+        self.assertEqual((await self.receive(second, 'turn'))['seat'], 1)  # Turn state sent at the deal
+        self.assertIn('error', await self.receive(second, 'never'), "Player 2 can not act on player 1's turn.")
+
+        await self.request(first, op='stand')
+        self.assertEqual((await self.receive(second, 'turn'))['seat'], 2)
+        await self.request(second, op='stand')
+        results = await self.receive(first, 'results')
+        self.assertEqual(results, await self.receive(second, 'results'))
+        self.assertFalse(self.game_server.tables['t1'].in_round, "The table should be ready for another round.")
+
+    async def test_turn_times_out(self):
+        """
+        Test that a player who does not act is stood automatically once the turn timeout passes.
+        """
+        self.game_server.turn_timeout = 0.05
+        client = await self.connect()
+        await self.request(client, op='join', table='slow')
+        await self.request(client, op='deal')
+        results = await self.receive(client, 'results')
+        self.assertTrue(results['results'])
+
+    async def test_bad_requests_rejected(self):
+        """
+        Test that malformed and out of order requests get errors and leave the connection open.
+        """
+        client = await self.connect()
+        client[1].write(b"not json\n")
+        self.assertIn('error', await self.receive(client, 'never'))
+        await self.request(client, op='hit')
+        self.assertEqual((await self.receive(client, 'never'))['error'], "Join a table first")
+
+    async def test_failed_request_answered_with_error(self):
+        """
+        Test that an unexpected exception in a request is answered with an error and leaves no round behind.
+        """
+        client = await self.connect()
+        await self.request(client, op='join', table='t1')
+        await self.receive(client, 'joined')
+        with self.assertLogs('src.server', 'ERROR'), \
+                mock.patch.object(TableEngine, 'deal_hand', side_effect=IndexError("Shoe is empty")):
+            await self.request(client, op='deal')
+            self.assertEqual((await self.receive(client, 'never'))['error'], "Internal error")
+        self.assertFalse(self.game_server.tables['t1'].in_round)
+
+        await self.request(client, op='deal')  # The connection and the table still work
+        self.assertEqual((await self.receive(client, 'turn'))['seat'], 1)
+
+    async def test_table_removed_when_empty(self):
+        """
+        Test that a table is closed once its last player leaves.
+        """
+        client = await self.connect()
+        await self.request(client, op='join', table='t2')
+        await self.receive(client, 'joined')
+        await self.request(client, op='leave')
+        await self.receive(client, 'left')
+        self.assertNotIn('t2', self.game_server.tables)
+
+    async def test_bots_fill_seats(self):
+        """
+        Test that bots play their own turns around a human player and the table closes when the human leaves.
+        """
+        self.game_server.bot_think_time = 0.0
+        client = await self.connect()
+        await self.request(client, op='join', table='bots')
+        await self.request(client, op='add_bot')
+        self.assertEqual((await self.receive(client, 'bot_joined'))['seat'], 2)
+        await self.request(client, op='deal')
+        self.assertEqual((await self.receive(client, 'turn'))['seat'], 1)
+        await self.request(client, op='stand')
+        results = await self.receive(client, 'results')
+        self.assertEqual([outcome['seat'] for outcome in results['outcomes']], [1, 2])
+        await self.request(client, op='leave')
+        await self.receive(client, 'left')
+        self.assertNotIn('bots', self.game_server.tables)
+
+    async def test_failing_bot_stands(self):
+        """
+        Test that a bot whose action fails stands instead of stalling the round.
+        """
+        self.game_server.bot_think_time = 0.0
+        client = await self.connect()
+        await self.request(client, op='join', table='bots')
+        await self.request(client, op='add_bot')
+        await self.receive(client, 'bot_joined')
+        with self.assertLogs('src.server', 'ERROR'), \
+                mock.patch.object(TableEngine, 'bot_wants_hit', side_effect=RuntimeError("Broken policy")):
+            await self.request(client, op='deal')
+            await self.request(client, op='stand')
+            results = await self.receive(client, 'results')
+        self.assertEqual(len(results['outcomes']), 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
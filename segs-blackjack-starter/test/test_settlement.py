@@ -0,0 +1,115 @@
+import random
+import unittest
+
+from src.deck import Deck
+from src.engine import BlackjackEngine
+from src.player import Player
+from src.settlement import BLACKJACK_PAYOUT, Ledger, Outcome, classify, settle
+
+
+def seat(player_number, cards):
+    player = Player(deck=None, player_number=player_number)
+    player.hand = cards
+    return player
+
+
+def hand_scoring(score):
+    # Cards without Aces that add up to `score` (at least 12).
+    cards = []
+    while score > 11:
+        cards.append(('10', 'Hearts'))
+        score -= 10
+    return cards + ([('9', 'Clubs'), ('2', 'Spades')] if score == 11 else [(str(score), 'Clubs')])
+
+
+class SettlementTestCase(unittest.TestCase):
+
+    def test_table_rules(self):
+        """
+        Test that only the best scores at the table are compared with the dealer and busted players always lose.
+        """
+        players = [seat(1, [('10', 'Hearts'), ('K', 'Clubs')]),  # 20
+                   seat(2, [('9', 'Hearts'), ('9', 'Clubs')]),  # 18
+                   seat(3, [('10', 'Hearts'), ('9', 'Clubs'), ('5', 'Spades')])]  # 24
+        settlement = settle(players, 19)
+        self.assertEqual(settlement.outcomes, [Outcome.WIN, Outcome.LOSS, Outcome.BUST])
+        self.assertEqual([result.payout for result in settlement.seats], [1.0, -1.0, -1.0])
+        self.assertEqual(settle(players, 20).outcomes, [Outcome.TIE, Outcome.LOSS, Outcome.BUST])
+        self.assertEqual(settle(players, 23).outcomes, [Outcome.WIN, Outcome.WIN, Outcome.BUST])
+
+    def test_blackjack_pays_more(self):
+        """
+        Test that a winning two-card 21 is flagged and paid the blackjack payout, but a three-card 21 is not.
+        """
+        players = [seat(1, [('A', 'Hearts'), ('K', 'Clubs')]), seat(2, [('7', 'Hearts'), ('7', 'Clubs'), ('7', 'Spades')])]
+        natural, three_cards = settle(players, 18).seats
+        self.assertTrue(natural.blackjack)
+        self.assertEqual(natural.payout, BLACKJACK_PAYOUT)
+        self.assertFalse(three_cards.blackjack)
+        self.assertEqual(three_cards.payout, 1.0)
+
+    def test_render_matches_messages(self):
+        """
+        Test that the rendered messages list busts first, then the best scores against the dealer, then the rest.
+        """
+        players = [seat(1, [('9', 'Hearts'), ('9', 'Clubs')]),
+                   seat(2, [('10', 'Hearts'), ('9', 'Clubs'), ('5', 'Spades')]),
+                   seat(3, [('10', 'Hearts'), ('K', 'Clubs')])]
+        self.assertEqual(settle(players, 19).render(), [
+            "Player 2 busts and loses, Score 24",
+            "Player 3 Wins, Score 20",
+            "Dealer loses, Score 19",
+            "Player 1 loses, Score 18",
+        ])
+        self.assertEqual(settle(players, 22).render(), ["Player 2 busts and loses, Score 24", "Dealer busts, Score 22"])
+
+    def test_determine_winners_rules(self):
+        """
+        Test classify and settle against the rules of the original determine_winners, score by score.
+        """
+        win, loss, tie, bust = Outcome.WIN, Outcome.LOSS, Outcome.TIE, Outcome.BUST
+        table = [
+            # (player scores, dealer score, outcomes)
+            ([18, 25, 14], 23, [win, bust, win]),  # Dealer busts: every player still standing wins
+            ([22, 26], 24, [bust, bust]),  # Busting first loses even when the dealer busts too
+            ([12, 23], 22, [win, bust]),
+            ([19, 19, 17], 19, [tie, tie, loss]),  # A tie at the best score at the table
+            ([21], 21, [tie]),
+            ([20, 18], 17, [win, loss]),  # 18 beats the dealer but is below the table's best
+            ([19, 18, 23], 17, [win, loss, bust]),
+            ([20, 24, 19], 18, [win, bust, loss]),
+            ([18, 16], 19, [loss, loss]),  # The best score loses to the dealer, and so does the rest
+            ([23, 22], 17, [bust, bust]),
+        ]
+        for scores, dealer_score, outcomes in table:
+            with self.subTest(scores=scores, dealer_score=dealer_score):
+                self.assertEqual(classify(scores, dealer_score), outcomes)
+                players = [seat(number, hand_scoring(score)) for number, score in enumerate(scores, 1)]
+                self.assertEqual(settle(players, dealer_score).outcomes, outcomes)
+
+    def test_ledger(self):
+        """
+        Test that the ledger pays each seat its payout times its stake.
+        """
+        ledger = Ledger(3, bankroll=100.0)
+        players = [seat(1, [('10', 'Hearts'), ('K', 'Clubs')]), seat(2, [('9', 'Hearts'), ('9', 'Clubs')]),
+                   seat(3, [('A', 'Hearts'), ('K', 'Clubs')])]
+        settlement = settle(players, 19)  # Player 3's blackjack is the only win
+        ledger.apply(settlement, stake=10)
+        self.assertEqual(list(ledger.balances), [90.0, 90.0, 115.0])
+        ledger.apply(settlement, stake=[1, 2, 4])
+        self.assertEqual((ledger[1], ledger[2], ledger[3]), (89.0, 88.0, 121.0))
+
+    def test_engine_pays_ledger(self):
+        """
+        Test that an engine with a ledger pays out every round it settles.
+        """
+        ledger = Ledger(2)
+        engine = BlackjackEngine(num_players=2, deck=Deck(rng=random.Random(5)), rng=random.Random(5), ledger=ledger)
+        engine.deal_hand()
+        engine.dealer_turn()
+        self.assertEqual(list(ledger.balances), [result.payout for result in engine.settlement.seats])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,125 @@
+import random
+import unittest
+from collections import Counter
+
+from src.card import NUM_CARDS
+from src.deck import Deck
+from src.engine import BlackjackEngine
+from src.shoe import Shoe
+from src.simulation import Simulation
+
+
+class ShoeTestCase(unittest.TestCase):
+
+    def test_shoe_holds_every_card_once_per_deck(self):
+        """
+        Test that a six deck shoe holds each card six times.
+        """
+        shoe = Shoe(num_decks=6)
+        self.assertEqual(shoe.remaining, 6 * NUM_CARDS)
+        self.assertEqual(set(Counter(shoe.codes).values()), {6})
+
+    def test_draw_advances_cursor(self):
+        """
+        Test that drawing moves through the shoe without removing cards from it.
+        """
+        shoe = Shoe(num_decks=1)
+        first = shoe.draw_code()
+        batch = shoe.draw(3)
+        self.assertEqual(len(batch), 3)
+        self.assertEqual(shoe.position, 4)
+        self.assertEqual(list(shoe.codes[:4]), [first] + list(batch.codes))
+
+    def test_draw_past_end(self):
+        """
+        Test that an empty shoe returns None for single draws and raises for batch draws.
+        """
+        shoe = Shoe(num_decks=1)
+        shoe.draw(NUM_CARDS)
+        self.assertIsNone(shoe.draw_card())
+        with self.assertRaises(IndexError):
+            shoe.draw(2)
+
+    def test_reshuffles_only_after_cut_card(self):
+        """
+        Test that start_round reshuffles only once the cut card has been reached.
+        """
+        shoe = Shoe(num_decks=2, penetration=0.5)
+        shoe.draw(shoe.cut_card - 1)
+        self.assertFalse(shoe.start_round())
+        shoe.draw(1)
+        self.assertTrue(shoe.start_round())
+        self.assertEqual(shoe.position, 0)
+
+    def test_reshuffles_when_deal_would_run_out(self):
+        """
+        Test that start_round reshuffles a shoe too short for the initial deal, even before the cut card.
+        """
+        shoe = Shoe(num_decks=1, penetration=1)
+        shoe.draw(NUM_CARDS - 5)
+        self.assertFalse(shoe.start_round(5))
+        self.assertTrue(shoe.start_round(6))
+        self.assertEqual(shoe.remaining, NUM_CARDS)
+
+    def test_engine_plays_shoe_without_reserve(self):
+        """
+        Test that the engine plays a shoe with its cut card at the very end through several exhaustions.
+        """
+        shoe = Shoe(num_decks=1, penetration=1, rng=random.Random(4))
+        engine = BlackjackEngine(num_players=5, deck=shoe, rng=random.Random(4))
+        shuffles = 0
+        for _ in range(300):
+            position = shoe.position
+            engine.new_round()
+            shuffles += shoe.position < position
+            engine.deal_hand()
+            self.assertEqual([len(player.hand) for player in engine.players], [2] * 5)
+            while True:
+                while engine.players[engine.current_player_index].score < 17 and shoe.remaining:
+                    engine.hit()
+                if not engine.next_player():
+                    break
+        self.assertGreater(shuffles, 10)
+
+    def test_invalid_shoe_rejected(self):
+        """
+        Test that a shoe needs at least one deck and a penetration between 0 and 1.
+        """
+        with self.assertRaises(ValueError):
+            Shoe(num_decks=0)
+        with self.assertRaises(ValueError):
+            Shoe(penetration=1.5)
+
+    def test_deck_batch_draw_matches_single_draws(self):
+        """
+        Test that Deck.draw(n) deals the same cards in the same order as n calls to draw_card.
+        """
+        deck = Deck()
+        expected = list(deck.cards)[-3:][::-1]
+        self.assertEqual(deck.draw(3), expected)
+        self.assertEqual(len(deck.cards), NUM_CARDS - 3)
+        with self.assertRaises(IndexError):
+            deck.draw(NUM_CARDS)
+
+    def test_engine_plays_many_rounds_from_one_shoe(self):
+        """
+        Test that the engine can play round after round from a shoe, dealing fresh hands each time.
+        """
+        engine = BlackjackEngine(num_players=3, deck=Shoe(num_decks=6))
+        for _ in range(200):
+            engine.new_round()
+            engine.deal_hand()
+            self.assertEqual([len(player.hand) for player in engine.players], [2, 2, 2])
+            while engine.next_player():
+                pass
+
+    def test_simulation_with_shoe(self):
+        """
+        Test that a simulation dealing from a multi-deck shoe plays every hand.
+        """
+        report = Simulation(num_players=5, seed=3, num_decks=6, penetration=0.75).run(2000)
+        self.assertEqual(report.hands, 5 * 2000)
+
+
+if __name__ == '__main__':
+    unittest.main()
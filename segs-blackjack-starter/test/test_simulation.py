@@ -0,0 +1,84 @@
+import random
+import unittest
+from collections import Counter
+
+from src.scoring import MAX_SCORE
+from src.settlement import Outcome, classify
+from src.simulation import Simulation, SimulationReport, never_hit, stand_on
+
+
+class SimulationTestCase(unittest.TestCase):
+
+    def test_every_hand_has_one_outcome(self):
+        """
+        Test that every seat in every round ends in exactly one of win, loss, tie or bust.
+        """
+        report = Simulation(num_players=3, seed=1).run(2000)
+        self.assertEqual(report.rounds, 2000)
+        self.assertEqual(report.hands, 3 * 2000, "Each player should play one hand per round.")
+
+    def test_same_seed_gives_same_report(self):
+        """
+        Test that two simulations with the same seed produce identical results.
+        """
+        first = Simulation(num_players=2, seed=42).run(5000)
+        second = Simulation(num_players=2, seed=42).run(5000)
+        self.assertEqual(first.as_dict(), second.as_dict())
+
+    def test_player_who_never_hits_never_busts(self):
+        """
+        Test that a player who always stands can not bust, since two cards never exceed 21.
+        """
+        report = Simulation(num_players=1, policy=never_hit, seed=7).run(5000)
+        self.assertEqual(report.busts, 0)
+
+    def test_player_who_always_hits_always_busts(self):
+        """
+        Test that a player who hits until going over 21 always busts.
+        """
+        report = Simulation(num_players=1, policy=stand_on(22), seed=7).run(2000)
+        self.assertEqual(report.busts, report.hands)
+
+    def test_tallies_match_classify(self):
+        """
+        Test that the tallies of run() are the outcomes classify gives for the same seeded rounds.
+        """
+        for num_players, policy in [(1, None), (3, None), (5, never_hit)]:
+            counts = Counter()
+            dealer_busts = 0
+            for scores, dealer_score in Simulation(num_players, policy, seed=11).play(3000):
+                counts.update(classify(scores, dealer_score))
+                dealer_busts += dealer_score > MAX_SCORE
+            report = Simulation(num_players, policy, seed=11).run(3000)
+            self.assertEqual((report.wins, report.losses, report.ties, report.busts, report.dealer_busts),
+                             (counts[Outcome.WIN], counts[Outcome.LOSS], counts[Outcome.TIE],
+                              counts[Outcome.BUST], dealer_busts))
+
+    def test_global_random_state_untouched(self):
+        """
+        Test that a seeded simulation neither reads nor advances the global random state.
+        """
+        state = random.getstate()
+        report = Simulation(num_players=2, seed=3, num_decks=2).run(100)
+        self.assertEqual(random.getstate(), state)
+        random.random()
+        self.assertEqual(Simulation(num_players=2, seed=3, num_decks=2).run(100).as_dict(), report.as_dict())
+
+    def test_reports_merge(self):
+        """
+        Test that merging reports adds up their totals.
+        """
+        merged = SimulationReport(rounds=1, wins=1).merge(SimulationReport(rounds=2, losses=2, dealer_busts=1))
+        self.assertEqual(merged.as_dict(),
+                         {'rounds': 3, 'wins': 1, 'losses': 2, 'ties': 0, 'busts': 0, 'dealer_busts': 1})
+
+    def test_too_many_players_rejected(self):
+        """
+        Test that a table which can not be dealt from one deck is rejected.
+        """
+        with self.assertRaises(ValueError):
+            Simulation(num_players=26)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,95 @@
+import json
+import os
+import tempfile
+import unittest
+
+from src.dealer_odds import BUST
+from src.hand import Hand
+from src.solver import StrategyTable, advise, stand_value
+
+
+class SolverTestCase(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        """
+        Computes a single deck table once for all the tests.
+        """
+        cls.table = StrategyTable.compute(num_decks=1)
+
+    def test_stand_value(self):
+        """
+        Test that standing wins against lower dealer totals and busts, and loses against higher totals.
+        """
+        distribution = [0.0] * (BUST + 1)
+        distribution[17] = distribution[20] = 0.25
+        distribution[BUST] = 0.5
+        self.assertEqual(stand_value(18, distribution), 0.5)
+        self.assertEqual(stand_value(17, distribution), 0.25)
+        # Below the best score at the table only a dealer bust wins
+        self.assertEqual(stand_value(18, distribution, table_score=19), 0.0)
+
+    def test_obvious_decisions(self):
+        """
+        Test that the table hits a hard 5 and stands on 21 against every upcard.
+        """
+        for upcard in range(1, 11):
+            self.assertTrue(self.table.should_hit(5, False, upcard))
+            self.assertFalse(self.table.should_hit(21, False, upcard))
+            self.assertFalse(self.table.should_hit(21, True, upcard))
+
+    def test_advise_from_player_hand(self):
+        """
+        Test advice for a Player.hand against the dealer's visible card.
+        """
+        self.assertEqual(self.table.advise(Hand([('K', 'Hearts'), ('Q', 'Clubs')]), ('7', 'Spades')), "stand")
+        self.assertEqual(self.table.advise(Hand([('2', 'Hearts'), ('3', 'Clubs')]), ('A', 'Spades')), "hit")
+
+    def test_composition_aware_advice(self):
+        """
+        Test that advice changes with the cards left: a hard 12 should never hit into a shoe of only tens,
+        but should always hit when only small cards remain.
+        """
+        hand = Hand([('K', 'Hearts'), ('2', 'Clubs')])
+        self.assertEqual(advise(hand, ('10', 'Spades'), (0,) * 9 + (20,)), "stand")
+        self.assertEqual(advise(hand, ('10', 'Spades'), (0, 8, 8, 8) + (0,) * 5 + (1,)), "hit")
+
+    def test_table_score_changes_advice(self):
+        """
+        Test that a soft 18 stands heads-up against a 6, but hits when another player already stands on 20.
+        """
+        hand = Hand([('A', 'Hearts'), ('7', 'Clubs')])
+        composition = (3, 4, 4, 4, 4, 3, 3, 4, 4, 16)
+        self.assertEqual(advise(hand, ('6', 'Spades'), composition), "stand")
+        self.assertEqual(advise(hand, ('6', 'Spades'), composition, table_score=20), "hit")
+
+    def test_bust_hand_stands(self):
+        """
+        Test that a bust hand is advised to stand, and has no values in the table.
+        """
+        hand = Hand([('K', 'Hearts'), ('Q', 'Clubs'), ('5', 'Clubs')])
+        self.assertEqual(advise(hand, ('10', 'Spades'), (4,) * 9 + (13,)), "stand")
+        self.assertEqual(self.table.advise(hand, ('10', 'Spades')), "stand")
+        with self.assertRaises(ValueError):
+            self.table.values(hand.score, False, 10)
+
+    def test_table_saved_and_reloaded(self):
+        """
+        Test that a stored table is loaded instead of recomputed, and recomputed when the rules change.
+        """
+        with tempfile.TemporaryDirectory() as folder:
+            path = os.path.join(folder, 'strategy.json')
+            saved = StrategyTable.load(num_decks=1, path=path)
+            self.assertEqual(StrategyTable.load(num_decks=1, path=path).hit, saved.hit)
+
+            with open(path) as table_file:
+                stored = json.load(table_file)
+            stored['rules']['dealer_stand_score'] = 18
+            stored['hit'] = [0.0] * len(stored['hit'])
+            with open(path, 'w') as table_file:
+                json.dump(stored, table_file)
+            self.assertEqual(StrategyTable.load(num_decks=1, path=path).hit, saved.hit)
+
+
+if __name__ == '__main__':
+    unittest.main()